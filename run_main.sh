@@ -1,10 +1,6 @@
 #!/bin/bash
 
-echo "Running model analysis..."
-python -m src.main_model
-
-echo "Generating charts..."
-python -m src.plotter
+python -m src.pipeline
 
 echo "Processing plots for Problem 3..."
 cd results/problem_3
@@ -0,0 +1,66 @@
+"""
+分批随机计算的公共部分
+
+p2_sensitivity_analysis 的流式蒙特卡洛和 sensitivity_analysis_global 的 Sobol 抽样共用：
+    - 每批的随机种子：由 seed 和批次序号派生，不修改调用方传入的 SeedSequence
+    - 批次的顺序产出：可以在当前进程中计算，也可以分发到多个进程，部分和按批次顺序返回，
+      因此相同 seed 和 chunk_size 下结果与进程数无关、逐位可复现
+"""
+import numpy as np
+
+
+def batch_seed(seed_sequence, index):
+    """
+    第 index 批的子种子
+
+    与新建的 seed_sequence 第 index 次 spawn 得到的子种子相同，但不修改 seed_sequence，
+    同一个 SeedSequence 对象重复传入时得到相同的样本。
+
+    Args:
+        seed_sequence (numpy.random.SeedSequence): 父种子
+        index (int): 批次序号
+
+    Returns:
+        numpy.random.SeedSequence: 本批次的种子
+    """
+    return np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (index,),
+                                  pool_size=seed_sequence.pool_size)
+
+
+def iter_batches(task, n_total, chunk_size, seed, workers, *task_args):
+    """
+    按批次顺序产出 task(本批种子, 本批大小, *task_args) 的结果
+
+    批次划分和每批的种子只取决于 n_total、chunk_size 和 seed。
+
+    Args:
+        task (callable): 单批任务，多进程时必须是模块级函数
+        n_total (int): 总样本数
+        chunk_size (int): 每批样本数
+        seed (int or numpy.random.SeedSequence): 随机种子，为None时使用系统熵
+        workers (int): 进程数，1表示在当前进程中计算
+        *task_args: 传给 task 的其余参数
+
+    Returns:
+        generator: 依次产出每批的结果；可以提前停止迭代
+    """
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    # 按需逐个生成子种子，样本上限很大时也不会预先生成所有种子
+    batches = ((batch_seed(seed_sequence, i), min(chunk_size, n_total - start))
+               for i, start in enumerate(range(0, n_total, chunk_size)))
+    if workers is None or workers <= 1:
+        for seed_i, n in batches:
+            yield task(seed_i, n, *task_args)
+        return
+
+    import collections
+    import concurrent.futures
+    # 只提前提交有限个批次，调用方提前停止时不会白算剩余批次
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, -(-n_total // chunk_size))) as executor:
+        pending = collections.deque()
+        for seed_i, n in batches:
+            pending.append(executor.submit(task, seed_i, n, *task_args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,6 +1,7 @@
 """
 常量定义
-默认按年计算，若需按月计算，需设置 MONTH_MODE = True
+默认按年计算。时间粒度（year/month/week/day）可在调用计算函数时通过 granularity 参数指定，
+MONTH_MODE = True 时默认粒度改为按月计算
 """
 
 import numpy as np
@@ -9,6 +10,13 @@ import math
 # MONTH_MODE = True # 按月计算
 MONTH_MODE = False # 按年计算
 
+# 时间粒度：每年包含的时间段数（一年按365天，一周7天，即 365/7 ≈ 52.14 周，与按天计算的运输能力一致）
+GRANULARITY_PERIODS_PER_YEAR = {"year": 1, "month": 12, "week": 365 / 7, "day": 365}
+# 时间粒度对应的图表单位
+GRANULARITY_LABELS = {"year": "Years", "month": "Months", "week": "Weeks", "day": "Days"}
+# 默认时间粒度
+DEFAULT_GRANULARITY = "month" if MONTH_MODE else "year"
+
 # 常量定义
 TOTAL_MATERIAL = 100_000_000  # 总材料需求（吨）
 START_YEAR = 2050  # 开始年份
@@ -19,8 +27,6 @@ TOTAL_MATERIAL_P3 = EXTRA_MATERIAL_P3 # Problem 3总材料需求（吨），这
 # 太空电梯系统参数
 GALACTIC_HARBORS = 3  # 银河港数量
 ELEVATOR_ANNUAL_CAPACITY = 179_000  # 每个银河港年运输能力（吨）
-if MONTH_MODE:
-    ELEVATOR_ANNUAL_CAPACITY /= 12  # 按月计算时，将年运输能力除以12
 ELEVATOR_COST_PER_TON = 34.68  # 每吨运输成本（美元）
 
 # 可靠性设置
@@ -68,8 +74,6 @@ ROCKET_PAYLOAD_AVG = (ROCKET_PAYLOAD_MIN + ROCKET_PAYLOAD_MAX) / 2  # 平均有
 ROCKET_COST_PER_LAUNCH = 4_000_000_000  # 单次发射成本（美元）
 ROCKET_THETA = 0.4 # 可回收火箭消耗系数
 ROCKET_LAUNCHES_PER_YEAR_PER_SITE = 1000  # 每个发射场每年发射次数
-if MONTH_MODE:
-    ROCKET_LAUNCHES_PER_YEAR_PER_SITE /= 12  # 按月计算时，将每年发射次数除以12
 ROCKET_N_G = 20 # 复用次数
 # 计算单位有效载荷成本：考虑发射成本、消耗系数、复用次数和可靠性
 # Problem 1 成本计算（100%可靠性）
@@ -79,6 +83,183 @@ COST_ROCKET_PER_P2 = ROCKET_THETA * ROCKET_COST_PER_LAUNCH / (ROCKET_PAYLOAD_AVG
 # 当前使用的成本（默认使用 Problem 2）
 COST_ROCKET_PER = COST_ROCKET_PER_P2
 
+
+# 列式结果文件的 schema 版本（结构变化时递增）
+RESULTS_SCHEMA_VERSION = 1
+RESULTS_SCHEMA_FILE = "results_schema.json"
+
+# 图表增量重绘清单（results 根目录下），记录每张图的输入结果表、绘图函数和样式参数的哈希
+FIGURE_MANIFEST_VERSION = 1
+FIGURE_MANIFEST_FILE = "figure_manifest.json"
+
+# 敏感性分析网格的磁盘缓存（results/sensitivity_analysis 下），文件名含计算输入的哈希
+SENSITIVITY_CACHE_VERSION = 1
+SENSITIVITY_CACHE_DIR = "grid_cache"
+
+# ===================== 模型参数记录 =====================
+# 基础参数字段（与上面的常量同名），派生参数（M_0、单位成本等）按需计算并缓存
+MODEL_PARAMETER_FIELDS = (
+    "TOTAL_MATERIAL", "START_YEAR",
+    "GALACTIC_HARBORS", "ELEVATOR_ANNUAL_CAPACITY", "ELEVATOR_COST_PER_TON",
+    "ELEVATOR_RELIABILITY", "TUG_RELIABILITY", "ROCKET_RELIABILITY",
+    "TUG_DELTA_V", "TUG_I_SP", "TUG_COST_FUEL_PER", "TUG_COST_VEHICLE", "TUG_N", "G_0", "M_D",
+    "ROCKET_LAUNCH_SITES", "ROCKET_PAYLOAD_MIN", "ROCKET_PAYLOAD_MAX", "ROCKET_COST_PER_LAUNCH",
+    "ROCKET_THETA", "ROCKET_LAUNCHES_PER_YEAR_PER_SITE", "ROCKET_N_G",
+)
+
+
+def _derived(func):
+    """派生参数：首次访问时计算，之后从缓存读取"""
+    name = func.__name__
+
+    def getter(self):
+        cache = self._cache
+        if name not in cache:
+            cache[name] = func(self)
+        return cache[name]
+
+    getter.__doc__ = func.__doc__
+    return property(getter)
+
+
+class ModelParameters:
+    """不可变的模型参数记录
+
+    基础参数默认取本模块中的常量，可通过关键字参数覆盖；派生参数按需计算并缓存。
+    参数记录可哈希、可序列化，便于在同一进程中批量评估大量参数组合。
+
+    示例：
+        params = ModelParameters(ELEVATOR_RELIABILITY=0.98)
+        params.COST_ELEVATOR_PER
+        params.replace(TOTAL_MATERIAL=TOTAL_MATERIAL_P3)
+    """
+    __slots__ = MODEL_PARAMETER_FIELDS + ("_cache",)
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(MODEL_PARAMETER_FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown model parameters: {sorted(unknown)}")
+        module_constants = globals()
+        for field in MODEL_PARAMETER_FIELDS:
+            object.__setattr__(self, field, overrides.get(field, module_constants[field]))
+        object.__setattr__(self, "_cache", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; use replace() instead")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def as_dict(self):
+        """返回基础参数字典"""
+        return {field: getattr(self, field) for field in MODEL_PARAMETER_FIELDS}
+
+    def replace(self, **changes):
+        """返回替换部分基础参数后的新参数记录"""
+        fields = self.as_dict()
+        fields.update(changes)
+        return type(self)(**fields)
+
+    def _key(self):
+        return tuple(getattr(self, field) for field in MODEL_PARAMETER_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, ModelParameters):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __reduce__(self):
+        return (_restore_model_parameters, (self.as_dict(),))
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in MODEL_PARAMETER_FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    # 摆渡火箭派生参数
+    @_derived
+    def R(self):
+        """质量比"""
+        return math.exp(self.TUG_DELTA_V / (self.G_0 * self.TUG_I_SP))
+
+    @_derived
+    def M_PROP(self):
+        """燃料质量"""
+        return (self.R - 1) * (1 + self.M_D)
+
+    @_derived
+    def M_0(self):
+        """总质量"""
+        return self.M_PROP + self.M_D + 1
+
+    @_derived
+    def ROCKET_PAYLOAD_AVG(self):
+        """平均有效载荷"""
+        return (self.ROCKET_PAYLOAD_MIN + self.ROCKET_PAYLOAD_MAX) / 2
+
+    # 单位有效载荷成本
+    @_derived
+    def COST_ELEVATOR_PER(self):
+        """太空电梯-摆渡火箭单位有效载荷成本"""
+        return (self.ELEVATOR_COST_PER_TON * self.M_0 + self.TUG_COST_FUEL_PER * self.M_PROP + self.TUG_COST_VEHICLE / self.TUG_N) / (self.ELEVATOR_RELIABILITY * self.TUG_RELIABILITY)
+
+    @_derived
+    def COST_ROCKET_PER(self):
+        """传统火箭单位有效载荷成本"""
+        return self.ROCKET_THETA * self.ROCKET_COST_PER_LAUNCH / (self.ROCKET_PAYLOAD_AVG * self.ROCKET_N_G * self.ROCKET_RELIABILITY)
+
+    # 有效年运输能力（考虑可靠性）
+    @_derived
+    def ELEVATOR_CAPACITY(self):
+        """太空电梯系统有效年运输能力"""
+        return self.GALACTIC_HARBORS * self.ELEVATOR_ANNUAL_CAPACITY * self.ELEVATOR_RELIABILITY * self.TUG_RELIABILITY
+
+    @_derived
+    def ROCKET_CAPACITY(self):
+        """火箭系统有效年运输能力"""
+        return self.ROCKET_LAUNCH_SITES * self.ROCKET_LAUNCHES_PER_YEAR_PER_SITE * self.ROCKET_PAYLOAD_AVG * self.ROCKET_RELIABILITY
+
+    @_derived
+    def CAPACITY_TABLE(self):
+        """各时间粒度下每个时间段的有效运输能力：{粒度: (太空电梯, 火箭)}"""
+        return {
+            granularity: (self.ELEVATOR_CAPACITY / periods, self.ROCKET_CAPACITY / periods)
+            for granularity, periods in GRANULARITY_PERIODS_PER_YEAR.items()
+        }
+
+    def period_capacities(self, granularity=None):
+        """返回指定时间粒度下每个时间段的有效运输能力 (太空电梯, 火箭)"""
+        granularity = granularity or DEFAULT_GRANULARITY
+        if granularity not in self.CAPACITY_TABLE:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        return self.CAPACITY_TABLE[granularity]
+
+
+def _restore_model_parameters(fields):
+    return ModelParameters(**fields)
+
+
+# 各问题对应的默认参数记录
+PROBLEM_PARAMETERS = {
+    # Problem 1: 所有可靠性都是100%
+    1: ModelParameters(ELEVATOR_RELIABILITY=ELEVATOR_RELIABILITY_P1, TUG_RELIABILITY=TUG_RELIABILITY_P1,
+                       ROCKET_RELIABILITY=ROCKET_RELIABILITY_P1),
+    # Problem 2: 当前可靠性
+    2: ModelParameters(ELEVATOR_RELIABILITY=ELEVATOR_RELIABILITY_P2, TUG_RELIABILITY=TUG_RELIABILITY_P2,
+                       ROCKET_RELIABILITY=ROCKET_RELIABILITY_P2),
+    # Problem 3: 当前可靠性 + 额外材料需求
+    3: ModelParameters(ELEVATOR_RELIABILITY=ELEVATOR_RELIABILITY_P2, TUG_RELIABILITY=TUG_RELIABILITY_P2,
+                       ROCKET_RELIABILITY=ROCKET_RELIABILITY_P2, TOTAL_MATERIAL=TOTAL_MATERIAL_P3),
+}
+
+
+def get_problem_parameters(problem=2):
+    """获取问题编号对应的默认参数记录（未知编号按 Problem 2 处理）"""
+    return PROBLEM_PARAMETERS.get(problem, PROBLEM_PARAMETERS[2])
+
+
 if __name__ == "__main__":
     print(f"COST_ELEVATOR_PER_P1: {COST_ELEVATOR_PER_P1}")
     print(f"COST_ELEVATOR_PER_P2: {COST_ELEVATOR_PER_P2}")
@@ -3,54 +3,33 @@ import matplotlib.pyplot as plt
 from src.constants import *
 
 
-def calculate_scenario_1(problem=2):
+def calculate_scenario_1(problem=2, params=None, granularity=None):
     """Scenario 1: Space Elevator Only
     
     计算仅使用太空电梯系统时的运输时间和成本
     
     Args:
         problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
     Returns:
         dict: 包含场景名称、所需时间、完成年份、总成本和年运输能力的字典
     """
-    # 根据问题编号选择可靠性设置
-    if problem == 1:
-        # Problem 1: 使用100%可靠性
-        elevator_reliability = ELEVATOR_RELIABILITY_P1
-        tug_reliability = TUG_RELIABILITY_P1
-        cost_elevator_per = COST_ELEVATOR_PER_P1
-    elif problem == 3:
-        # Problem 3: 使用当前可靠性（与Problem 2相同）
-        elevator_reliability = ELEVATOR_RELIABILITY_P2
-        tug_reliability = TUG_RELIABILITY_P2
-        cost_elevator_per = COST_ELEVATOR_PER_P2
-    else:  # problem == 2
-        # Problem 2: 使用当前可靠性
-        elevator_reliability = ELEVATOR_RELIABILITY_P2
-        tug_reliability = TUG_RELIABILITY_P2
-        cost_elevator_per = COST_ELEVATOR_PER_P2
-    
-    # 根据问题编号选择总材料需求
-    if problem == 3:
-        total_material = TOTAL_MATERIAL_P3
-    else:
-        total_material = TOTAL_MATERIAL
-    
-    # 计算太空电梯系统的理论年运输能力
-    # 理论年运输能力 = 银河港数量 * 每个银河港年运输能力
-    theoretical_annual_capacity = GALACTIC_HARBORS * ELEVATOR_ANNUAL_CAPACITY
+    if params is None:
+        params = get_problem_parameters(problem)
+    total_material = params.TOTAL_MATERIAL
     
-    # 计算有效年运输能力：考虑可靠性因素
-    # 有效年运输能力 = 理论年运输能力 * 太空电梯可靠性 * 摆渡火箭可靠性
-    effective_annual_capacity = theoretical_annual_capacity * elevator_reliability * tug_reliability
+    # 每个时间段的有效运输能力（从共享的运输能力表中读取）
+    # 有效年运输能力 = 银河港数量 * 每个银河港年运输能力 * 太空电梯可靠性 * 摆渡火箭可靠性
+    effective_annual_capacity, _ = params.period_capacities(granularity)
     
-    # 计算所需时间：总材料需求除以有效年运输能力，向上取整
+    # 计算所需时间：总材料需求除以有效运输能力，向上取整（单位为时间段）
     years_needed = np.ceil(total_material / effective_annual_capacity)
     # 计算总成本：总材料需求乘以单位有效载荷成本
-    total_cost = total_material * cost_elevator_per
+    total_cost = total_material * params.COST_ELEVATOR_PER
     # 计算完成年份
-    completion_year = START_YEAR + years_needed
+    completion_year = params.START_YEAR + _periods_to_years(years_needed, granularity)
     
     return {
         "name": "Space Elevator Only",
@@ -61,51 +40,33 @@ def calculate_scenario_1(problem=2):
     }
 
 
-def calculate_scenario_2(problem=2):
+def calculate_scenario_2(problem=2, params=None, granularity=None):
     """Scenario 2: Traditional Rockets Only
     
     计算仅使用传统火箭系统时的运输时间和成本
     
     Args:
         problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
     Returns:
         dict: 包含场景名称、所需时间、完成年份、总成本和年运输能力的字典
     """
-    # 根据问题编号选择可靠性设置
-    if problem == 1:
-        # Problem 1: 使用100%可靠性
-        rocket_reliability = ROCKET_RELIABILITY_P1
-        cost_rocket_per = COST_ROCKET_PER_P1
-    elif problem == 3:
-        # Problem 3: 使用当前可靠性（与Problem 2相同）
-        rocket_reliability = ROCKET_RELIABILITY_P2
-        cost_rocket_per = COST_ROCKET_PER_P2
-    else:  # problem == 2
-        # Problem 2: 使用当前可靠性
-        rocket_reliability = ROCKET_RELIABILITY_P2
-        cost_rocket_per = COST_ROCKET_PER_P2
-    
-    # 根据问题编号选择总材料需求
-    if problem == 3:
-        total_material = TOTAL_MATERIAL_P3
-    else:
-        total_material = TOTAL_MATERIAL
+    if params is None:
+        params = get_problem_parameters(problem)
+    total_material = params.TOTAL_MATERIAL
     
-    # 计算火箭系统的理论年运输能力
-    # 理论年运输能力 = 发射场数量 * 每个发射场年发射次数 * 平均有效载荷
-    theoretical_annual_capacity = ROCKET_LAUNCH_SITES * ROCKET_LAUNCHES_PER_YEAR_PER_SITE * ROCKET_PAYLOAD_AVG
+    # 每个时间段的有效运输能力（从共享的运输能力表中读取）
+    # 有效年运输能力 = 发射场数量 * 每个发射场年发射次数 * 平均有效载荷 * 火箭可靠性
+    _, effective_annual_capacity = params.period_capacities(granularity)
     
-    # 计算有效年运输能力：考虑可靠性因素
-    # 有效年运输能力 = 理论年运输能力 * 火箭可靠性
-    effective_annual_capacity = theoretical_annual_capacity * rocket_reliability
-    
-    # 计算所需时间：总材料需求除以有效年运输能力，向上取整
+    # 计算所需时间：总材料需求除以有效运输能力，向上取整（单位为时间段）
     years_needed = np.ceil(total_material / effective_annual_capacity)
     # 计算总成本：总材料需求乘以单位有效载荷成本
-    total_cost = total_material * cost_rocket_per
+    total_cost = total_material * params.COST_ROCKET_PER
     # 计算完成年份
-    completion_year = START_YEAR + years_needed
+    completion_year = params.START_YEAR + _periods_to_years(years_needed, granularity)
     
     return {
         "name": "Traditional Rockets Only",
@@ -116,31 +77,43 @@ def calculate_scenario_2(problem=2):
     }
 
 
-def calculate_scenario_3(problem=2, time_limit=None):
+def calculate_scenario_3(problem=2, time_limit=None, method="grid", ratio_steps=100, params=None, granularity=None):
     """Scenario 3: Combined Space Elevator and Traditional Rockets (Finding Optimal Ratio)
     
     计算太空电梯和传统火箭组合使用时的最优比例
     - 如果提供了time_limit，则寻找能在该时间内完成且成本最小的组合
     - 如果未提供time_limit，则寻找总成本最小的组合
     
+    求解方式：
+    - method="grid": 遍历比例网格上的所有方案
+    - method="exact": 解析求出可行比例区间与连续最优解，并用二分查找得到网格上的最优解，无需完整遍历
+    
     Args:
         problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
-        time_limit (int, optional): 时间限制（年）。如果为None，则寻找总成本最小的组合
+        time_limit (int, optional): 时间限制（年，按其他时间粒度计算时为对应的时间段数）。如果为None，则寻找总成本最小的组合
+        method (str): 求解方式，"grid" 或 "exact"
+        ratio_steps (int): 比例网格的分段数，默认100（步长1%）
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
     Returns:
-        dict: 包含场景名称、所需时间、完成年份、总成本、各部分运输量和比例的字典
+        dict: 包含场景名称、所需时间、完成年份、总成本、各部分运输量和比例的字典；
+            method="exact" 时额外包含 continuous_* 连续最优解字段。无可行方案时返回None
     """
+    if params is None:
+        params = get_problem_parameters(problem)
+    if method == "exact":
+        return _solve_scenario_3_exact(problem, time_limit, ratio_steps, params, granularity)
+    elif method != "grid":
+        raise ValueError(f"Unknown method: {method}")
+    
     best_scenario = None
     min_total_cost = float('inf')
-    
-    # 根据问题编号选择总材料需求
-    if problem == 3:
-        total_material = TOTAL_MATERIAL_P3
-    else:
-        total_material = TOTAL_MATERIAL
+    total_material = params.TOTAL_MATERIAL
     
     # 使用通用函数获取所有比例的分析结果
-    ratio_scenarios = calculate_combined_ratio_analysis(problem)
+    ratio_scenarios = calculate_combined_ratio_analysis(problem, np.arange(0, ratio_steps + 1) / ratio_steps, params,
+                                                        granularity)
     
     # 遍历所有比例方案，寻找最优解
     for scenario in ratio_scenarios:
@@ -161,7 +134,7 @@ def calculate_scenario_3(problem=2, time_limit=None):
                 best_scenario = {
                     "name": "Combined System",
                     "years_needed": years_needed,
-                    "completion_year": START_YEAR + years_needed,
+                    "completion_year": params.START_YEAR + _periods_to_years(years_needed, granularity),
                     "total_cost": total_cost,
                     "elevator_material": elevator_material,
                     "rocket_material": rocket_material,
@@ -175,7 +148,7 @@ def calculate_scenario_3(problem=2, time_limit=None):
                 best_scenario = {
                     "name": "Combined System",
                     "years_needed": years_needed,
-                    "completion_year": START_YEAR + years_needed,
+                    "completion_year": params.START_YEAR + _periods_to_years(years_needed, granularity),
                     "total_cost": total_cost,
                     "elevator_material": elevator_material,
                     "rocket_material": rocket_material,
@@ -187,107 +160,288 @@ def calculate_scenario_3(problem=2, time_limit=None):
     return best_scenario
 
 
-def calculate_combined_ratio_analysis(problem=2):
-    """计算不同太空电梯比例下的组合方案分析
+def calculate_pareto_front(problem=2, elevator_ratios=None, params=None, granularity=None):
+    """计算组合方案的成本-完成时间帕累托前沿
+    
+    返回所有非支配方案（不存在时间不更长且成本更低的其他方案），
+    基于按所需时间排序的索引一次性得到，复杂度 O(n log n)。
     
     Args:
         problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        elevator_ratios (array_like, optional): 太空电梯比例数组。如果为None，默认使用0%到100%、步长1%
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
     Returns:
-        list: 包含不同比例下组合方案分析结果的列表
+        dict: 列式结果，按所需时间升序（成本随之严格下降）排列的前沿方案；没有方案时各列为空数组
     """
-    scenarios = []
-    
-    # 根据问题编号选择可靠性设置
-    if problem == 1:
-        elevator_reliability = ELEVATOR_RELIABILITY_P1
-        tug_reliability = TUG_RELIABILITY_P1
-        rocket_reliability = ROCKET_RELIABILITY_P1
-    else:  # problem == 2 or problem == 3
-        elevator_reliability = ELEVATOR_RELIABILITY_P2
-        tug_reliability = TUG_RELIABILITY_P2
-        rocket_reliability = ROCKET_RELIABILITY_P2
-    
-    # 根据问题编号选择总材料需求
-    if problem == 3:
-        total_material = TOTAL_MATERIAL_P3
+    if params is None:
+        params = get_problem_parameters(problem)
+    sweep = calculate_combined_ratio_sweep(problem, elevator_ratios, params, granularity)
+    sorted_years, prefix_best = _build_time_limit_index(sweep)
+    
+    if len(sorted_years) == 0:
+        # 没有任何方案时前沿为空
+        front = np.array([], dtype=int)
     else:
-        total_material = TOTAL_MATERIAL
+        # 每个所需时间取值只保留其最后一个前缀（包含该时间下的全部方案）
+        group_end = np.append(sorted_years[1:] != sorted_years[:-1], True)
+        candidates = prefix_best[group_end]
+        # 仅保留成本严格低于所有更快方案的点
+        candidate_costs = sweep["total_cost"][candidates]
+        improves = np.append(True, candidate_costs[1:] < candidate_costs[:-1])
+        front = candidates[improves]
+    
+    years_needed = sweep["years_needed"][front]
+    return {
+        "years_needed": years_needed,
+        "completion_year": params.START_YEAR + _periods_to_years(years_needed, granularity),
+        "total_cost": sweep["total_cost"][front],
+        "elevator_ratio": sweep["elevator_ratio"][front],
+        "rocket_ratio": sweep["rocket_ratio"][front]
+    }
+
+
+def _combined_years_and_cost(elevator_ratio, total_material, effective_elevator_capacity, effective_rocket_capacity,
+                             cost_elevator_per, cost_rocket_per):
+    """计算单个比例下组合方案的所需时间与总成本（与 calculate_combined_ratio_sweep 的计算方式一致）"""
+    rocket_ratio = 1 - elevator_ratio
+    elevator_years = np.ceil(total_material * elevator_ratio / effective_elevator_capacity) if elevator_ratio > 0 else 0.0
+    rocket_years = np.ceil(total_material * rocket_ratio / effective_rocket_capacity) if rocket_ratio > 0 else 0.0
+    elevator_cost = total_material * elevator_ratio * cost_elevator_per if elevator_ratio > 0 else 0.0
+    rocket_cost = total_material * rocket_ratio * cost_rocket_per if rocket_ratio > 0 else 0.0
+    return elevator_years, rocket_years, elevator_cost + rocket_cost
+
+
+def _solve_scenario_3_exact(problem=2, time_limit=None, ratio_steps=100, params=None, granularity=None):
+    """解析求解组合方案的最优比例
     
-    # 遍历不同的太空电梯比例（从0%到100%，步长1%）
-    for elevator_ratio in range(0, 101, 1):
-        elevator_ratio = elevator_ratio / 100
-        rocket_ratio = 1 - elevator_ratio
-        
-        # 计算各部分运输量
-        elevator_material = total_material * elevator_ratio
-        rocket_material = total_material * rocket_ratio
+    成本关于太空电梯比例是线性的，电梯所需时间随比例单调不减、火箭所需时间随比例单调不增，
+    因此可行比例是一个区间，最优解位于区间的某一端点：
+    - 连续最优解：由 ceil(x) <= T 等价于 x <= floor(T) 直接解出区间端点
+    - 网格最优解：在比例网格上二分查找可行区间的端点，计算方式与网格遍历完全一致
+    
+    Args:
+        problem (int): 问题编号
+        time_limit (int, optional): 时间限制（年，按其他时间粒度计算时为对应的时间段数）。如果为None，则寻找总成本最小的组合
+        ratio_steps (int): 比例网格的分段数
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
-        # 太空电梯计算
-        if elevator_ratio > 0:
-            # 太空电梯系统理论年运输能力
-            theoretical_elevator_capacity = GALACTIC_HARBORS * ELEVATOR_ANNUAL_CAPACITY
-            # 太空电梯系统有效年运输能力：考虑可靠性因素
-            effective_elevator_capacity = theoretical_elevator_capacity * elevator_reliability * tug_reliability
-            # 计算太空电梯部分所需时间，向上取整
-            elevator_years = np.ceil(elevator_material / effective_elevator_capacity)
-            # 根据问题编号计算太空电梯部分成本
-            if problem == 1:
-                # Problem 1: 100%可靠性
-                cost_elevator_per = (ELEVATOR_COST_PER_TON * M_0 + TUG_COST_FUEL_PER * M_PROP + TUG_COST_VEHICLE / TUG_N) / (elevator_reliability * tug_reliability)
-            else:
-                # Problem 2: 使用默认计算的成本
-                cost_elevator_per = COST_ELEVATOR_PER
-            elevator_cost = elevator_material * cost_elevator_per
+    Returns:
+        dict: 与 calculate_scenario_3 相同的字典（网格最优解），附加 continuous_* 连续最优解字段；无可行方案时返回None
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    model_parameters = _get_combined_parameters(problem, params, granularity)
+    total_material, effective_elevator_capacity, effective_rocket_capacity, cost_elevator_per, cost_rocket_per = model_parameters
+    # 成本随比例的变化方向：电梯更便宜时取可行区间上端，否则取下端（与网格遍历的并列处理一致）
+    prefer_elevator = cost_elevator_per < cost_rocket_per
+    
+    # 连续可行区间 [ratio_low, ratio_high]
+    if time_limit is None:
+        ratio_low, ratio_high = 0.0, 1.0
+    else:
+        whole_periods = np.floor(time_limit)
+        if whole_periods < 0:
+            return None
+        ratio_low = max(0.0, 1 - whole_periods * effective_rocket_capacity / total_material)
+        ratio_high = min(1.0, whole_periods * effective_elevator_capacity / total_material)
+        if ratio_low > ratio_high:
+            return None
+    continuous_ratio = ratio_high if prefer_elevator else ratio_low
+    
+    # 网格可行区间：电梯约束在网格上为前缀，火箭约束为后缀，分别二分查找边界
+    def elevator_feasible(index):
+        elevator_years, _, _ = _combined_years_and_cost(index / ratio_steps, *model_parameters)
+        return time_limit is None or elevator_years <= time_limit
+    
+    def rocket_feasible(index):
+        _, rocket_years, _ = _combined_years_and_cost(index / ratio_steps, *model_parameters)
+        return time_limit is None or rocket_years <= time_limit
+    
+    # 最大的满足电梯约束的网格下标
+    low, high = 0, ratio_steps + 1
+    while low < high:
+        mid = (low + high) // 2
+        if elevator_feasible(mid):
+            low = mid + 1
         else:
-            elevator_years = 0
-            elevator_cost = 0
-        
-        # 火箭计算
-        if rocket_ratio > 0:
-            # 火箭系统理论年运输能力
-            theoretical_rocket_capacity = ROCKET_LAUNCH_SITES * ROCKET_LAUNCHES_PER_YEAR_PER_SITE * ROCKET_PAYLOAD_AVG
-            # 火箭系统有效年运输能力：考虑可靠性因素
-            effective_rocket_capacity = theoretical_rocket_capacity * rocket_reliability
-            # 计算火箭部分所需时间，向上取整
-            rocket_years = np.ceil(rocket_material / effective_rocket_capacity)
-            # 根据问题编号计算火箭部分成本
-            if problem == 1:
-                # Problem 1: 100%可靠性
-                cost_rocket_per = ROCKET_THETA * ROCKET_COST_PER_LAUNCH / (ROCKET_PAYLOAD_AVG * ROCKET_N_G * rocket_reliability)
-            else:
-                # Problem 2: 使用默认计算的成本
-                cost_rocket_per = COST_ROCKET_PER
-            rocket_cost = rocket_material * cost_rocket_per
+            high = mid
+    grid_high = low - 1
+    # 最小的满足火箭约束的网格下标
+    low, high = 0, ratio_steps + 1
+    while low < high:
+        mid = (low + high) // 2
+        if rocket_feasible(mid):
+            high = mid
         else:
-            rocket_years = 0
-            rocket_cost = 0
+            low = mid + 1
+    grid_low = low
+    if grid_high < 0 or grid_low > ratio_steps or grid_low > grid_high:
+        return None
+    
+    elevator_ratio = (grid_high if prefer_elevator else grid_low) / ratio_steps
+    rocket_ratio = 1 - elevator_ratio
+    elevator_years, rocket_years, total_cost = _combined_years_and_cost(elevator_ratio, *model_parameters)
+    years_needed = max(elevator_years, rocket_years)
+    
+    _, _, continuous_total_cost = _combined_years_and_cost(continuous_ratio, *model_parameters)
+    # 连续解的端点恰好落在整数年上，先舍去浮点误差再向上取整
+    continuous_years_needed = max(
+        np.ceil(np.round(total_material * continuous_ratio / effective_elevator_capacity, 9)),
+        np.ceil(np.round(total_material * (1 - continuous_ratio) / effective_rocket_capacity, 9))
+    )
+    
+    best_scenario = {
+        "name": "Combined System",
+        "years_needed": years_needed,
+        "completion_year": params.START_YEAR + _periods_to_years(years_needed, granularity),
+        "total_cost": total_cost,
+        "elevator_material": total_material * elevator_ratio,
+        "rocket_material": total_material * rocket_ratio,
+        "elevator_ratio": elevator_ratio,
+        "rocket_ratio": rocket_ratio,
+        "continuous_elevator_ratio": continuous_ratio,
+        "continuous_rocket_ratio": 1 - continuous_ratio,
+        "continuous_years_needed": continuous_years_needed,
+        "continuous_total_cost": continuous_total_cost
+    }
+    if time_limit is not None:
+        best_scenario["time_limit"] = time_limit
+    return best_scenario
+
+
+def _get_combined_parameters(problem=2, params=None, granularity=None):
+    """获取组合方案计算所需的模型参数
+    
+    Args:
+        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
-        # 总计算：总时间由运输能力较慢的部分决定
-        years_needed = max(elevator_years, rocket_years)
-        # 计算总成本：两部分成本之和
-        total_cost = elevator_cost + rocket_cost
+    Returns:
+        tuple: (总材料需求, 太空电梯每时间段有效运输能力, 火箭每时间段有效运输能力, 太空电梯单位成本, 火箭单位成本)
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    effective_elevator_capacity, effective_rocket_capacity = params.period_capacities(granularity)
+    return (params.TOTAL_MATERIAL, effective_elevator_capacity, effective_rocket_capacity,
+            params.COST_ELEVATOR_PER, params.COST_ROCKET_PER)
+
+
+def _periods_to_years(periods, granularity=None):
+    """将时间段数换算为年数"""
+    return periods / GRANULARITY_PERIODS_PER_YEAR[granularity or DEFAULT_GRANULARITY]
+
+
+def calculate_combined_ratio_sweep(problem=2, elevator_ratios=None, params=None, granularity=None):
+    """计算任意太空电梯比例数组下的组合方案分析（向量化版本）
+    
+    容量与单位成本只计算一次，所有比例在一次数组运算中完成，
+    适用于 1e-6 等细粒度比例网格。
+    
+    Args:
+        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        elevator_ratios (array_like, optional): 太空电梯比例数组，取值范围0-1。如果为None，默认使用0%到100%、步长1%
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
-        scenarios.append({
-            "elevator_ratio": elevator_ratio,
-            "rocket_ratio": rocket_ratio,
-            "elevator_years": elevator_years,
-            "rocket_years": rocket_years,
-            "years_needed": years_needed,
-            "elevator_cost": elevator_cost,
-            "rocket_cost": rocket_cost,
-            "total_cost": total_cost
-        })
+    Returns:
+        dict: 列式结果，每个键对应一个与 elevator_ratios 等长的 numpy 数组
+    """
+    if elevator_ratios is None:
+        # 默认比例网格（从0%到100%，步长1%）
+        elevator_ratios = np.arange(0, 101) / 100
+    elevator_ratios = np.asarray(elevator_ratios, dtype=float)
+    rocket_ratios = 1 - elevator_ratios
+    
+    total_material, effective_elevator_capacity, effective_rocket_capacity, cost_elevator_per, cost_rocket_per = \
+        _get_combined_parameters(problem, params, granularity)
+    
+    # 计算各部分运输量
+    elevator_material = total_material * elevator_ratios
+    rocket_material = total_material * rocket_ratios
+    
+    # 各部分所需时间（向上取整），比例为0的部分不占用时间
+    elevator_years = np.where(elevator_ratios > 0, np.ceil(elevator_material / effective_elevator_capacity), 0.0)
+    rocket_years = np.where(rocket_ratios > 0, np.ceil(rocket_material / effective_rocket_capacity), 0.0)
+    # 各部分成本
+    elevator_cost = np.where(elevator_ratios > 0, elevator_material * cost_elevator_per, 0.0)
+    rocket_cost = np.where(rocket_ratios > 0, rocket_material * cost_rocket_per, 0.0)
     
-    return scenarios
+    return {
+        "elevator_ratio": elevator_ratios,
+        "rocket_ratio": rocket_ratios,
+        "elevator_years": elevator_years,
+        "rocket_years": rocket_years,
+        # 总时间由运输能力较慢的部分决定
+        "years_needed": np.maximum(elevator_years, rocket_years),
+        "elevator_cost": elevator_cost,
+        "rocket_cost": rocket_cost,
+        "total_cost": elevator_cost + rocket_cost
+    }
+
+
+def calculate_combined_ratio_analysis(problem=2, elevator_ratios=None, params=None, granularity=None):
+    """计算不同太空电梯比例下的组合方案分析
+    
+    Args:
+        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        elevator_ratios (array_like, optional): 太空电梯比例数组。如果为None，默认使用0%到100%、步长1%
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
+        
+    Returns:
+        list: 包含不同比例下组合方案分析结果的列表
+    """
+    sweep = calculate_combined_ratio_sweep(problem, elevator_ratios, params, granularity)
+    
+    # 将列式结果转换为逐行字典
+    columns = {key: values.tolist() for key, values in sweep.items()}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def _build_time_limit_index(sweep):
+    """为比例分析结果建立按所需时间排序的索引
+    
+    按 (所需时间, 原始下标) 排序，并记录前缀中成本最低的方案，
+    使任意时间限制下的最优方案都可通过一次二分查找和一次前缀最小值查询得到。
+    并列时与逐行遍历的结果一致（成本相同取比例较小者）。
+    
+    Args:
+        sweep (dict): calculate_combined_ratio_sweep 的列式结果
+        
+    Returns:
+        tuple: (排序后的所需时间数组, 每个前缀中最优方案的原始下标数组)
+    """
+    years_needed = sweep["years_needed"]
+    total_cost = sweep["total_cost"]
+    row_index = np.arange(len(years_needed))
+    
+    # 按所需时间排序
+    order = np.lexsort((row_index, years_needed))
+    # 按 (成本, 原始下标) 排名，前缀最小排名即前缀最优方案
+    rank_order = np.lexsort((row_index, total_cost))
+    cost_rank = np.empty_like(row_index)
+    cost_rank[rank_order] = row_index
+    prefix_best_rank = np.minimum.accumulate(cost_rank[order])
+    
+    return years_needed[order], rank_order[prefix_best_rank]
 
 
-def calculate_combined_scenarios_by_time_limit(problem=2, time_limits=None):
+def calculate_combined_scenarios_by_time_limit(problem=2, time_limits=None, elevator_ratios=None, params=None,
+                                               granularity=None):
     """计算不同时间限制下的最优组合方案
     
+    比例分析只计算一次，所有时间限制共用同一个按所需时间排序的索引。
+    
     Args:
         problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性）
-        time_limits (list, optional): 时间限制列表。如果为None，默认使用 range(150, 410, 10)
+        time_limits (list, optional): 时间限制列表。如果为None，默认使用 range(10, 410, 10)
+        elevator_ratios (array_like, optional): 太空电梯比例数组。如果为None，默认使用0%到100%、步长1%
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
         
     Returns:
         list: 包含不同时间限制下最优方案的列表
@@ -296,90 +450,332 @@ def calculate_combined_scenarios_by_time_limit(problem=2, time_limits=None):
         # 默认时间限制列表
         time_limits = range(10, 410, 10)
     
+    if params is None:
+        params = get_problem_parameters(problem)
+    total_material = params.TOTAL_MATERIAL
+    sweep = calculate_combined_ratio_sweep(problem, elevator_ratios, params, granularity)
+    sorted_years, prefix_best = _build_time_limit_index(sweep)
+    
+    # 每个时间限制：二分查找可行前缀的长度
+    time_limits = list(time_limits)
+    prefix_lengths = np.searchsorted(sorted_years, time_limits, side='right')
+    
     scenarios = []
-    for time_limit in time_limits:
-        scenario = calculate_scenario_3(problem, time_limit)
-        if scenario:
-            scenarios.append(scenario)
+    for time_limit, prefix_length in zip(time_limits, prefix_lengths):
+        if prefix_length == 0:
+            # 没有能在时间限制内完成的方案
+            continue
+        best = prefix_best[prefix_length - 1]
+        elevator_ratio = sweep["elevator_ratio"][best].item()
+        rocket_ratio = sweep["rocket_ratio"][best].item()
+        years_needed = sweep["years_needed"][best].item()
+        scenarios.append({
+            "name": "Combined System",
+            "years_needed": years_needed,
+            "completion_year": params.START_YEAR + _periods_to_years(years_needed, granularity),
+            "total_cost": sweep["total_cost"][best].item(),
+            "elevator_material": total_material * elevator_ratio,
+            "rocket_material": total_material * rocket_ratio,
+            "elevator_ratio": elevator_ratio,
+            "rocket_ratio": rocket_ratio,
+            "time_limit": time_limit
+        })
     
     return scenarios
 
 
-def save_results_to_file(problem=2):
-    """保存计算结果到文件，供画图工具使用
+def calculate_scenarios_batch(elevator_reliability, tug_reliability, rocket_reliability, total_material,
+                              time_limit=None, elevator_ratios=None, params=None, granularity=None, chunk_size=4_000_000):
+    """批量计算多组问题配置下的三个场景（向量化版本）
     
-    将场景分析、系统故障影响分析和组合场景比例分析的结果保存到文件
+    每组配置由 (太空电梯可靠性, 摆渡火箭可靠性, 火箭可靠性, 总材料需求) 组成，各参数按 numpy 规则广播，
+    三个场景对所有配置在一次数组运算中完成；场景3在比例网格上按配置分块计算，内存占用受 chunk_size 限制。
+    计算方式与 calculate_scenario_1/2/3（method="grid"）逐个调用的结果一致。
     
     Args:
-        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性）
+        elevator_reliability (array_like): 太空电梯可靠性
+        tug_reliability (array_like): 摆渡火箭可靠性
+        rocket_reliability (array_like): 火箭可靠性
+        total_material (array_like): 总材料需求（吨）
+        time_limit (array_like, optional): 场景3的时间限制，可按配置分别指定。如果为None，则寻找总成本最小的组合
+        elevator_ratios (array_like, optional): 场景3的太空电梯比例数组。如果为None，默认使用0%到100%、步长1%
+        params (ModelParameters, optional): 其余模型参数。如果为None，使用 Problem 2 的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
+        chunk_size (int): 场景3每块最多计算的 (配置, 比例) 单元数
+        
+    Returns:
+        dict: {"scenario_1": {...}, "scenario_2": {...}, "scenario_3": {...}}，每个字段为长度等于配置数的 numpy 数组；
+            场景3中无可行方案的配置 feasible 为 False，其余字段为 NaN
     """
-    import os
+    if params is None:
+        params = get_problem_parameters(2)
+    if elevator_ratios is None:
+        elevator_ratios = np.arange(0, 101) / 100
+    elevator_ratios = np.asarray(elevator_ratios, dtype=float)
+    rocket_ratios = 1 - elevator_ratios
+    if time_limit is None:
+        time_limit = np.inf
+    
+    elevator_reliability, tug_reliability, rocket_reliability, total_material, time_limit = (
+        np.ravel(values).astype(float) for values in np.broadcast_arrays(
+            elevator_reliability, tug_reliability, rocket_reliability, total_material, time_limit))
+    periods_per_year = GRANULARITY_PERIODS_PER_YEAR[granularity or DEFAULT_GRANULARITY]
+    
+    # 各配置的单位有效载荷成本（与 ModelParameters 的计算方式一致）
+    cost_elevator_per = (params.ELEVATOR_COST_PER_TON * params.M_0 + params.TUG_COST_FUEL_PER * params.M_PROP
+                         + params.TUG_COST_VEHICLE / params.TUG_N) / (elevator_reliability * tug_reliability)
+    cost_rocket_per = params.ROCKET_THETA * params.ROCKET_COST_PER_LAUNCH / (params.ROCKET_PAYLOAD_AVG * params.ROCKET_N_G * rocket_reliability)
+    # 各配置每个时间段的有效运输能力
+    elevator_capacity = params.GALACTIC_HARBORS * params.ELEVATOR_ANNUAL_CAPACITY * elevator_reliability * tug_reliability / periods_per_year
+    rocket_capacity = params.ROCKET_LAUNCH_SITES * params.ROCKET_LAUNCHES_PER_YEAR_PER_SITE * params.ROCKET_PAYLOAD_AVG * rocket_reliability / periods_per_year
+    
+    # Scenario 1 / Scenario 2：单一系统
+    elevator_years = np.ceil(total_material / elevator_capacity)
+    rocket_years = np.ceil(total_material / rocket_capacity)
+    scenario_1 = {
+        "years_needed": elevator_years,
+        "completion_year": params.START_YEAR + elevator_years / periods_per_year,
+        "total_cost": total_material * cost_elevator_per,
+        "annual_capacity": elevator_capacity
+    }
+    scenario_2 = {
+        "years_needed": rocket_years,
+        "completion_year": params.START_YEAR + rocket_years / periods_per_year,
+        "total_cost": total_material * cost_rocket_per,
+        "annual_capacity": rocket_capacity
+    }
+    
+    # Scenario 3：在比例网格上按配置分块求最优组合
+    n_configs = len(total_material)
+    best_index = np.zeros(n_configs, dtype=int)
+    feasible = np.zeros(n_configs, dtype=bool)
+    rows_per_chunk = max(1, chunk_size // max(1, len(elevator_ratios)))
+    for start in range(0, n_configs, rows_per_chunk):
+        rows = slice(start, start + rows_per_chunk)
+        material = total_material[rows, None]
+        elevator_material = material * elevator_ratios
+        rocket_material = material * rocket_ratios
+        years_needed = np.maximum(
+            np.where(elevator_ratios > 0, np.ceil(elevator_material / elevator_capacity[rows, None]), 0.0),
+            np.where(rocket_ratios > 0, np.ceil(rocket_material / rocket_capacity[rows, None]), 0.0))
+        total_cost = (np.where(elevator_ratios > 0, elevator_material * cost_elevator_per[rows, None], 0.0)
+                      + np.where(rocket_ratios > 0, rocket_material * cost_rocket_per[rows, None], 0.0))
+        # 不满足时间限制的方案成本记为无穷大，argmin 取第一个最小值（与逐行遍历一致）
+        total_cost = np.where(years_needed <= time_limit[rows, None], total_cost, np.inf)
+        best_index[rows] = np.argmin(total_cost, axis=1)
+        feasible[rows] = np.isfinite(total_cost[np.arange(total_cost.shape[0]), best_index[rows]])
+    
+    # 用最优比例重新计算场景3的结果，无可行方案的配置填充 NaN
+    best_elevator_ratio = elevator_ratios[best_index]
+    best_rocket_ratio = rocket_ratios[best_index]
+    elevator_material = total_material * best_elevator_ratio
+    rocket_material = total_material * best_rocket_ratio
+    years_needed = np.maximum(
+        np.where(best_elevator_ratio > 0, np.ceil(elevator_material / elevator_capacity), 0.0),
+        np.where(best_rocket_ratio > 0, np.ceil(rocket_material / rocket_capacity), 0.0))
+    total_cost = (np.where(best_elevator_ratio > 0, elevator_material * cost_elevator_per, 0.0)
+                  + np.where(best_rocket_ratio > 0, rocket_material * cost_rocket_per, 0.0))
+    scenario_3 = {
+        "years_needed": years_needed,
+        "completion_year": params.START_YEAR + years_needed / periods_per_year,
+        "total_cost": total_cost,
+        "elevator_material": elevator_material,
+        "rocket_material": rocket_material,
+        "elevator_ratio": best_elevator_ratio,
+        "rocket_ratio": best_rocket_ratio
+    }
+    for key, values in scenario_3.items():
+        scenario_3[key] = np.where(feasible, values, np.nan)
+    scenario_3["feasible"] = feasible
+    
+    return {"scenario_1": scenario_1, "scenario_2": scenario_2, "scenario_3": scenario_3}
+
+
+def calculate_results(problem=2, params=None, granularity=None, elevator_ratios=None):
+    """计算供画图工具使用的全部结果表
     
+    Args:
+        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
+        elevator_ratios (array_like, optional): 比例分析使用的太空电梯比例数组。如果为None，默认使用0%到100%、步长1%
+        
+    Returns:
+        dict: 结果表名称到 numpy 结构化数组（列式）的映射：
+            - scenario_analysis: 三个场景的分析结果（单一系统场景的比例字段为 NaN）
+            - ratio_analysis: 组合场景比例分析
+            - time_limit_analysis: 不同时间限制下的最优组合方案
+    """
     # 计算三个场景
-    scenario1 = calculate_scenario_1(problem)
-    scenario2 = calculate_scenario_2(problem)
-    scenario3 = calculate_scenario_3(problem)
+    scenarios = [
+        calculate_scenario_1(problem, params, granularity),
+        calculate_scenario_2(problem, params, granularity),
+        calculate_scenario_3(problem, params=params, granularity=granularity)
+    ]
+    scenario_table = np.zeros(len(scenarios), dtype=[
+        ("name", "U32"), ("years_needed", "f8"), ("completion_year", "f8"), ("total_cost", "f8"),
+        ("elevator_ratio", "f8"), ("rocket_ratio", "f8")
+    ])
+    for row, scenario in zip(scenario_table, scenarios):
+        row["name"] = scenario["name"]
+        row["years_needed"] = scenario["years_needed"]
+        row["completion_year"] = scenario["completion_year"]
+        row["total_cost"] = scenario["total_cost"]
+        row["elevator_ratio"] = scenario.get("elevator_ratio", np.nan)
+        row["rocket_ratio"] = scenario.get("rocket_ratio", np.nan)
+    
+    # 组合场景的比例分析（直接使用列式结果）
+    sweep = calculate_combined_ratio_sweep(problem, elevator_ratios, params, granularity)
+    ratio_table = np.empty(len(sweep["elevator_ratio"]), dtype=[(key, "f8") for key in sweep])
+    for key, values in sweep.items():
+        ratio_table[key] = values
+    
+    # 不同时间限制下的最优组合方案
+    time_limit_scenarios = calculate_combined_scenarios_by_time_limit(problem, elevator_ratios=elevator_ratios,
+                                                                      params=params, granularity=granularity)
+    time_limits = np.asarray([scenario["time_limit"] for scenario in time_limit_scenarios])
+    time_limit_table = np.empty(len(time_limit_scenarios), dtype=[
+        ("time_limit", time_limits.dtype if len(time_limits) else "f8"), ("years_needed", "f8"),
+        ("elevator_ratio", "f8"), ("rocket_ratio", "f8"), ("total_cost", "f8")
+    ])
+    for key in time_limit_table.dtype.names:
+        time_limit_table[key] = [scenario[key] for scenario in time_limit_scenarios]
     
-    # 获取结果目录的绝对路径
-    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results')
-    os.makedirs(results_dir, exist_ok=True)
+    return {
+        "scenario_analysis": scenario_table,
+        "ratio_analysis": ratio_table,
+        "time_limit_analysis": time_limit_table
+    }
+
+
+def get_problem_results_dir(problem=2, granularity=None):
+    """获取问题结果目录的绝对路径（非默认时间粒度的结果单独存放）"""
+    import os
     
-    # 根据问题编号创建子目录
-    problem_dir = os.path.join(results_dir, f'problem_{problem}')
-    os.makedirs(problem_dir, exist_ok=True)
+    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results')
+    if granularity is None or granularity == DEFAULT_GRANULARITY:
+        return os.path.join(results_dir, f'problem_{problem}')
+    return os.path.join(results_dir, f'problem_{problem}_{granularity}')
+
+
+def _write_text_results(problem_dir, problem, tables):
+    """将结果表写为带标签的文本文件"""
+    import os
     
     # 保存场景分析结果
     scenario_file = os.path.join(problem_dir, 'scenario_analysis.txt')
     with open(scenario_file, 'w') as f:
         f.write(f"=== 场景分析 (Problem {problem}) ===\n")
-        for scenario in [scenario1, scenario2, scenario3]:
-            f.write(f"场景: {scenario['name']}\n")
-            f.write(f"所需时间: {scenario['years_needed']} 年\n")
-            f.write(f"完成年份: {scenario['completion_year']}\n")
-            f.write(f"总成本: {scenario['total_cost']}\n")
-            if 'elevator_ratio' in scenario:
-                f.write(f"太空电梯比例: {scenario['elevator_ratio']*100}%\n")
-                f.write(f"传统火箭比例: {scenario['rocket_ratio']*100}%\n")
+        for scenario in tables["scenario_analysis"].tolist():
+            name, years_needed, completion_year, total_cost, elevator_ratio, rocket_ratio = scenario
+            f.write(f"场景: {name}\n")
+            f.write(f"所需时间: {years_needed} 年\n")
+            f.write(f"完成年份: {completion_year}\n")
+            f.write(f"总成本: {total_cost}\n")
+            if not np.isnan(elevator_ratio):
+                f.write(f"太空电梯比例: {elevator_ratio*100}%\n")
+                f.write(f"传统火箭比例: {rocket_ratio*100}%\n")
             f.write("\n")
     
-    
     # 保存组合场景的比例分析
+    ratio_table = tables["ratio_analysis"]
     ratio_file = os.path.join(problem_dir, 'ratio_analysis.txt')
     with open(ratio_file, 'w') as f:
         f.write(f"=== 组合场景比例分析 (Problem {problem}) ===\n")
-        
-        # 使用通用函数计算比例分析
-        ratio_scenarios = calculate_combined_ratio_analysis(problem)
-        
-        for scenario in ratio_scenarios:
-            f.write(f"太空电梯比例: {scenario['elevator_ratio']*100}%\n")
-            f.write(f"传统火箭比例: {scenario['rocket_ratio']*100}%\n")
-            f.write(f"所需时间: {scenario['years_needed']} 年\n")
-            f.write(f"总成本: {scenario['total_cost']}\n")
+        for elevator_ratio, rocket_ratio, years_needed, total_cost in zip(
+                ratio_table["elevator_ratio"].tolist(), ratio_table["rocket_ratio"].tolist(),
+                ratio_table["years_needed"].tolist(), ratio_table["total_cost"].tolist()):
+            f.write(f"太空电梯比例: {elevator_ratio*100}%\n")
+            f.write(f"传统火箭比例: {rocket_ratio*100}%\n")
+            f.write(f"所需时间: {years_needed} 年\n")
+            f.write(f"总成本: {total_cost}\n")
             f.write("\n")
     
     # 保存不同时间限制下的最优组合方案
     time_limit_file = os.path.join(problem_dir, 'time_limit_analysis.txt')
     with open(time_limit_file, 'w') as f:
         f.write(f"=== 不同时间限制下的最优组合方案分析 (Problem {problem}) ===\n")
-        
-        # 计算不同时间限制下的最优方案
-        time_limit_scenarios = calculate_combined_scenarios_by_time_limit(problem)
-        
-        for scenario in time_limit_scenarios:
-            f.write(f"时间限制: {scenario.get('time_limit', 'N/A')} 年\n")
-            f.write(f"实际所需时间: {scenario['years_needed']} 年\n")
-            f.write(f"太空电梯比例: {scenario['elevator_ratio']*100}%\n")
-            f.write(f"传统火箭比例: {scenario['rocket_ratio']*100}%\n")
-            f.write(f"总成本: {scenario['total_cost']}\n")
+        for time_limit, years_needed, elevator_ratio, rocket_ratio, total_cost in tables["time_limit_analysis"].tolist():
+            f.write(f"时间限制: {time_limit} 年\n")
+            f.write(f"实际所需时间: {years_needed} 年\n")
+            f.write(f"太空电梯比例: {elevator_ratio*100}%\n")
+            f.write(f"传统火箭比例: {rocket_ratio*100}%\n")
+            f.write(f"总成本: {total_cost}\n")
             f.write("\n")
 
+
+def _write_columnar_results(problem_dir, tables):
+    """将结果表写为列式二进制文件
+    
+    每个结果表保存为一个 .npy 结构化数组（可被画图工具以 mmap 方式读取），
+    并写入包含 schema 版本和各表列信息的 RESULTS_SCHEMA_FILE。schema 文件最后写入，
+    读取方只在 schema 存在且版本一致时使用列式结果。
+    """
+    import json
+    import os
+    
+    schema = {"schema_version": RESULTS_SCHEMA_VERSION, "tables": {}}
+    for name, table in tables.items():
+        file_name = f'{name}.npy'
+        np.save(os.path.join(problem_dir, file_name), table)
+        schema["tables"][name] = {
+            "file": file_name,
+            "rows": len(table),
+            "columns": {column: table.dtype[column].str for column in table.dtype.names}
+        }
+    with open(os.path.join(problem_dir, RESULTS_SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f, indent=2)
+
+
+def save_results_to_file(problem=2, params=None, granularity=None, elevator_ratios=None, output_format="both"):
+    """保存计算结果到文件，供画图工具使用
+    
+    将场景分析、组合场景比例分析和不同时间限制下的最优方案保存到文件
+    
+    Args:
+        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性）
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，"year"、"month"、"week" 或 "day"。如果为None，使用 DEFAULT_GRANULARITY
+        elevator_ratios (array_like, optional): 比例分析使用的太空电梯比例数组。如果为None，默认使用0%到100%、步长1%
+        output_format (str): 输出格式，"text"（带标签的文本文件）、"columnar"（列式二进制文件）或 "both"
+        
+    Returns:
+        dict: calculate_results 返回的结果表
+    """
+    import os
+    
+    if output_format not in ("text", "columnar", "both"):
+        raise ValueError(f"Unknown output format: {output_format}")
+    
+    tables = calculate_results(problem, params, granularity, elevator_ratios)
+    
+    # 根据问题编号创建子目录
+    problem_dir = get_problem_results_dir(problem, granularity)
+    os.makedirs(problem_dir, exist_ok=True)
+    
+    if output_format in ("columnar", "both"):
+        _write_columnar_results(problem_dir, tables)
+    else:
+        # 仅输出文本时移除旧的 schema，避免画图工具读取过期的列式结果
+        schema_file = os.path.join(problem_dir, RESULTS_SCHEMA_FILE)
+        if os.path.exists(schema_file):
+            os.remove(schema_file)
+    if output_format in ("text", "both"):
+        _write_text_results(problem_dir, problem, tables)
+    
+    return tables
+
 def main():
     """运行所有计算并输出结果
     
     计算三个场景的运输方案，分析系统故障影响，并保存结果到文件
     同时运行 Problem 1（100%可靠性）和 Problem 2（当前可靠性）的计算
+    
+    Returns:
+        dict: 问题编号到结果表的映射，可直接交给 plotter 使用
     """
+    results = {}
+
     # 运行 Problem 1（100%可靠性）
     print("=== Problem 1: 100%可靠性 ===")
     scenario1_p1 = calculate_scenario_1(1)
@@ -399,7 +795,7 @@ def main():
     
     
     # 保存 Problem 1 结果到文件
-    save_results_to_file(1)
+    results[1] = save_results_to_file(1)
     print("Problem 1 结果已保存到 results/problem_1/ 目录")
     
     # 运行 Problem 2（当前可靠性）
@@ -421,7 +817,7 @@ def main():
     
 
     # 保存 Problem 2 结果到文件
-    save_results_to_file(2)
+    results[2] = save_results_to_file(2)
     print("Problem 2 结果已保存到 results/problem_2/ 目录")
     
     # 运行 Problem 3（额外材料需求）
@@ -444,8 +840,10 @@ def main():
         print()
     
     # 保存 Problem 3 结果到文件
-    save_results_to_file(3)
+    results[3] = save_results_to_file(3)
     print("Problem 3 结果已保存到 results/problem_3/ 目录")
+    
+    return results
 
 if __name__ == "__main__":
     main()
@@ -3,22 +3,18 @@ Problem 2: Sensitivity Analysis
 Generated by Doubao AI
 """
 
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import weibull_min, norm
 import warnings
-warnings.filterwarnings('ignore')
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.batching import batch_seed, iter_batches
+
+# matplotlib / seaborn / scipy 只在模拟和绘图时导入，导入本模块只需要 numpy
 
 # ===================== 1. 全局参数设置（贴合你的建模定义）=====================
-# 绘图样式设置（论文级美观风格）
-plt.rcParams['font.sans-serif'] = ['Times New Roman', 'SimHei']  # 支持英文/中文
-plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
-plt.rcParams['font.size'] = 12
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['figure.figsize'] = (10, 6)
-sns.set_style('whitegrid')
 colors = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D']  # 论文级配色
 
 # 太空电梯参数
@@ -32,6 +28,7 @@ rho_e0 = 0.99  # 电梯基础成功率
 weibull_shape = 2.0  # 风速威布尔分布形状参数
 weibull_scale = 10.0 # 风速威布尔分布尺度参数
 MC_n = 10000  # 蒙特卡洛模拟次数（越大越精准）
+MC_chunk_size = 1_000_000  # 流式蒙特卡洛每批样本数（决定内存占用，与总样本数无关）
 
 # 火箭系统参数
 # 在轨摆渡火箭(S)
@@ -55,6 +52,8 @@ def space_elevator_availability(MC_n, k, phi_crit, v_safe, weibull_shape, weibul
     蒙特卡洛模拟计算太空电梯可用度A_SE和有效成功率
     返回：可用度序列、摆角序列、风速序列、有效成功率序列
     """
+    from scipy.stats import weibull_min, norm
+    
     # 1. 生成威布尔分布的风速
     v_wind = weibull_min.rvs(c=weibull_shape, scale=weibull_scale, size=MC_n)
     # 2. 生成摆角扰动和成功率扰动（正态分布，均值0）
@@ -76,6 +75,442 @@ def space_elevator_availability(MC_n, k, phi_crit, v_safe, weibull_shape, weibul
     Q_SE_eff = N_SE * Q_e * A_SE * rho_e_avg * (1 - beta_maint)
     return eta, phi, v_wind, rho_e_eff, A_SE, Q_SE_eff
 
+def _availability_partial_sums(rng, n, k, phi_crit, v_safe, weibull_shape, weibull_scale,
+                               epsilon_phi_scale, epsilon_scale):
+    """
+    单批蒙特卡洛样本的部分和（流式模拟的内核，只保留标量结果）
+    :param rng: numpy.random.Generator
+    :param n: 本批样本数
+    :return: (样本数, η之和, η*rho_e之和, (η*rho_e)²之和)
+    """
+    # 与 space_elevator_availability 相同的模型：威布尔风速 + 正态摆角/成功率扰动
+    v_wind = weibull_scale * rng.weibull(weibull_shape, n)
+    phi = rng.normal(0.0, epsilon_phi_scale, n)
+    phi += k * v_wind
+    eta = (phi <= phi_crit) & (v_wind <= v_safe)
+    rho_e = rng.normal(rho_e0, epsilon_scale, n)
+    np.clip(rho_e, 0, 1, out=rho_e)
+    rho_e_eff = rho_e[eta]
+    return n, rho_e_eff.size, float(rho_e_eff.sum()), float(np.dot(rho_e_eff, rho_e_eff))
+
+def _availability_batch(seed_sequence, n, model_args):
+    """
+    单个批次的任务：由该批次自己的 SeedSequence 生成随机流并计算部分和（可在子进程中执行）
+    :param seed_sequence: 本批次的 numpy.random.SeedSequence
+    :param n: 本批样本数
+    :param model_args: _availability_partial_sums 的模型参数元组
+    :return: (样本数, η之和, η*rho_e之和, (η*rho_e)²之和)
+    """
+    return _availability_partial_sums(np.random.default_rng(seed_sequence), n, *model_args)
+
+def _iter_availability_batches(MC_n, model_args, chunk_size=MC_chunk_size, seed=None, workers=1):
+    """
+    按批次顺序产出蒙特卡洛部分和
+    批次划分和每批的随机种子（batching.batch_seed）只取决于 MC_n、chunk_size 和 seed，
+    部分和按批次顺序合并，因此结果与进程数无关、逐位可复现
+    :param MC_n: 蒙特卡洛模拟总次数
+    :param model_args: _availability_partial_sums 的模型参数元组
+    :param chunk_size: 每批样本数
+    :param seed: 随机种子（整数或 numpy.random.SeedSequence）；为None时使用系统熵
+    :param workers: 进程数，1表示在当前进程中计算
+    :return: 生成器，依次产出每批的 (样本数, η之和, η*rho_e之和, (η*rho_e)²之和)；可以提前停止迭代
+    """
+    return iter_batches(_availability_batch, MC_n, chunk_size, seed, workers, model_args)
+
+def space_elevator_availability_streaming(MC_n, k, phi_crit, v_safe, weibull_shape, weibull_scale,
+                                          epsilon_phi_scale, epsilon_scale=epsilon_scale,
+                                          chunk_size=MC_chunk_size, seed=None, workers=1):
+    """
+    流式蒙特卡洛计算太空电梯可用度A_SE和有效运输量
+    按 chunk_size 分批生成样本并累加部分和，内存占用固定，MC_n 可以达到1e9量级；
+    各批次可以分发到多个进程，相同 seed 和 chunk_size 下结果与 workers 无关
+    :param MC_n: 蒙特卡洛模拟总次数
+    :param chunk_size: 每批样本数
+    :param seed: 随机种子（整数或 numpy.random.SeedSequence），每批使用由其派生的独立子种子（不修改传入的 SeedSequence）
+    :param workers: 进程数，1表示在当前进程中计算
+    :return: A_SE, 平均有效成功率rho_e_avg, 有效运输量Q_SE_eff
+    """
+    model_args = (k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale)
+    count = 0
+    eta_sum = 0
+    rho_eff_sum = 0.0
+    for n, eta_part, rho_eff_part, _ in _iter_availability_batches(MC_n, model_args, chunk_size, seed, workers):
+        count += n
+        eta_sum += eta_part
+        rho_eff_sum += rho_eff_part
+    A_SE = eta_sum / count
+    rho_e_avg = rho_eff_sum / count
+    Q_SE_eff = N_SE * Q_e * A_SE * rho_e_avg * (1 - beta_maint)
+    return A_SE, rho_e_avg, Q_SE_eff
+
+def space_elevator_availability_adaptive(k, phi_crit, v_safe, weibull_shape, weibull_scale,
+                                         epsilon_phi_scale, epsilon_scale=epsilon_scale,
+                                         A_SE_tolerance=1e-3, Q_SE_tolerance=None, confidence=0.95, min_failures=10,
+                                         chunk_size=MC_chunk_size, max_samples=10**9, seed=None, workers=1):
+    """
+    自适应蒙特卡洛：逐批抽样，直到置信区间半宽低于容差或达到样本上限
+    A_SE 为伯努利均值，区间取 Wilson 得分区间（没有观察到不可用样本时区间宽度也不为0）；
+    Q_SE_eff ∝ A_SE*rho_e_avg 的方差由 delta 方法给出，其中 A_SE 的方差取 Wilson 半宽对应的等效方差，
+    rho_e_avg 的方差和两者的协方差由 η*rho_e 的部分和与平方和计算。
+    不可用样本数少于 min_failures 时区间估计不可靠，不判定收敛。
+    每批处理完才检查停止条件，批次和种子划分与 space_elevator_availability_streaming 相同，
+    因此停止位置和结果与 workers 无关
+    :param A_SE_tolerance: A_SE 置信区间半宽容差，为None时不检查
+    :param Q_SE_tolerance: Q_SE_eff 置信区间半宽容差（吨），为None时不检查
+    :param confidence: 置信水平
+    :param min_failures: 判定收敛前至少需要观察到的不可用样本数
+    :param chunk_size: 每批样本数
+    :param max_samples: 样本数上限
+    :param seed: 随机种子（整数或 numpy.random.SeedSequence）
+    :param workers: 进程数，1表示在当前进程中计算
+    :return: 结果字典，包含 A_SE、rho_e_avg、Q_SE_eff、两者的置信区间和半宽、所用样本数 samples 及是否收敛 converged
+    """
+    import math
+    from statistics import NormalDist
+    
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    scale = N_SE * Q_e * (1 - beta_maint)
+    model_args = (k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale)
+    count = 0
+    eta_sum = 0
+    rho_eff_sum = 0.0
+    rho_eff_sq_sum = 0.0
+    converged = False
+    for n, eta_part, rho_eff_part, rho_eff_sq_part in _iter_availability_batches(
+            max_samples, model_args, chunk_size, seed, workers):
+        count += n
+        eta_sum += eta_part
+        rho_eff_sum += rho_eff_part
+        rho_eff_sq_sum += rho_eff_sq_part
+        
+        A_SE = eta_sum / count
+        rho_e_avg = rho_eff_sum / count
+        # Wilson 得分区间：中心向 1/2 收缩，半宽在 A_SE 为0或1时仍为正
+        shrink = 1 + z ** 2 / count
+        A_SE_center = (A_SE + z ** 2 / (2 * count)) / shrink
+        A_SE_half_width = z * math.sqrt(A_SE * (1 - A_SE) / count + z ** 2 / (4 * count ** 2)) / shrink
+        var_A = (A_SE_half_width / z) ** 2
+        var_rho = max(rho_eff_sq_sum / count - rho_e_avg ** 2, 0.0) / count
+        # η 为0/1变量，E[η * η*rho_e] = E[η*rho_e]，协方差为 rho_e_avg*(1-A_SE)
+        cov_A_rho = rho_e_avg * (1 - A_SE) / count
+        var_Q = scale ** 2 * (rho_e_avg ** 2 * var_A + A_SE ** 2 * var_rho + 2 * A_SE * rho_e_avg * cov_A_rho)
+        Q_SE_half_width = z * math.sqrt(max(var_Q, 0.0))
+        if (count - eta_sum >= min_failures
+                and (A_SE_tolerance is None or A_SE_half_width <= A_SE_tolerance)
+                and (Q_SE_tolerance is None or Q_SE_half_width <= Q_SE_tolerance)):
+            converged = True
+            break
+    
+    Q_SE_eff = scale * A_SE * rho_e_avg
+    return {
+        'A_SE': A_SE,
+        'A_SE_ci': (A_SE_center - A_SE_half_width, A_SE_center + A_SE_half_width),
+        'A_SE_half_width': A_SE_half_width,
+        'rho_e_avg': rho_e_avg,
+        'Q_SE_eff': Q_SE_eff,
+        'Q_SE_eff_ci': (Q_SE_eff - Q_SE_half_width, Q_SE_eff + Q_SE_half_width),
+        'Q_SE_eff_half_width': Q_SE_half_width,
+        'samples': count,
+        'converged': converged,
+    }
+
+def _default_importance_tilt(k, phi_crit, v_safe, weibull_shape, weibull_scale):
+    """
+    重要性抽样的默认倾斜率：让标准指数变量 E（v_wind = scale*E^(1/shape)）的均值落在不可用阈值附近
+    :return: 抽样分布 Exp(λ) 的速率 λ（不超过1，λ=1 即普通抽样）
+    """
+    v_threshold = min(v_safe, phi_crit / k) if k > 0 else v_safe
+    e_threshold = (v_threshold / weibull_scale) ** weibull_shape
+    return min(1.0, 1.0 / e_threshold) if e_threshold > 0 else 1.0
+
+def _availability_vr_partial_sums(rng, n, method, model_args, tilt, strata):
+    """
+    方差缩减估计量的单批部分和
+    不可用指示 1-η 乘以似然比权重后按估计单元（样本、对偶样本对或分层内样本）累加
+    :param rng: numpy.random.Generator
+    :param n: 本批模型评估次数（对偶抽样按样本对取整，不超过 n）
+    :param method: 'plain'、'importance'、'antithetic' 或 'stratified'
+    :param model_args: (k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale)
+    :param tilt: 重要性抽样分布 Exp(tilt) 的速率
+    :param strata: 分层数
+    :return: (模型评估次数, 各层单元数, 各层(1-η)权重和, 各层(1-η)权重平方和, 各层η*rho_e权重和)
+    """
+    k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale = model_args
+    weight = 1.0
+    stratum = None
+    if method == 'stratified':
+        # 风速分位数按等概率分层，每层分配 n // strata 个样本，余数分给前几层，总数恰为 n
+        stratum = np.repeat(np.arange(strata), n // strata + (np.arange(strata) < n % strata))
+        u = (stratum + rng.random(stratum.size)) / strata
+        exponential = -np.log1p(-u)
+        z_phi = rng.standard_normal(u.size)
+        z_rho = rng.standard_normal(u.size)
+    elif method == 'antithetic':
+        # 风速分位数 u 与 1-u、扰动 z 与 -z 成对使用
+        u = rng.random(n // 2)
+        exponential = np.concatenate([-np.log1p(-u), -np.log(u)])
+        z_phi = rng.standard_normal(u.size)
+        z_rho = rng.standard_normal(u.size)
+        z_phi = np.concatenate([z_phi, -z_phi])
+        z_rho = np.concatenate([z_rho, -z_rho])
+    else:
+        exponential = rng.standard_exponential(n)
+        if method == 'importance':
+            # 从更重尾的 Exp(tilt) 抽样，似然比 exp(-E) / (tilt*exp(-tilt*E))
+            exponential /= tilt
+            weight = np.exp(-(1 - tilt) * exponential) / tilt
+        z_phi = rng.standard_normal(n)
+        z_rho = rng.standard_normal(n)
+    
+    v_wind = weibull_scale * exponential ** (1 / weibull_shape)
+    phi = k * v_wind + epsilon_phi_scale * z_phi
+    eta = (phi <= phi_crit) & (v_wind <= v_safe)
+    rho_e = np.clip(rho_e0 + epsilon_scale * z_rho, 0, 1)
+    unavailable = np.where(eta, 0.0, weight)
+    # rho_e 与风速无关，E[η*rho_e] = E[rho_e] - E[(1-η)*rho_e]：前一项不加权，
+    # 只有稀有的不可用项使用似然比权重，避免重要性抽样放大可用区域的方差
+    rho_e_eff = rho_e - unavailable * rho_e
+    evaluations = v_wind.size
+    
+    if method == 'antithetic':
+        half = evaluations // 2
+        unavailable = (unavailable[:half] + unavailable[half:]) / 2
+        rho_e_eff = (rho_e_eff[:half] + rho_e_eff[half:]) / 2
+    if stratum is None:
+        return (evaluations, np.array([unavailable.size]), np.array([unavailable.sum()]),
+                np.array([np.dot(unavailable, unavailable)]), np.array([rho_e_eff.sum()]))
+    return (evaluations, np.bincount(stratum, minlength=strata),
+            np.bincount(stratum, weights=unavailable, minlength=strata),
+            np.bincount(stratum, weights=unavailable ** 2, minlength=strata),
+            np.bincount(stratum, weights=rho_e_eff, minlength=strata))
+
+def space_elevator_availability_variance_reduced(MC_n, k, phi_crit, v_safe, weibull_shape, weibull_scale,
+                                                 epsilon_phi_scale, epsilon_scale=epsilon_scale,
+                                                 method='importance', tilt=None, strata=100,
+                                                 chunk_size=MC_chunk_size, seed=None):
+    """
+    方差缩减蒙特卡洛计算太空电梯可用度A_SE和有效运输量
+    v_safe、phi_crit 较宽松时不可用是稀有事件，普通抽样需要极大的 MC_n；可选估计量：
+    'importance'（风速威布尔尾部的重要性抽样）、'antithetic'（对偶变量）、'stratified'（风速分位数分层）或 'plain'
+    :param MC_n: 模型评估总次数
+    :param method: 估计量
+    :param tilt: 重要性抽样分布 Exp(tilt) 的速率（0<tilt<=1），为None时按阈值自动选择
+    :param strata: 分层抽样的层数
+    :param chunk_size: 每批模型评估次数
+    :param seed: 随机种子（整数或 numpy.random.SeedSequence），每批使用由其派生的独立子种子（不修改传入的 SeedSequence）
+    :return: 结果字典，包含 A_SE、rho_e_avg、Q_SE_eff、A_SE 的标准误 A_SE_std_error、
+             方差缩减因子 variance_reduction（相同评估次数下普通抽样方差与本估计量方差之比，plain 恒为1）、
+             模型评估次数 samples 及所用估计量 method；
+             没有观察到不可用样本时方差估计为0不可信，A_SE_std_error 和 variance_reduction（plain 除外）为 nan
+    """
+    if method not in ('plain', 'importance', 'antithetic', 'stratified'):
+        raise ValueError(f"Unknown estimator: {method}")
+    if method == 'stratified' and min(MC_n, chunk_size) < strata:
+        raise ValueError(f"Stratified sampling needs MC_n and chunk_size >= strata ({strata})")
+    if method == 'antithetic' and MC_n < 2:
+        raise ValueError("Antithetic sampling needs MC_n >= 2")
+    if tilt is None:
+        tilt = _default_importance_tilt(k, phi_crit, v_safe, weibull_shape, weibull_scale)
+    model_args = (k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale)
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    
+    n_strata = strata if method == 'stratified' else 1
+    evaluations = 0
+    units = np.zeros(n_strata)
+    unavailable_sum = np.zeros(n_strata)
+    unavailable_sq_sum = np.zeros(n_strata)
+    rho_eff_sum = np.zeros(n_strata)
+    for i, start in enumerate(range(0, MC_n, chunk_size)):
+        rng = np.random.default_rng(batch_seed(seed_sequence, i))
+        n, units_part, unavailable_part, unavailable_sq_part, rho_eff_part = _availability_vr_partial_sums(
+            rng, min(chunk_size, MC_n - start), method, model_args, tilt, n_strata)
+        evaluations += n
+        units += units_part
+        unavailable_sum += unavailable_part
+        unavailable_sq_sum += unavailable_sq_part
+        rho_eff_sum += rho_eff_part
+    
+    # 各层等概率：总体均值为各层均值的平均，方差为各层均值方差之和除以层数平方
+    unavailable_mean = unavailable_sum / units
+    unavailable_var = np.maximum(unavailable_sq_sum / units - unavailable_mean ** 2, 0.0) * units / np.maximum(units - 1, 1)
+    A_SE = 1 - unavailable_mean.mean()
+    A_SE_var = np.sum(unavailable_var / units) / n_strata ** 2
+    rho_e_avg = (rho_eff_sum / units).mean()
+    Q_SE_eff = N_SE * Q_e * A_SE * rho_e_avg * (1 - beta_maint)
+    plain_var = A_SE * (1 - A_SE) / evaluations
+    if method == 'plain':
+        variance_reduction = 1.0
+    else:
+        variance_reduction = plain_var / A_SE_var if A_SE_var > 0 else float('nan')
+    return {
+        'A_SE': A_SE,
+        'rho_e_avg': rho_e_avg,
+        'Q_SE_eff': Q_SE_eff,
+        'A_SE_std_error': float(np.sqrt(A_SE_var)) if A_SE_var > 0 else float('nan'),
+        'variance_reduction': variance_reduction,
+        'samples': evaluations,
+        'method': method,
+    }
+
+def _expected_clipped_normal(mean, std):
+    """
+    E[clip(X, 0, 1)]，X ~ N(mean, std²) 的闭式解
+    利用 clip(X, 0, 1) = max(X, 0) - max(X - 1, 0) 及 E[max(X - a, 0)] = (mean-a)Φ(d) + std·φ(d)，d = (mean-a)/std
+    """
+    from scipy.special import ndtr
+    
+    mean = np.asarray(mean, dtype=float)
+    std = np.asarray(std, dtype=float)
+    
+    def positive_part(shift):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d = shift / std
+            value = shift * ndtr(d) + std * np.exp(-0.5 * d ** 2) / np.sqrt(2 * np.pi)
+        # std=0 时退化为确定值
+        return np.where(std > 0, value, np.maximum(shift, 0.0))
+    
+    return positive_part(mean) - positive_part(mean - 1)
+
+def space_elevator_availability_quadrature(k, phi_crit, v_safe, weibull_shape=weibull_shape,
+                                           weibull_scale=weibull_scale, epsilon_phi_scale=epsilon_phi_scale,
+                                           epsilon_scale=epsilon_scale, panels=8, order=20):
+    """
+    数值积分计算太空电梯可用度A_SE和有效运输量（与蒙特卡洛模型相同）
+    A_SE = P(k*v_wind + ε_φ <= phi_crit, v_wind <= v_safe) = ∫ f_W(v) Φ((phi_crit - k*v)/σ_φ) dv（v 从0到v_safe），
+    换元 v/scale = u^m（m = ceil(4/shape)）后被积函数为 p·u^(p-1)·e^(-u^p)·Φ(...)（p = m·shape），
+    过渡区延伸到 v=0 时也没有奇异性；在摆角阈值过渡区（±10σ_φ/k）两侧分段，
+    每段用 panels 个 order 点 Gauss-Legendre 复合求积，与 scipy.integrate.quad 的误差见 quadrature_reference_error；
+    rho_e_avg = A_SE·E[clip(rho_e0+ε, 0, 1)] 用闭式解。
+    所有参数都可以是数组，按 numpy 广播规则组成参数网格
+    :param panels: 每段的子区间数
+    :param order: 每个子区间的 Gauss-Legendre 节点数
+    :return: A_SE, 平均有效成功率rho_e_avg, 有效运输量Q_SE_eff（形状与参数网格相同）
+    """
+    from scipy.special import ndtr
+    
+    k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in
+          (k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale)))
+    
+    # 换元 v/scale = u^m、E = (v/scale)^shape = u^p：Φ 的自变量是 u^m 的多项式，
+    # p >= 4 时雅可比 p·u^(p-1) 在 u=0 处至少三阶连续可导（直接对 E 积分时 E^(1/shape-1) 在 E=0 处奇异）
+    m = np.ceil(4 / weibull_shape)
+    p = m * weibull_shape
+    
+    def to_u(v):
+        # 风速 -> u，E = u^p > 50（e^(-50) 以外）的尾部可以忽略
+        return np.minimum(np.maximum(v, 0.0) / weibull_scale, 50.0 ** (1 / weibull_shape)) ** (1 / m)
+    
+    # 分段点：0、过渡区下沿、过渡区上沿、v_safe
+    with np.errstate(divide='ignore'):
+        v_transition = np.where(k > 0, phi_crit / k, np.inf)
+        v_width = np.where(k > 0, 10 * epsilon_phi_scale / k, 0.0)
+    u_safe = to_u(v_safe)
+    breaks = [np.zeros_like(u_safe),
+              np.minimum(to_u(v_transition - v_width), u_safe),
+              np.minimum(to_u(v_transition + v_width), u_safe),
+              u_safe]
+    
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    # 每段 [a, b] 等分为 panels 个子区间，节点形状为 参数网格 + (panels*order,)
+    unit_nodes = ((np.arange(panels)[:, None] + (nodes[None, :] + 1) / 2) / panels).ravel()
+    unit_weights = np.tile(weights / (2 * panels), panels)
+    
+    A_SE = np.zeros_like(u_safe)
+    m, p = m[..., None], p[..., None]
+    for a, b in zip(breaks[:-1], breaks[1:]):
+        length = (b - a)[..., None]
+        u = a[..., None] + length * unit_nodes
+        v_wind = weibull_scale[..., None] * u ** m
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sway_ok = np.where(epsilon_phi_scale[..., None] > 0,
+                               ndtr((phi_crit[..., None] - k[..., None] * v_wind) / epsilon_phi_scale[..., None]),
+                               (k[..., None] * v_wind <= phi_crit[..., None]).astype(float))
+        A_SE += np.sum(length * unit_weights * p * u ** (p - 1) * np.exp(-u ** p) * sway_ok, axis=-1)
+    
+    rho_e_avg = A_SE * _expected_clipped_normal(rho_e0, epsilon_scale)
+    Q_SE_eff = N_SE * Q_e * A_SE * rho_e_avg * (1 - beta_maint)
+    # 标量参数时返回标量
+    return A_SE[()], rho_e_avg[()], Q_SE_eff[()]
+
+def quadrature_reference_error(n_cases=200, seed=0):
+    """
+    在随机参数上比较 space_elevator_availability_quadrature 与 scipy.integrate.quad 逐点自适应积分的A_SE
+    参数范围覆盖过渡区延伸到 v=0、形状参数小于1等情形；默认设置下最大误差在1e-11以内
+    :param n_cases: 随机参数组数
+    :param seed: 随机种子
+    :return: (最大绝对误差, 对应的参数字典)
+    """
+    from scipy.integrate import quad
+    from scipy.special import ndtr
+    
+    rng = np.random.default_rng(seed)
+    cases = {
+        'k': rng.uniform(0.005, 0.3, n_cases),
+        'phi_crit': rng.uniform(0.05, 2.0, n_cases),
+        'v_safe': rng.uniform(2.0, 40.0, n_cases),
+        'weibull_shape': rng.uniform(0.5, 6.0, n_cases),
+        'weibull_scale': rng.uniform(2.0, 20.0, n_cases),
+        'epsilon_phi_scale': rng.uniform(0.005, 0.6, n_cases),
+    }
+    A_SE = space_elevator_availability_quadrature(**cases)[0]
+    errors = np.empty(n_cases)
+    for i in range(n_cases):
+        c = {name: values[i] for name, values in cases.items()}
+        density = lambda v: (c['weibull_shape'] / c['weibull_scale'] * (v / c['weibull_scale']) ** (c['weibull_shape'] - 1)
+                             * np.exp(-(v / c['weibull_scale']) ** c['weibull_shape'])
+                             * ndtr((c['phi_crit'] - c['k'] * v) / c['epsilon_phi_scale']))
+        v_transition = c['phi_crit'] / c['k']
+        v_width = 10 * c['epsilon_phi_scale'] / c['k']
+        points = [v for v in (v_transition - v_width, v_transition, v_transition + v_width) if 0 < v < c['v_safe']]
+        reference = quad(density, 0, c['v_safe'], points=points or None, epsabs=1e-15, epsrel=1e-13, limit=2000)[0]
+        errors[i] = abs(A_SE[i] - reference)
+    worst = int(np.argmax(errors))
+    return float(errors[worst]), {name: float(values[worst]) for name, values in cases.items()}
+
+def space_elevator_availability_grid(MC_n, k, phi_crit, v_safe, weibull_shape, weibull_scale,
+                                     epsilon_phi_scale, epsilon_scale=epsilon_scale,
+                                     chunk_size=MC_chunk_size, seed=None):
+    """
+    公共随机数（CRN）蒙特卡洛：所有参数组合共用同一组随机样本
+    参数可以是标量或数组，按 numpy 广播规则组成参数网格；随机流只生成一次，
+    每个网格点只重新计算阈值判断，因此敏感性曲线不含点与点之间的抽样噪声
+    :param MC_n: 蒙特卡洛模拟总次数
+    :param chunk_size: 每批处理的 (网格点数 × 样本数) 上限，决定内存占用
+    :param seed: numpy.random.Generator 的随机种子（也可以直接传入 Generator）
+    :return: A_SE, 平均有效成功率rho_e_avg, 有效运输量Q_SE_eff（形状与参数网格相同）
+    """
+    grid = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in
+                                 (k, phi_crit, v_safe, weibull_shape, weibull_scale,
+                                  epsilon_phi_scale, epsilon_scale)))
+    shape = grid[0].shape
+    # 参数展平为列向量，与一批样本（行向量）广播
+    k, phi_crit, v_safe, weibull_shape, weibull_scale, epsilon_phi_scale, epsilon_scale = (
+        value.reshape(-1, 1) for value in grid)
+    
+    rng = np.random.default_rng(seed)
+    batch = max(1, chunk_size // k.shape[0])
+    count = 0
+    eta_sum = np.zeros(k.shape[0], dtype=np.int64)
+    rho_eff_sum = np.zeros(k.shape[0])
+    while count < MC_n:
+        n = min(batch, MC_n - count)
+        # 标准化随机流：风速由标准指数分布变换，使形状/尺度参数也能共用样本
+        exponential = rng.standard_exponential(n)
+        z_phi = rng.standard_normal(n)
+        z_rho = rng.standard_normal(n)
+        v_wind = weibull_scale * exponential ** (1 / weibull_shape)
+        phi = k * v_wind + epsilon_phi_scale * z_phi
+        eta = (phi <= phi_crit) & (v_wind <= v_safe)
+        rho_e = np.clip(rho_e0 + epsilon_scale * z_rho, 0, 1)
+        eta_sum += np.count_nonzero(eta, axis=1)
+        rho_eff_sum += np.sum(eta * rho_e, axis=1)
+        count += n
+    A_SE = (eta_sum / count).reshape(shape)
+    rho_e_avg = (rho_eff_sum / count).reshape(shape)
+    Q_SE_eff = N_SE * Q_e * A_SE * rho_e_avg * (1 - beta_maint)
+    return A_SE, rho_e_avg, Q_SE_eff
+
 def rocket_residual_loss(C_veh, N_design, n_failure):
     """
     计算火箭残值损失成本（建模公式：C = C_veh*(N-n+1)/N）
@@ -88,19 +523,40 @@ def rocket_residual_loss(C_veh, N_design, n_failure):
     C_loss = C_veh * (N_design - n_failure + 1) / N_design
     return C_loss
 
-def sensitivity_analysis(param_name, param_range, base_kwargs):
+def sensitivity_analysis(param_name, param_range, base_kwargs, common_random_numbers=False, seed=None,
+                         quadrature=False):
     """
     敏感性分析：改变单个参数，计算系统关键指标（可用度/运输量/成本）
     :param param_name: 待分析参数名（如v_safe, phi_crit, k）
     :param param_range: 待分析参数的取值范围
     :param base_kwargs: 基础参数字典
+    :param common_random_numbers: 为True时所有取值共用一组随机样本，一次广播计算整条曲线
+    :param seed: 随机种子
+    :param quadrature: 为True时用数值积分一次计算整条曲线（space_elevator_availability_quadrature），忽略 MC_n
     :return: 各参数对应的A_SE和Q_SE_eff
     """
+    if quadrature:
+        grid_kwargs = {name: value for name, value in base_kwargs.items() if name != 'MC_n'}
+        grid_kwargs[param_name] = np.asarray(param_range)
+        A_SE, _, Q_SE_eff = space_elevator_availability_quadrature(**grid_kwargs)
+        # 与逐点模式一致：基础参数字典保留最后一个取值
+        base_kwargs[param_name] = param_range[-1]
+        return A_SE, Q_SE_eff
+    
+    if common_random_numbers:
+        grid_kwargs = dict(base_kwargs)
+        grid_kwargs[param_name] = np.asarray(param_range)
+        A_SE, _, Q_SE_eff = space_elevator_availability_grid(**grid_kwargs, seed=seed)
+        # 与逐点模式一致：基础参数字典保留最后一个取值
+        base_kwargs[param_name] = param_range[-1]
+        return A_SE, Q_SE_eff
+    
     A_SE_list = []
     Q_SE_eff_list = []
     for param in param_range:
         base_kwargs[param_name] = param
-        _, _, _, _, A_SE, Q_SE_eff = space_elevator_availability(
+        # 只需要标量指标，使用固定内存的流式模拟
+        A_SE, _, Q_SE_eff = space_elevator_availability_streaming(
             MC_n=base_kwargs['MC_n'],
             k=base_kwargs['k'],
             phi_crit=base_kwargs['phi_crit'],
@@ -114,126 +570,210 @@ def sensitivity_analysis(param_name, param_range, base_kwargs):
     return np.array(A_SE_list), np.array(Q_SE_eff_list)
 
 # ===================== 3. 数据生成（蒙特卡洛+敏感性分析）=====================
-# 3.1 太空电梯蒙特卡洛模拟
-eta, phi, v_wind, rho_e_eff, A_SE, Q_SE_eff = space_elevator_availability(
-    MC_n=MC_n, k=k, phi_crit=phi_crit, v_safe=v_safe,
-    weibull_shape=weibull_shape, weibull_scale=weibull_scale,
-    epsilon_phi_scale=epsilon_phi_scale
-)
-# 3.2 火箭残值损失计算（生成1~N次故障的成本序列）
-n_failure_S = np.arange(1, N_S+1)
-C_loss_S = rocket_residual_loss(C_veh_S, N_S, n_failure_S)
-n_failure_g = np.arange(1, N_g+1)
-C_loss_g = rocket_residual_loss(C_veh_g, N_g, n_failure_g)
-# 3.3 敏感性分析（以安全风速v_safe、临界摆角phi_crit、耦合系数k为例）
-base_kwargs = {
-    'MC_n': MC_n, 'k': k, 'phi_crit': phi_crit, 'v_safe': v_safe,
-    'weibull_shape': weibull_shape, 'weibull_scale': weibull_scale,
-    'epsilon_phi_scale': epsilon_phi_scale
-}
-# 安全风速敏感性（v_safe: 10~30 m/s）
-v_safe_range = np.linspace(10, 30, 20)
-A_SE_v, Q_SE_v = sensitivity_analysis('v_safe', v_safe_range, base_kwargs)
-# 临界摆角敏感性（phi_crit: 0.5~2.0 rad）
-phi_crit_range = np.linspace(0.5, 2.0, 20)
-A_SE_phi, Q_SE_phi = sensitivity_analysis('phi_crit', phi_crit_range, base_kwargs)
-# 耦合系数敏感性（k: 0.01~0.1 rad/(m/s)）
-k_range = np.linspace(0.01, 0.1, 20)
-A_SE_k, Q_SE_k = sensitivity_analysis('k', k_range, base_kwargs)
+def run_simulation():
+    """
+    运行太空电梯蒙特卡洛模拟、火箭残值损失计算和敏感性分析
+    :return: 结果字典（模拟样本、残值损失序列、各敏感性曲线）
+    """
+    # 3.1 太空电梯蒙特卡洛模拟
+    eta, phi, v_wind, rho_e_eff, A_SE, Q_SE_eff = space_elevator_availability(
+        MC_n=MC_n, k=k, phi_crit=phi_crit, v_safe=v_safe,
+        weibull_shape=weibull_shape, weibull_scale=weibull_scale,
+        epsilon_phi_scale=epsilon_phi_scale
+    )
+    # 3.2 火箭残值损失计算（生成1~N次故障的成本序列）
+    n_failure_S = np.arange(1, N_S+1)
+    C_loss_S = rocket_residual_loss(C_veh_S, N_S, n_failure_S)
+    n_failure_g = np.arange(1, N_g+1)
+    C_loss_g = rocket_residual_loss(C_veh_g, N_g, n_failure_g)
+    # 3.3 敏感性分析（以安全风速v_safe、临界摆角phi_crit、耦合系数k为例，数值积分无抽样噪声）
+    base_kwargs = {
+        'MC_n': MC_n, 'k': k, 'phi_crit': phi_crit, 'v_safe': v_safe,
+        'weibull_shape': weibull_shape, 'weibull_scale': weibull_scale,
+        'epsilon_phi_scale': epsilon_phi_scale
+    }
+    # 安全风速敏感性（v_safe: 10~30 m/s）
+    v_safe_range = np.linspace(10, 30, 20)
+    A_SE_v, Q_SE_v = sensitivity_analysis('v_safe', v_safe_range, base_kwargs, quadrature=True)
+    # 临界摆角敏感性（phi_crit: 0.5~2.0 rad）
+    phi_crit_range = np.linspace(0.5, 2.0, 20)
+    A_SE_phi, Q_SE_phi = sensitivity_analysis('phi_crit', phi_crit_range, base_kwargs, quadrature=True)
+    # 耦合系数敏感性（k: 0.01~0.1 rad/(m/s)）
+    k_range = np.linspace(0.01, 0.1, 20)
+    A_SE_k, Q_SE_k = sensitivity_analysis('k', k_range, base_kwargs, quadrature=True)
+    return {
+        'eta': eta,
+        'phi': phi,
+        'v_wind': v_wind,
+        'rho_e_eff': rho_e_eff,
+        'A_SE': A_SE,
+        'Q_SE_eff': Q_SE_eff,
+        'n_failure_S': n_failure_S,
+        'C_loss_S': C_loss_S,
+        'n_failure_g': n_failure_g,
+        'C_loss_g': C_loss_g,
+        'v_safe_range': v_safe_range,
+        'A_SE_v': A_SE_v,
+        'Q_SE_v': Q_SE_v,
+        'phi_crit_range': phi_crit_range,
+        'A_SE_phi': A_SE_phi,
+        'Q_SE_phi': Q_SE_phi,
+        'k_range': k_range,
+        'A_SE_k': A_SE_k,
+        'Q_SE_k': Q_SE_k,
+    }
 
 # ===================== 4. 绘制4类核心图表（论文级）=====================
-# ---------- 图1：太空电梯风速-摆角分布+可用度阈值（散点图，核心展示环境约束） ----------
-fig1, ax1 = plt.subplots(figsize=(8, 6))
-# 绘制散点：可用(蓝色)、不可用(红色)
-mask_available = (phi <= phi_crit) & (v_wind <= v_safe)
-ax1.scatter(v_wind[mask_available], phi[mask_available], c=colors[0], s=1, alpha=0.6, label=f'Available (A_SE={A_SE:.3f})')
-ax1.scatter(v_wind[~mask_available], phi[~mask_available], c=colors[3], s=1, alpha=0.3, label='Unavailable')
-# 绘制阈值线：安全风速、临界摆角
-ax1.axvline(x=v_safe, c=colors[2], lw=2, ls='--', label=f'v_safe={v_safe} m/s')
-ax1.axhline(y=phi_crit, c=colors[1], lw=2, ls='--', label=f'phi_crit={phi_crit} rad')
-# 标注
-ax1.set_xlabel('Wind Speed $v_{wind}$ (m/s)')
-ax1.set_ylabel('Sway Angle $\\phi$ (rad)')
-ax1.set_title('Space Elevator Wind Speed - Sway Angle Distribution & Availability Threshold')
-ax1.legend(loc='upper right')
-ax1.set_xlim(0, max(v_wind)*1.1)
-ax1.set_ylim(0, max(phi)*1.1)
-plt.tight_layout()
-plt.savefig('fig1_elevator_availability_threshold.png', bbox_inches='tight')
-
-# ---------- 图2：火箭残值损失成本曲线（折线图，对比在轨/地面火箭） ----------
-fig2, ax2 = plt.subplots(figsize=(8, 6))
-# 绘制两条曲线
-ax2.plot(n_failure_S, C_loss_S/1e6, c=colors[0], lw=2, label=f'Orbital Tug (C_veh=${C_veh_S/1e6:.0f}$M, N={N_S})')
-ax2.plot(n_failure_g, C_loss_g/1e6, c=colors[1], lw=2, label=f'Ground Rocket (C_veh=${C_veh_g/1e6:.0f}$M, N={N_g})')
-# 标注
-ax2.set_xlabel('Failure Occurs at n-th Mission')
-ax2.set_ylabel('Residual Value Loss Cost (Million USD)')
-ax2.set_title('Rocket Residual Value Loss vs. Failure Mission Number (Linear Depreciation)')
-ax2.legend(loc='upper right')
-ax2.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('fig2_rocket_residual_loss.png', bbox_inches='tight')
-
-# ---------- 图3：太空电梯关键参数敏感性分析（子图，核心展示鲁棒性） ----------
-fig3, (ax31, ax32, ax33) = plt.subplots(1, 3, figsize=(15, 5))
-# 子图1：安全风速v_safe对可用度A_SE的影响
-ax31.plot(v_safe_range, A_SE_v, c=colors[0], lw=2, marker='o', ms=3)
-ax31.set_xlabel('Safe Wind Speed $v_{safe}$ (m/s)')
-ax31.set_ylabel('Space Elevator Availability $A_{SE}$')
-ax31.set_title('Sensitivity to Safe Wind Speed')
-ax31.grid(True, alpha=0.3)
-# 子图2：临界摆角phi_crit对可用度A_SE的影响
-ax32.plot(phi_crit_range, A_SE_phi, c=colors[1], lw=2, marker='o', ms=3)
-ax32.set_xlabel('Critical Sway Angle $\\phi_{crit}$ (rad)')
-ax32.set_ylabel('Space Elevator Availability $A_{SE}$')
-ax32.set_title('Sensitivity to Critical Sway Angle')
-ax32.grid(True, alpha=0.3)
-# 子图3：耦合系数k对可用度A_SE的影响
-ax33.plot(k_range, A_SE_k, c=colors[2], lw=2, marker='o', ms=3)
-ax33.set_xlabel('Coupling Coefficient k (rad/(m/s))')
-ax33.set_ylabel('Space Elevator Availability $A_{SE}$')
-ax33.set_title('Sensitivity to Coupling Coefficient')
-ax33.grid(True, alpha=0.3)
-# 整体标题
-fig3.suptitle('Space Elevator Availability - Key Parameter Sensitivity Analysis', y=1.02)
-plt.tight_layout()
-plt.savefig('fig3_elevator_sensitivity_analysis.png', bbox_inches='tight')
-
-# ---------- 图4：太空电梯有效运输量vs参数+系统可用度对比（柱状+折线，多指标分析） ----------
-fig4, (ax41, ax42) = plt.subplots(2, 1, figsize=(10, 8))
-# 子图1：参数对有效运输量的影响
-ax41.plot(v_safe_range, Q_SE_v, c=colors[0], lw=2, label='$v_{safe}$ (10~30 m/s)')
-ax41.plot(phi_crit_range, Q_SE_phi, c=colors[1], lw=2, label='$\\phi_{crit}$ (0.5~2.0 rad)')
-ax41.plot(k_range, Q_SE_k, c=colors[2], lw=2, label='$k$ (0.01~0.1 rad/(m/s))')
-ax41.set_xlabel('Parameter Value')
-ax41.set_ylabel('Effective Throughput $Q_{SE_{eff}}$ (ton)')
-ax41.set_title('Space Elevator Effective Throughput vs. Key Parameters')
-ax41.legend()
-ax41.grid(True, alpha=0.3)
-# 子图2：不同运输系统可用度对比（柱状图：电梯/在轨火箭/地面火箭）
-systems = ['Space Elevator', 'Orbital Tug (S)', 'Ground Rocket (g)']
-availabilities = [A_SE, A_S, A_g]
-ax42.bar(systems, availabilities, color=[colors[0], colors[1], colors[2]], alpha=0.8, width=0.6)
-# 标注数值
-for i, v in enumerate(availabilities):
-    ax42.text(i, v+0.01, f'{v:.3f}', ha='center', va='bottom', fontweight='bold')
-ax42.set_ylabel('System Availability $A$')
-ax42.set_title('Availability Comparison of Different Transportation Systems')
-ax42.set_ylim(0, 1.05)
-plt.tight_layout()
-plt.savefig('fig4_throughput_vs_availability.png', bbox_inches='tight')
-
-# 显示所有图
-plt.show()
+def plot_results(results, show=True):
+    """
+    绘制4类核心图表并保存到当前目录
+    :param results: run_simulation 返回的结果字典
+    :param show: 是否调用 plt.show() 显示图形
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    # 绘图样式设置（论文级美观风格）
+    plt.rcParams['font.sans-serif'] = ['Times New Roman', 'SimHei']  # 支持英文/中文
+    plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
+    plt.rcParams['font.size'] = 12
+    plt.rcParams['figure.dpi'] = 300
+    plt.rcParams['savefig.dpi'] = 300
+    plt.rcParams['figure.figsize'] = (10, 6)
+    sns.set_style('whitegrid')
+    
+    phi = results['phi']
+    v_wind = results['v_wind']
+    A_SE = results['A_SE']
+    n_failure_S = results['n_failure_S']
+    C_loss_S = results['C_loss_S']
+    n_failure_g = results['n_failure_g']
+    C_loss_g = results['C_loss_g']
+    v_safe_range = results['v_safe_range']
+    A_SE_v = results['A_SE_v']
+    Q_SE_v = results['Q_SE_v']
+    phi_crit_range = results['phi_crit_range']
+    A_SE_phi = results['A_SE_phi']
+    Q_SE_phi = results['Q_SE_phi']
+    k_range = results['k_range']
+    A_SE_k = results['A_SE_k']
+    Q_SE_k = results['Q_SE_k']
+
+    # ---------- 图1：太空电梯风速-摆角分布+可用度阈值（散点图，核心展示环境约束） ----------
+    fig1, ax1 = plt.subplots(figsize=(8, 6))
+    # 绘制散点：可用(蓝色)、不可用(红色)
+    mask_available = (phi <= phi_crit) & (v_wind <= v_safe)
+    ax1.scatter(v_wind[mask_available], phi[mask_available], c=colors[0], s=1, alpha=0.6, label=f'Available (A_SE={A_SE:.3f})')
+    ax1.scatter(v_wind[~mask_available], phi[~mask_available], c=colors[3], s=1, alpha=0.3, label='Unavailable')
+    # 绘制阈值线：安全风速、临界摆角
+    ax1.axvline(x=v_safe, c=colors[2], lw=2, ls='--', label=f'v_safe={v_safe} m/s')
+    ax1.axhline(y=phi_crit, c=colors[1], lw=2, ls='--', label=f'phi_crit={phi_crit} rad')
+    # 标注
+    ax1.set_xlabel('Wind Speed $v_{wind}$ (m/s)')
+    ax1.set_ylabel('Sway Angle $\\phi$ (rad)')
+    ax1.set_title('Space Elevator Wind Speed - Sway Angle Distribution & Availability Threshold')
+    ax1.legend(loc='upper right')
+    ax1.set_xlim(0, max(v_wind)*1.1)
+    ax1.set_ylim(0, max(phi)*1.1)
+    plt.tight_layout()
+    plt.savefig('fig1_elevator_availability_threshold.png', bbox_inches='tight')
+
+    # ---------- 图2：火箭残值损失成本曲线（折线图，对比在轨/地面火箭） ----------
+    fig2, ax2 = plt.subplots(figsize=(8, 6))
+    # 绘制两条曲线
+    ax2.plot(n_failure_S, C_loss_S/1e6, c=colors[0], lw=2, label=f'Orbital Tug (C_veh=${C_veh_S/1e6:.0f}$M, N={N_S})')
+    ax2.plot(n_failure_g, C_loss_g/1e6, c=colors[1], lw=2, label=f'Ground Rocket (C_veh=${C_veh_g/1e6:.0f}$M, N={N_g})')
+    # 标注
+    ax2.set_xlabel('Failure Occurs at n-th Mission')
+    ax2.set_ylabel('Residual Value Loss Cost (Million USD)')
+    ax2.set_title('Rocket Residual Value Loss vs. Failure Mission Number (Linear Depreciation)')
+    ax2.legend(loc='upper right')
+    ax2.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig('fig2_rocket_residual_loss.png', bbox_inches='tight')
+
+    # ---------- 图3：太空电梯关键参数敏感性分析（子图，核心展示鲁棒性） ----------
+    fig3, (ax31, ax32, ax33) = plt.subplots(1, 3, figsize=(15, 5))
+    # 子图1：安全风速v_safe对可用度A_SE的影响
+    ax31.plot(v_safe_range, A_SE_v, c=colors[0], lw=2, marker='o', ms=3)
+    ax31.set_xlabel('Safe Wind Speed $v_{safe}$ (m/s)')
+    ax31.set_ylabel('Space Elevator Availability $A_{SE}$')
+    ax31.set_title('Sensitivity to Safe Wind Speed')
+    ax31.grid(True, alpha=0.3)
+    # 子图2：临界摆角phi_crit对可用度A_SE的影响
+    ax32.plot(phi_crit_range, A_SE_phi, c=colors[1], lw=2, marker='o', ms=3)
+    ax32.set_xlabel('Critical Sway Angle $\\phi_{crit}$ (rad)')
+    ax32.set_ylabel('Space Elevator Availability $A_{SE}$')
+    ax32.set_title('Sensitivity to Critical Sway Angle')
+    ax32.grid(True, alpha=0.3)
+    # 子图3：耦合系数k对可用度A_SE的影响
+    ax33.plot(k_range, A_SE_k, c=colors[2], lw=2, marker='o', ms=3)
+    ax33.set_xlabel('Coupling Coefficient k (rad/(m/s))')
+    ax33.set_ylabel('Space Elevator Availability $A_{SE}$')
+    ax33.set_title('Sensitivity to Coupling Coefficient')
+    ax33.grid(True, alpha=0.3)
+    # 整体标题
+    fig3.suptitle('Space Elevator Availability - Key Parameter Sensitivity Analysis', y=1.02)
+    plt.tight_layout()
+    plt.savefig('fig3_elevator_sensitivity_analysis.png', bbox_inches='tight')
+
+    # ---------- 图4：太空电梯有效运输量vs参数+系统可用度对比（柱状+折线，多指标分析） ----------
+    fig4, (ax41, ax42) = plt.subplots(2, 1, figsize=(10, 8))
+    # 子图1：参数对有效运输量的影响
+    ax41.plot(v_safe_range, Q_SE_v, c=colors[0], lw=2, label='$v_{safe}$ (10~30 m/s)')
+    ax41.plot(phi_crit_range, Q_SE_phi, c=colors[1], lw=2, label='$\\phi_{crit}$ (0.5~2.0 rad)')
+    ax41.plot(k_range, Q_SE_k, c=colors[2], lw=2, label='$k$ (0.01~0.1 rad/(m/s))')
+    ax41.set_xlabel('Parameter Value')
+    ax41.set_ylabel('Effective Throughput $Q_{SE_{eff}}$ (ton)')
+    ax41.set_title('Space Elevator Effective Throughput vs. Key Parameters')
+    ax41.legend()
+    ax41.grid(True, alpha=0.3)
+    # 子图2：不同运输系统可用度对比（柱状图：电梯/在轨火箭/地面火箭）
+    systems = ['Space Elevator', 'Orbital Tug (S)', 'Ground Rocket (g)']
+    availabilities = [A_SE, A_S, A_g]
+    ax42.bar(systems, availabilities, color=[colors[0], colors[1], colors[2]], alpha=0.8, width=0.6)
+    # 标注数值
+    for i, v in enumerate(availabilities):
+        ax42.text(i, v+0.01, f'{v:.3f}', ha='center', va='bottom', fontweight='bold')
+    ax42.set_ylabel('System Availability $A$')
+    ax42.set_title('Availability Comparison of Different Transportation Systems')
+    ax42.set_ylim(0, 1.05)
+    plt.tight_layout()
+    plt.savefig('fig4_throughput_vs_availability.png', bbox_inches='tight')
+
+    # 显示所有图
+    if show:
+        plt.show()
 
 # ===================== 5. 输出关键模拟结果 =====================
-print("="*50)
-print("Problem2 Core Simulation Results")
-print("="*50)
-print(f"Space Elevator Long-term Availability A_SE: {A_SE:.3f}")
-print(f"Space Elevator Average Effective Success Rate: {np.mean(rho_e_eff):.3f}")
-print(f"Space Elevator Effective Throughput Q_SE_eff: {Q_SE_eff:.2f} ton")
-print(f"Orbital Tug Max Residual Loss: {C_loss_S[0]/1e6:.2f} Million USD (1st mission failure)")
-print(f"Ground Rocket Max Residual Loss: {C_loss_g[0]/1e6:.2f} Million USD (1st mission failure)")
-print("="*50)
\ No newline at end of file
+def print_results(results):
+    """
+    输出关键模拟结果
+    :param results: run_simulation 返回的结果字典
+    """
+    rho_e_eff = results['rho_e_eff']
+    A_SE = results['A_SE']
+    Q_SE_eff = results['Q_SE_eff']
+    C_loss_S = results['C_loss_S']
+    C_loss_g = results['C_loss_g']
+    print("="*50)
+    print("Problem2 Core Simulation Results")
+    print("="*50)
+    print(f"Space Elevator Long-term Availability A_SE: {A_SE:.3f}")
+    print(f"Space Elevator Average Effective Success Rate: {np.mean(rho_e_eff):.3f}")
+    print(f"Space Elevator Effective Throughput Q_SE_eff: {Q_SE_eff:.2f} ton")
+    print(f"Orbital Tug Max Residual Loss: {C_loss_S[0]/1e6:.2f} Million USD (1st mission failure)")
+    print(f"Ground Rocket Max Residual Loss: {C_loss_g[0]/1e6:.2f} Million USD (1st mission failure)")
+    print("="*50)
+
+
+def main():
+    """运行模拟、绘制图表并输出关键结果"""
+    warnings.filterwarnings('ignore')
+    results = run_simulation()
+    plot_results(results)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+单进程分析流程
+在同一进程中运行 main_model 并将结果表直接交给 plotter，省去第二次启动解释器和重新读取结果文件
+"""
+from src import main_model, plotter
+
+
+def main(workers=1, incremental=True):
+    """运行模型计算并生成全部图表
+    
+    Args:
+        workers (int, optional): 绘图进程数，传给 plotter.main。默认为1
+        incremental (bool, optional): 是否只重绘输入发生变化的图片，传给 plotter.main。默认为True
+    """
+    print("Running model analysis...")
+    results = main_model.main()
+    
+    # 结果表直接交给画图工具，读取函数不再访问磁盘
+    for problem, tables in results.items():
+        plotter.set_in_memory_results(problem, tables)
+    
+    print("Generating charts...")
+    plotter.main(workers=workers, incremental=incremental)
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Run the model and generate all charts')
+    parser.add_argument('--workers', type=int, default=1, help='number of chart rendering processes')
+    parser.add_argument('--force', action='store_true', help='redraw every chart even if its inputs are unchanged')
+    args = parser.parse_args()
+    main(workers=args.workers, incremental=not args.force)
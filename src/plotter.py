@@ -1,11 +1,19 @@
 """
 plotter for main_model
 """
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 from scipy.interpolate import interp1d
 from mpl_toolkits.mplot3d import Axes3D
+import concurrent.futures
+import contextlib
+import copy
+import hashlib
+import inspect
+import io
+import json
 import os
 
 from .constants import *
@@ -25,20 +33,117 @@ def get_results_dir(problem=None):
         return os.path.join(base_dir, f'problem_{problem}')
     return base_dir
 
+# 进程内结果表：由 main_model 直接传入时，读取函数不再访问磁盘
+_in_memory_results = {}
+
+def set_in_memory_results(problem, tables):
+    """注册 main_model.calculate_results / save_results_to_file 返回的结果表
+    
+    Args:
+        problem (int): 问题编号
+        tables (dict): 结果表名称到结构化数组的映射
+    """
+    _in_memory_results[problem] = tables
+
+def clear_in_memory_results():
+    """清除已注册的进程内结果表，之后的读取回到磁盘文件"""
+    _in_memory_results.clear()
+
+# 已解析结果文件的缓存：路径 -> ((mtime_ns, size), 解析结果)
+_parsed_cache = {}
+
+def _read_cached(path, parser, copy_result=True):
+    """读取结果文件，每个文件在本进程内只解析一次
+    
+    以文件路径为键、以修改时间和大小作为版本，main_model 重写文件后缓存自动失效
+    
+    Args:
+        path (str): 结果文件路径
+        parser (callable): 解析函数，参数为文件路径
+        copy_result (bool, optional): 是否返回缓存结果的深拷贝，避免调用方修改缓存。默认为True
+        
+    Returns:
+        解析函数的返回值
+    """
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(path)
+    entry = _parsed_cache.get(key)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, parser(path))
+        _parsed_cache[key] = entry
+    return copy.deepcopy(entry[1]) if copy_result else entry[1]
+
+def clear_parsed_cache():
+    """清空已解析结果文件的缓存"""
+    _parsed_cache.clear()
+
+# 读取列式结果表
+def read_columnar_table(problem, table_name):
+    """读取 main_model 的列式结果表
+    
+    优先使用通过 set_in_memory_results 注册的进程内结果，否则以 mmap 方式读取磁盘上的列式文件
+    
+    Args:
+        problem (int): 问题编号
+        table_name (str): 结果表名称，如 'ratio_analysis'
+        
+    Returns:
+        numpy.ndarray: 结构化数组；没有进程内结果且 schema 文件不存在、版本不一致或缺少该表时返回None
+    """
+    if table_name in _in_memory_results.get(problem, {}):
+        return _in_memory_results[problem][table_name]
+    
+    results_dir = get_results_dir(problem)
+    schema_file = os.path.join(results_dir, RESULTS_SCHEMA_FILE)
+    if not os.path.exists(schema_file):
+        return None
+    schema = _read_cached(schema_file, _parse_schema_file)
+    if schema.get('schema_version') != RESULTS_SCHEMA_VERSION or table_name not in schema.get('tables', {}):
+        return None
+    # mmap 数组为只读，缓存中的对象可以直接共享
+    return _read_cached(os.path.join(results_dir, schema['tables'][table_name]['file']),
+                        _load_columnar_file, copy_result=False)
+
+def _parse_schema_file(schema_file):
+    """解析列式结果的 schema 文件"""
+    with open(schema_file, 'r') as f:
+        return json.load(f)
+
+def _load_columnar_file(table_file):
+    """以 mmap 方式打开单个列式结果表"""
+    return np.load(table_file, mmap_mode='r')
+
 # 读取场景分析结果
 def read_scenario_analysis(problem=2):
     """读取场景分析结果
     
+    优先读取列式结果，不存在时解析文本文件
+    
     Args:
         problem (int, optional): 问题编号，1表示Problem 1，2表示Problem 2。默认为2
         
     Returns:
         list: 场景分析结果列表
     """
+    _record_input(problem, 'scenario_analysis')
+    table = read_columnar_table(problem, 'scenario_analysis')
+    if table is not None:
+        scenarios = []
+        for name, years, completion_year, cost, elevator_ratio, rocket_ratio in table.tolist():
+            scenario = {'name': name, 'years': years, 'completion_year': int(completion_year), 'cost': cost}
+            if not np.isnan(elevator_ratio):
+                scenario['elevator_ratio'] = elevator_ratio
+                scenario['rocket_ratio'] = rocket_ratio
+            scenarios.append(scenario)
+        return scenarios
+    
+    scenario_file = os.path.join(get_results_dir(problem), 'scenario_analysis.txt')
+    return _read_cached(scenario_file, _parse_scenario_file)
+
+def _parse_scenario_file(scenario_file):
+    """解析 scenario_analysis.txt"""
     scenarios = []
-    results_dir = get_results_dir(problem)
-    scenario_file = os.path.join(results_dir, 'scenario_analysis.txt')
-    
     with open(scenario_file, 'r') as f:
         lines = f.readlines()
         current_scenario = {}
@@ -69,18 +174,27 @@ def read_scenario_analysis(problem=2):
 def read_ratio_analysis(problem=2):
     """读取组合场景比例分析结果
     
+    优先以 mmap 方式读取列式结果（返回 numpy 数组），不存在时解析文本文件（返回列表）
+    
     Args:
         problem (int, optional): 问题编号，1表示Problem 1，2表示Problem 2。默认为2
         
     Returns:
         tuple: 包含比例、时间和成本的元组
     """
+    _record_input(problem, 'ratio_analysis')
+    table = read_columnar_table(problem, 'ratio_analysis')
+    if table is not None:
+        return table['elevator_ratio'], table['years_needed'], table['total_cost']
+    
+    ratio_file = os.path.join(get_results_dir(problem), 'ratio_analysis.txt')
+    return _read_cached(ratio_file, _parse_ratio_file)
+
+def _parse_ratio_file(ratio_file):
+    """解析 ratio_analysis.txt"""
     ratios = []
     years = []
     costs = []
-    results_dir = get_results_dir(problem)
-    ratio_file = os.path.join(results_dir, 'ratio_analysis.txt')
-    
     with open(ratio_file, 'r') as f:
         lines = f.readlines()
         current_ratio = {}
@@ -109,21 +223,30 @@ def read_ratio_analysis(problem=2):
 def read_time_limit_analysis(problem=2):
     """读取不同时间限制下的最优方案结果
     
+    优先以 mmap 方式读取列式结果（返回 numpy 数组），不存在时解析文本文件（返回列表）
+    
     Args:
         problem (int, optional): 问题编号，1表示Problem 1，2表示Problem 2。默认为2
         
     Returns:
         tuple: 包含时间限制、实际时间、成本、太空电梯比例和传统火箭比例的元组
     """
+    _record_input(problem, 'time_limit_analysis')
+    table = read_columnar_table(problem, 'time_limit_analysis')
+    if table is not None:
+        return (table['time_limit'], table['years_needed'], table['total_cost'],
+                table['elevator_ratio'], table['rocket_ratio'])
+    
+    time_limit_file = os.path.join(get_results_dir(problem), 'time_limit_analysis.txt')
+    return _read_cached(time_limit_file, _parse_time_limit_file)
+
+def _parse_time_limit_file(time_limit_file):
+    """解析 time_limit_analysis.txt"""
     time_limits = []
     actual_years = []
     costs = []
     elevator_ratios = []
     rocket_ratios = []
-    
-    results_dir = get_results_dir(problem)
-    time_limit_file = os.path.join(results_dir, 'time_limit_analysis.txt')
-    
     with open(time_limit_file, 'r') as f:
         lines = f.readlines()
         current_scenario = {}
@@ -1511,54 +1634,268 @@ def plot_reliability_3d_heatmap():
     print(f'3D heatmap chart saved to {output_file}')
 
 # Main function
-def main():
-    """Run all plotting functions for both problems"""
-    # 运行 Problem 1（100%可靠性）的绘图
-    print("=== Problem 1: 100%可靠性 ===")
-    plot_scenario_comparison(1)
-    plot_ratio_analysis(1)
-    plot_time_limit_analysis(1)
-    
-    # 运行 Problem 2（当前可靠性）的绘图
-    print("\n=== Problem 2: 当前可靠性 ===")
-    plot_scenario_comparison(2)
-    plot_ratio_analysis(2)
-    plot_time_limit_analysis(2)
-    
-    # 运行 Problem 3（额外材料需求）的绘图
-    print("\n=== Problem 3: 额外材料需求 ===")
-    plot_scenario_comparison_p3()
-    plot_ratio_analysis_p3()
-    plot_time_limit_analysis_p3()
-    
-    # 绘制Problem 2 vs Problem 3对比图
-    print("\n=== Problem 2 vs Problem 3 Comparison ===")
-    plot_problem_2_vs_3_comparison()
-    plot_ratio_comparison_p2_p3()
-    
-    # 绘制可靠性对比图
-    print("\n=== Reliability Comparison ===")
-    plot_reliability_comparison()
-    plot_reliability_difference_analysis()
-    plot_reliability_statistics()
-    plot_reliability_3d_analysis()
-    
-    # 绘制不同风格的3D图表
-    print("\n=== Different 3D Styles ===")
-    plot_reliability_3d_style1()
-    plot_reliability_3d_style2()
-    plot_reliability_3d_style3()
-    plot_reliability_3d_style4()
-    
-    # 绘制更多样化的3D图表
-    print("\n=== More 3D Visualizations ===")
-    plot_reliability_3d_scatter_diff()
-    plot_reliability_3d_surface()
-    plot_reliability_3d_wireframe()
-    plot_reliability_3d_relative_bars()
-    plot_reliability_3d_contour()
-    plot_reliability_3d_waterfall()
-    plot_reliability_3d_heatmap()
+def _plot_tasks():
+    """按输出顺序列出全部绘图任务
+    
+    Returns:
+        list: (分组标题, [(绘图函数, 参数元组), ...]) 列表；每个绘图函数写入固定的输出路径，互不依赖
+    """
+    return [
+        # 运行 Problem 1（100%可靠性）的绘图
+        ("=== Problem 1: 100%可靠性 ===", [
+            (plot_scenario_comparison, (1,)),
+            (plot_ratio_analysis, (1,)),
+            (plot_time_limit_analysis, (1,)),
+        ]),
+        # 运行 Problem 2（当前可靠性）的绘图
+        ("\n=== Problem 2: 当前可靠性 ===", [
+            (plot_scenario_comparison, (2,)),
+            (plot_ratio_analysis, (2,)),
+            (plot_time_limit_analysis, (2,)),
+        ]),
+        # 运行 Problem 3（额外材料需求）的绘图
+        ("\n=== Problem 3: 额外材料需求 ===", [
+            (plot_scenario_comparison_p3, ()),
+            (plot_ratio_analysis_p3, ()),
+            (plot_time_limit_analysis_p3, ()),
+        ]),
+        # 绘制Problem 2 vs Problem 3对比图
+        ("\n=== Problem 2 vs Problem 3 Comparison ===", [
+            (plot_problem_2_vs_3_comparison, ()),
+            (plot_ratio_comparison_p2_p3, ()),
+        ]),
+        # 绘制可靠性对比图
+        ("\n=== Reliability Comparison ===", [
+            (plot_reliability_comparison, ()),
+            (plot_reliability_difference_analysis, ()),
+            (plot_reliability_statistics, ()),
+            (plot_reliability_3d_analysis, ()),
+        ]),
+        # 绘制不同风格的3D图表
+        ("\n=== Different 3D Styles ===", [
+            (plot_reliability_3d_style1, ()),
+            (plot_reliability_3d_style2, ()),
+            (plot_reliability_3d_style3, ()),
+            (plot_reliability_3d_style4, ()),
+        ]),
+        # 绘制更多样化的3D图表
+        ("\n=== More 3D Visualizations ===", [
+            (plot_reliability_3d_scatter_diff, ()),
+            (plot_reliability_3d_surface, ()),
+            (plot_reliability_3d_wireframe, ()),
+            (plot_reliability_3d_relative_bars, ()),
+            (plot_reliability_3d_contour, ()),
+            (plot_reliability_3d_waterfall, ()),
+            (plot_reliability_3d_heatmap, ()),
+        ]),
+    ]
+
+def _init_render_worker(in_memory_results):
+    """渲染进程初始化：切换到 Agg 后端并注册主进程传入的结果表
+    
+    Args:
+        in_memory_results (dict): 问题编号到结果表的映射
+    """
+    plt.switch_backend('Agg')
+    _in_memory_results.update(in_memory_results)
+
+# 每个绘图任务开始时使用的样式设置
+_TASK_RC_PARAMS = {'font.size': 12}
+
+# 当前绘图任务读取的结果表，在 _render_task 之外为None
+_recorded_inputs = None
+
+def _record_input(problem, table_name):
+    """记录当前绘图任务读取的结果表，用于增量重绘的清单"""
+    if _recorded_inputs is not None:
+        _recorded_inputs.add((problem, table_name))
+
+def _render_task(task):
+    """执行单个绘图任务并关闭其创建的图形
+    
+    Args:
+        task (tuple): (绘图函数, 参数元组)
+        
+    Returns:
+        tuple: (绘图函数打印的输出, 读取的结果表列表, 保存的图片路径列表)；输出由主进程按任务顺序统一打印
+    """
+    global _recorded_inputs
+    func, args = task
+    buffer = io.StringIO()
+    saved_files = []
+    savefig = plt.savefig
+    
+    def recording_savefig(fname, *savefig_args, **savefig_kwargs):
+        saved_files.append(os.path.abspath(fname))
+        return savefig(fname, *savefig_args, **savefig_kwargs)
+    
+    _recorded_inputs = set()
+    plt.savefig = recording_savefig
+    try:
+        # 每个任务都从相同的样式设置（12号字体）开始，绘图函数中的 plt.style.use / rcParams 修改
+        # 不会影响其他任务，因此输出与任务顺序和进程数无关
+        with plt.rc_context(_TASK_RC_PARAMS), contextlib.redirect_stdout(buffer):
+            func(*args)
+        inputs = sorted(_recorded_inputs)
+    finally:
+        plt.savefig = savefig
+        _recorded_inputs = None
+        plt.close('all')
+    return buffer.getvalue(), inputs, saved_files
+
+def _task_key(task):
+    """绘图任务在清单中的键，如 'plot_ratio_analysis(1)'"""
+    func, args = task
+    return f"{func.__name__}({', '.join(repr(arg) for arg in args)})"
+
+def _hash_text(text):
+    """字符串的 SHA-256 哈希"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _function_digest(func):
+    """绘图函数源代码的哈希"""
+    return _hash_text(inspect.getsource(func))
+
+def _style_digest():
+    """影响图片外观的样式参数的哈希"""
+    return _hash_text(json.dumps({
+        'rc_params': _TASK_RC_PARAMS,
+        'granularity': DEFAULT_GRANULARITY,
+        'matplotlib': matplotlib.__version__,
+    }, sort_keys=True))
+
+def _input_digest(problem, table_name, digests):
+    """结果表内容的哈希
+    
+    有列式结果（进程内或磁盘）时哈希数组的 dtype 和数据，否则哈希文本结果文件
+    
+    Args:
+        problem (int): 问题编号
+        table_name (str): 结果表名称
+        digests (dict): 本次运行中已计算的哈希，避免重复计算
+        
+    Returns:
+        str: 十六进制哈希；结果不存在时返回None
+    """
+    key = f'problem_{problem}/{table_name}'
+    if key not in digests:
+        table = read_columnar_table(problem, table_name)
+        if table is not None:
+            hasher = hashlib.sha256(repr(table.dtype.descr).encode('utf-8'))
+            hasher.update(np.ascontiguousarray(table).tobytes())
+            digests[key] = hasher.hexdigest()
+        else:
+            text_file = os.path.join(get_results_dir(problem), f'{table_name}.txt')
+            if os.path.exists(text_file):
+                with open(text_file, 'rb') as f:
+                    digests[key] = hashlib.sha256(f.read()).hexdigest()
+            else:
+                digests[key] = None
+    return digests[key]
+
+def _figure_manifest_file():
+    """增量重绘清单的路径"""
+    return os.path.join(get_results_dir(), FIGURE_MANIFEST_FILE)
+
+def _load_figure_manifest():
+    """读取增量重绘清单，不存在或版本不一致时返回空清单"""
+    manifest_file = _figure_manifest_file()
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('manifest_version') == FIGURE_MANIFEST_VERSION:
+            return manifest['figures']
+    return {}
+
+def _save_figure_manifest(figures):
+    """写入增量重绘清单（先写临时文件再替换，避免中断时留下不完整的清单）"""
+    manifest_file = _figure_manifest_file()
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    with open(manifest_file + '.tmp', 'w') as f:
+        json.dump({'manifest_version': FIGURE_MANIFEST_VERSION, 'figures': figures}, f, indent=2, sort_keys=True)
+    os.replace(manifest_file + '.tmp', manifest_file)
+
+def _is_up_to_date(task, entry, style_digest, digests):
+    """判断绘图任务的输出是否仍然有效
+    
+    Args:
+        task (tuple): (绘图函数, 参数元组)
+        entry (dict): 该任务在清单中的记录，可以为None
+        style_digest (str): 当前样式参数的哈希
+        digests (dict): 本次运行中已计算的结果表哈希
+        
+    Returns:
+        bool: 函数源代码、样式参数和所有输入结果表均未变化且输出图片都存在时返回True
+    """
+    if entry is None or not entry['outputs']:
+        return False
+    if entry['function'] != _function_digest(task[0]) or entry['style'] != style_digest:
+        return False
+    for key, digest in entry['inputs'].items():
+        problem, table_name = key.split('/')
+        if _input_digest(int(problem[len('problem_'):]), table_name, digests) != digest:
+            return False
+    results_dir = get_results_dir()
+    return all(os.path.exists(os.path.join(results_dir, output)) for output in entry['outputs'])
+
+def main(workers=1, incremental=True):
+    """Run all plotting functions for both problems
+    
+    Args:
+        workers (int, optional): 渲染进程数。1表示在当前进程中依次绘制；大于1时使用 Agg 后端的进程池并行绘制，
+            输出文件与日志顺序与串行模式一致。默认为1
+        incremental (bool, optional): 是否跳过输入结果表、绘图函数和样式参数均未变化的图片。
+            为False时重绘全部图片并重建清单。默认为True
+    """
+    sections = _plot_tasks()
+    tasks = [task for _, section_tasks in sections for task in section_tasks]
+    
+    figures = _load_figure_manifest() if incremental else {}
+    style_digest = _style_digest()
+    digests = {}
+    pending = [index for index, task in enumerate(tasks)
+               if not _is_up_to_date(task, figures.get(_task_key(task)), style_digest, digests)]
+    
+    if workers is None or workers <= 1:
+        results = {index: _render_task(tasks[index]) for index in pending}
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(pending))),
+            initializer=_init_render_worker,
+            initargs=(dict(_in_memory_results),),
+        )
+        # 逆序提交，让排在最后、耗时最长的3D图表先开始渲染；输出仍按任务顺序打印
+        results = {}
+        for index in reversed(pending):
+            results[index] = executor.submit(_render_task, tasks[index])
+    
+    results_dir = get_results_dir()
+    try:
+        index = 0
+        for title, section_tasks in sections:
+            print(title)
+            for task in section_tasks:
+                key = _task_key(task)
+                if index not in results:
+                    for output in figures[key]['outputs']:
+                        print(f'{os.path.join(results_dir, output)} is up to date, skipped')
+                else:
+                    result = results[index]
+                    output_text, inputs, saved_files = result.result() if executor is not None else result
+                    print(output_text, end='')
+                    figures[key] = {
+                        'function': _function_digest(task[0]),
+                        'style': style_digest,
+                        'inputs': {f'problem_{problem}/{table_name}': _input_digest(problem, table_name, digests)
+                                   for problem, table_name in inputs},
+                        'outputs': [os.path.relpath(saved_file, results_dir) for saved_file in saved_files],
+                    }
+                index += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _save_figure_manifest(figures)
 
 # 绘制不同时间限制下的最优方案分析图
 def plot_time_limit_analysis(problem=2):
@@ -1645,7 +1982,7 @@ def plot_scenario_comparison_p3():
     # Time comparison
     bars2 = ax2.bar(names, years, color=colors, edgecolor='black', alpha=0.8)
     ax2.set_title('Time Required Comparison (Problem 3)', fontsize=14, fontweight='bold')
-    ax2.set_ylabel('Time Required (Years)' if not MONTH_MODE else 'Time Required (Months)', fontsize=12)
+    ax2.set_ylabel(f'Time Required ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})', fontsize=12)
     ax2.tick_params(axis='x', rotation=45, labelsize=11)
     ax2.tick_params(axis='y', labelsize=11)
     ax2.grid(axis='y', alpha=0.3)
@@ -1691,7 +2028,7 @@ def plot_ratio_analysis_p3():
     # 时间曲线（右轴）
     color_time = '#2ca02c'
     ax2 = ax1.twinx()
-    ax2.set_ylabel('Time Required (Years)' if not MONTH_MODE else 'Time Required (Months)', color=color_time, fontsize=12)
+    ax2.set_ylabel(f'Time Required ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})', color=color_time, fontsize=12)
     ax2.plot(ratio_percent, years, 's-', color=color_time, label='Time Required', linewidth=2, markersize=6)
     ax2.tick_params(axis='y', labelcolor=color_time, labelsize=11)
     # 标题和图例
@@ -1732,7 +2069,7 @@ def plot_ratio_analysis_p3():
                    color=color_cost_bar, edgecolor='black', alpha=0.8)
     # 绘制时间柱形（次坐标轴，因为成本和时间量纲不同）
     ax_twin = ax.twinx()
-    bars2 = ax_twin.bar(x2, target_years, width=bar_width, label='Time Required (Years)' if not MONTH_MODE else 'Time Required (Months)',
+    bars2 = ax_twin.bar(x2, target_years, width=bar_width, label=f'Time Required ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})',
                         color=color_time_bar, edgecolor='black', alpha=0.8)
 
     # 2.4 图表样式设置
@@ -1744,7 +2081,7 @@ def plot_ratio_analysis_p3():
     ax.set_xticks(target_ratios)  # x轴刻度严格匹配10%步长
     ax.grid(axis='y', alpha=0.3)
     # 次坐标轴（时间）
-    ax_twin.set_ylabel('Time Required (Years)' if not MONTH_MODE else 'Time Required (Months)', fontsize=12, fontweight='bold', color=color_time_bar)
+    ax_twin.set_ylabel(f'Time Required ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})', fontsize=12, fontweight='bold', color=color_time_bar)
     ax_twin.tick_params(axis='y', labelcolor=color_time_bar, labelsize=11)
     # 标题
     fig2.suptitle(f'Cost & Time vs Space Elevator Ratio (Bar Chart, 10% Step) - Problem 3 (Extra Material: {EXTRA_MATERIAL_P3} tons)',
@@ -2048,7 +2385,7 @@ def plot_time_limit_analysis_p3():
     # Plot cost variation with time limit
     ax1.plot(time_limits, costs_billion, marker='o', color='blue')
     ax1.set_title('Cost Variation with Time Limit (Problem 3)')
-    ax1.set_xlabel('Time Limit (Years)' if not MONTH_MODE else 'Time Limit (Months)')
+    ax1.set_xlabel(f'Time Limit ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})')
     ax1.set_ylabel('Total Cost (Billion USD)')
     ax1.grid(True)
     
@@ -2056,7 +2393,7 @@ def plot_time_limit_analysis_p3():
     ax2.plot(time_limits, actual_years, marker='o', color='green')
     ax2.plot(time_limits, time_limits, linestyle='--', color='red', label='Time Limit')
     ax2.set_title('Actual Time vs Time Limit (Problem 3)')
-    ax2.set_xlabel('Time Limit (Years)' if not MONTH_MODE else 'Time Limit (Months)')
+    ax2.set_xlabel(f'Time Limit ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})')
     ax2.set_ylabel('Actual Time (Years)')
     ax2.legend()
     ax2.grid(True)
@@ -2065,7 +2402,7 @@ def plot_time_limit_analysis_p3():
     ax3.plot(time_limits, elevator_ratios_percent, marker='o', color='blue', label='Space Elevator')
     ax3.plot(time_limits, rocket_ratios_percent, marker='o', color='orange', label='Traditional Rockets')
     ax3.set_title('Ratio Variation with Time Limit (Problem 3)')
-    ax3.set_xlabel('Time Limit (Years)' if not MONTH_MODE else 'Time Limit (Months)')
+    ax3.set_xlabel(f'Time Limit ({GRANULARITY_LABELS[DEFAULT_GRANULARITY]})')
     ax3.set_ylabel('Ratio (%)')
     ax3.legend()
     ax3.grid(True)
@@ -2077,4 +2414,10 @@ def plot_time_limit_analysis_p3():
     print(f'Time limit analysis chart (Problem 3) saved to {output_file}')
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate all charts from the model results')
+    parser.add_argument('--workers', type=int, default=1, help='number of rendering processes')
+    parser.add_argument('--force', action='store_true', help='redraw every chart even if its inputs are unchanged')
+    args = parser.parse_args()
+    main(workers=args.workers, incremental=not args.force)
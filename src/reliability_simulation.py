@@ -0,0 +1,275 @@
+"""
+可靠性时间序列仿真
+按天模拟每个银河港（太空电梯）和火箭发射场的可用状态，代替 main_model 中把可靠性折算成单一系数的做法：
+- 天气：每个银河港的风速服从 p2_sensitivity_analysis 中的威布尔分布，日间由 AR(1) 过程相关，
+  各港之间通过公共因子相关；摆角超过临界值或风速超过安全风速时当天停运。发射场可选按同样方式的天气取消
+- 故障：每个单元为两状态马尔可夫链（正常/维修），稳态可用率等于 main_model 中的可靠性
+- 维护：每个银河港每年按 beta_maint 比例安排一段连续的计划停机，各港错开
+所有单元、重复次数和天数都以数组批量计算，按年分块推进，内存占用与模拟年数无关
+"""
+import warnings
+
+import numpy as np
+from src.constants import *
+from src import p2_sensitivity_analysis as p2
+
+DAYS_PER_YEAR = GRANULARITY_PERIODS_PER_YEAR["day"]
+
+# 天气相关性
+WEATHER_AUTOCORRELATION = 0.7  # 日风速潜变量的一阶自相关系数
+WEATHER_CROSS_CORRELATION = 0.3  # 不同站点之间潜变量的相关系数（公共因子权重）
+LAUNCH_SCRUB_PROBABILITY = 0.0  # 发射场因天气取消发射的日概率（0 表示不考虑发射场天气）
+
+# 故障维修
+ELEVATOR_MEAN_REPAIR_DAYS = 7.0  # 太空电梯（含摆渡火箭）平均维修天数
+ROCKET_MEAN_REPAIR_DAYS = 3.0  # 发射场平均维修天数
+
+
+def _ar1(noise, previous, autocorrelation):
+    """沿天数轴生成平稳 AR(1) 序列（方差为1）
+
+    Args:
+        noise (numpy.ndarray): 标准正态噪声，形状 (重复次数, 天数, ...)
+        previous (numpy.ndarray): 上一块最后一天的取值，形状 (重复次数, ...)
+        autocorrelation (float): 一阶自相关系数
+
+    Returns:
+        numpy.ndarray: 与 noise 形状相同的序列
+    """
+    from scipy.signal import lfilter
+
+    innovation = np.sqrt(1 - autocorrelation ** 2)
+    series, _ = lfilter([innovation], [1, -autocorrelation], noise, axis=1,
+                        zi=autocorrelation * previous[:, None])
+    return series
+
+
+class _MarkovUnits:
+    """一组两状态（正常/维修）马尔可夫单元
+
+    正常和维修的持续天数都服从几何分布，按块生成状态转换时刻后一次性得到每天的状态，不需要逐天循环
+    """
+
+    def __init__(self, rng, shape, reliability, mean_repair_days):
+        """
+        Args:
+            rng (numpy.random.Generator): 随机数生成器
+            shape (tuple): 单元数组形状 (重复次数, 单元数)
+            reliability (float): 稳态可用率，0 <= reliability <= 1
+            mean_repair_days (float): 平均维修天数，大于0
+
+        Raises:
+            ValueError: reliability 不在 [0, 1] 内或 mean_repair_days 不大于0
+        """
+        if not 0 <= reliability <= 1:
+            raise ValueError(f"reliability must be in [0, 1], got {reliability}")
+        if not mean_repair_days > 0:
+            raise ValueError(f"mean_repair_days must be positive, got {mean_repair_days}")
+        self.rng = rng
+        self.repair_probability = min(1.0, 1.0 / mean_repair_days)
+        if self.repair_probability * (1 - reliability) > reliability:
+            # 正常状态至少持续1天，可用率低于 1/(1+平均维修天数) 时每天都故障，改为延长维修时间；
+            # reliability=0 时维修概率为0，单元始终处于维修状态
+            self.failure_probability = 1.0
+            self.repair_probability = reliability / (1 - reliability)
+        else:
+            self.failure_probability = self.repair_probability * (1 - reliability) / reliability
+        # 初始状态取稳态分布；几何分布无记忆，剩余持续时间仍服从同一分布
+        self.up = rng.random(shape) < reliability
+        self.next_switch = self._durations(self.up)
+
+    def _durations(self, up):
+        """当前状态的持续天数（>=1），故障概率为0时视为永不转换"""
+        probability = np.where(up, self.failure_probability, self.repair_probability)
+        durations = np.full(up.shape, np.iinfo(np.int64).max // 4, dtype=np.int64)
+        active = probability > 0
+        durations[active] = self.rng.geometric(probability[active])
+        return durations
+
+    def advance(self, days):
+        """推进 days 天
+
+        Returns:
+            numpy.ndarray: 每天是否正常，形状 (重复次数, 天数, 单元数)
+        """
+        up = self.up.ravel()
+        switch = self.next_switch.ravel().copy()
+        flips = np.zeros((up.size, days + 1), dtype=np.int8)
+        state = up.copy()
+        pending = switch < days
+        while pending.any():
+            rows = np.nonzero(pending)[0]
+            flips[rows, switch[rows]] += 1
+            state[rows] = ~state[rows]
+            switch[rows] += self._durations(state[rows])
+            pending = switch < days
+        daily_up = up[:, None] ^ (np.cumsum(flips[:, :days], axis=1) % 2).astype(bool)
+
+        self.up = state.reshape(self.up.shape)
+        self.next_switch = (switch - days).reshape(self.next_switch.shape)
+        return daily_up.reshape(self.up.shape + (days,)).transpose(0, 2, 1)
+
+
+def _completion_days(cumulative, quotas, completion, start_day):
+    """记录本块内累计运输量首次达到各配额的天数
+
+    Args:
+        cumulative (numpy.ndarray): 本块每天结束时的累计运输量，形状 (重复次数, 天数)，每行单调不减
+        quotas (numpy.ndarray): 各比例的配额，形状 (比例数,)
+        completion (numpy.ndarray): 已完成天数，形状 (重复次数, 比例数)，未完成为NaN，原地更新
+        start_day (int): 本块第一天的全局序号
+    """
+    reps, days = cumulative.shape
+    # 每行加上不同的偏移量后整体单调，一次 searchsorted 即可得到每个 (重复, 配额) 的首次达到位置
+    offset = (np.arange(reps) * (cumulative[:, -1].max() + quotas.max() + 1.0))[:, None]
+    index = np.searchsorted((cumulative + offset).ravel(), (quotas[None, :] + offset).ravel(), side='left')
+    day = index.reshape(reps, -1) - np.arange(reps)[:, None] * days
+    reached = np.isnan(completion) & (day < days)
+    completion[reached] = start_day + day[reached] + 1
+
+
+def _harbor_weather_ok(latent, rng):
+    """由天气潜变量判断银河港当天是否可以运行（与 p2_sensitivity_analysis 的可用条件相同）
+
+    Args:
+        latent (numpy.ndarray): 标准正态潜变量，经高斯 copula 变换为威布尔风速
+        rng (numpy.random.Generator): 随机数生成器，用于摆角扰动
+
+    Returns:
+        numpy.ndarray: 是否可用，形状与 latent 相同
+    """
+    from scipy.special import log_ndtr
+
+    # Φ(x) 为风速分位数，-ln(1-Φ(x)) = -ln Φ(-x) 为标准指数变量
+    v_wind = p2.weibull_scale * (-log_ndtr(-latent)) ** (1 / p2.weibull_shape)
+    phi = p2.k * v_wind + p2.epsilon_phi_scale * rng.standard_normal(latent.shape)
+    return (phi <= p2.phi_crit) & (v_wind <= p2.v_safe)
+
+
+def simulate_completion_times(problem=2, elevator_ratios=None, replications=1000, max_years=400,
+                              chunk_years=1, params=None, include_weather=True, include_maintenance=True,
+                              seed=None):
+    """按天模拟运输过程，得到各分配比例下完成时间的分布
+
+    Args:
+        problem (int): 问题编号，1表示Problem 1（100%可靠性），2表示Problem 2（当前可靠性），3表示Problem 3（额外材料需求）
+        elevator_ratios (array-like, optional): 太空电梯运输比例。如果为None，使用0%到100%、步长1%
+        replications (int, optional): 重复模拟次数。默认为1000
+        max_years (int, optional): 最长模拟年数，超过仍未完成的记为NaN。默认为400
+        chunk_years (int, optional): 每块模拟的年数，决定内存占用。默认为1
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        include_weather (bool, optional): 是否考虑天气停运。默认为True
+        include_maintenance (bool, optional): 是否考虑银河港计划维护停机（p2 的 beta_maint）。默认为True
+        seed (int, optional): 随机种子
+
+    Returns:
+        dict: 列式结果，包含 elevator_ratio、rocket_ratio、completion_years（重复次数 × 比例数，单位为年）、
+            各比例完成时间的 mean_years、p05_years、p50_years、p95_years 和限期内完成概率 completion_probability，
+            以及模拟期内的平均有效年运输能力 elevator_capacity、rocket_capacity
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    if elevator_ratios is None:
+        elevator_ratios = np.arange(0, 101) / 100
+    elevator_ratios = np.asarray(elevator_ratios, dtype=float)
+    rng = np.random.default_rng(seed)
+
+    harbors = params.GALACTIC_HARBORS
+    sites = params.ROCKET_LAUNCH_SITES
+    harbor_daily = params.ELEVATOR_ANNUAL_CAPACITY / DAYS_PER_YEAR
+    site_daily = params.ROCKET_LAUNCHES_PER_YEAR_PER_SITE * params.ROCKET_PAYLOAD_AVG / DAYS_PER_YEAR
+    elevator_quota = elevator_ratios * params.TOTAL_MATERIAL
+    rocket_quota = (1 - elevator_ratios) * params.TOTAL_MATERIAL
+
+    elevator_units = _MarkovUnits(rng, (replications, harbors),
+                                  params.ELEVATOR_RELIABILITY * params.TUG_RELIABILITY, ELEVATOR_MEAN_REPAIR_DAYS)
+    rocket_units = _MarkovUnits(rng, (replications, sites), params.ROCKET_RELIABILITY, ROCKET_MEAN_REPAIR_DAYS)
+
+    # 天气潜变量：公共因子 + 各站点独立分量，均为平稳 AR(1)
+    harbor_common = rng.standard_normal(replications)
+    harbor_local = rng.standard_normal((replications, harbors))
+    site_common = rng.standard_normal(replications)
+    site_local = rng.standard_normal((replications, sites))
+    common_weight = np.sqrt(WEATHER_CROSS_CORRELATION)
+    local_weight = np.sqrt(1 - WEATHER_CROSS_CORRELATION)
+
+    # 计划维护：每年连续停机 beta_maint 比例的天数，各港起始日错开
+    maintenance_days = int(round(p2.beta_maint * DAYS_PER_YEAR)) if include_maintenance else 0
+    maintenance_offset = np.arange(harbors) * DAYS_PER_YEAR // harbors
+
+    # 已完成的配额直接记为第0天
+    elevator_done = np.where(elevator_quota <= 0, 0.0, np.nan) * np.ones((replications, 1))
+    rocket_done = np.where(rocket_quota <= 0, 0.0, np.nan) * np.ones((replications, 1))
+    elevator_total = np.zeros(replications)
+    rocket_total = np.zeros(replications)
+
+    day = 0
+    total_days = max_years * DAYS_PER_YEAR
+    while day < total_days and (np.isnan(elevator_done).any() or np.isnan(rocket_done).any()):
+        days = min(chunk_years * DAYS_PER_YEAR, total_days - day)
+
+        harbor_up = elevator_units.advance(days)
+        if include_weather:
+            common = _ar1(rng.standard_normal((replications, days)), harbor_common, WEATHER_AUTOCORRELATION)
+            local = _ar1(rng.standard_normal((replications, days, harbors)), harbor_local, WEATHER_AUTOCORRELATION)
+            harbor_common, harbor_local = common[:, -1], local[:, -1]
+            harbor_up &= _harbor_weather_ok(common_weight * common[..., None] + local_weight * local, rng)
+        if maintenance_days:
+            day_of_year = (day + np.arange(days))[:, None] % DAYS_PER_YEAR
+            harbor_up &= ~((day_of_year - maintenance_offset) % DAYS_PER_YEAR < maintenance_days)
+
+        site_up = rocket_units.advance(days)
+        if include_weather and LAUNCH_SCRUB_PROBABILITY > 0:
+            from scipy.special import ndtri
+
+            common = _ar1(rng.standard_normal((replications, days)), site_common, WEATHER_AUTOCORRELATION)
+            local = _ar1(rng.standard_normal((replications, days, sites)), site_local, WEATHER_AUTOCORRELATION)
+            site_common, site_local = common[:, -1], local[:, -1]
+            site_up &= common_weight * common[..., None] + local_weight * local <= ndtri(1 - LAUNCH_SCRUB_PROBABILITY)
+
+        elevator_cumulative = elevator_total[:, None] + np.cumsum(harbor_up.sum(axis=2) * harbor_daily, axis=1)
+        rocket_cumulative = rocket_total[:, None] + np.cumsum(site_up.sum(axis=2) * site_daily, axis=1)
+        _completion_days(elevator_cumulative, elevator_quota, elevator_done, day)
+        _completion_days(rocket_cumulative, rocket_quota, rocket_done, day)
+        elevator_total = elevator_cumulative[:, -1]
+        rocket_total = rocket_cumulative[:, -1]
+        day += days
+
+    # 两个系统都完成时整体完成；任一未完成则为NaN
+    completion_years = np.fmax(elevator_done, rocket_done) / DAYS_PER_YEAR
+    completion_years[np.isnan(elevator_done) | np.isnan(rocket_done)] = np.nan
+    finished = ~np.isnan(completion_years)
+    # 某个比例全部未完成时统计量为NaN，忽略对应的警告
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean_years = np.nanmean(completion_years, axis=0)
+        p05, p50, p95 = np.nanpercentile(completion_years, [5, 50, 95], axis=0)
+    simulated_years = day / DAYS_PER_YEAR
+    return {
+        "elevator_ratio": elevator_ratios,
+        "rocket_ratio": 1 - elevator_ratios,
+        "completion_years": completion_years,
+        "mean_years": mean_years,
+        "p05_years": p05,
+        "p50_years": p50,
+        "p95_years": p95,
+        "completion_probability": finished.mean(axis=0),
+        "elevator_capacity": elevator_total.mean() / simulated_years,
+        "rocket_capacity": rocket_total.mean() / simulated_years,
+    }
+
+
+def main():
+    """模拟 Problem 2 的完成时间分布并输出部分比例的统计结果"""
+    result = simulate_completion_times(2, elevator_ratios=np.arange(0, 11) / 10, replications=200, seed=0)
+    print("=== Problem 2: 按天可靠性仿真 ===")
+    print(f"模拟得到的太空电梯有效年运输能力: {result['elevator_capacity']:.2f} 吨")
+    print(f"模拟得到的火箭有效年运输能力: {result['rocket_capacity']:.2f} 吨")
+    for i, ratio in enumerate(result["elevator_ratio"]):
+        print(f"太空电梯比例: {ratio*100:.0f}%  平均完成时间: {result['mean_years'][i]:.2f} 年  "
+              f"5%-95%: {result['p05_years'][i]:.2f}-{result['p95_years'][i]:.2f} 年  "
+              f"完成概率: {result['completion_probability'][i]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
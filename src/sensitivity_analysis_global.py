@@ -0,0 +1,343 @@
+"""
+全局敏感性分析
+v1/v2 和联合分析只给出成本、时间随参数变化的曲面，不量化各参数的重要程度。本模块在向量化的运输模型上计算：
+- Sobol 一阶指数和总效应指数：Saltelli 抽样（A、B 两个样本矩阵及把 A 的第 i 列换成 B 的 AB_i 矩阵），
+  一阶指数用 Saltelli (2010) 估计量，总效应指数用 Jansen 估计量
+- Morris 筛选：按轨迹计算基本效应，给出 mu、mu* 和 sigma
+因素可以是 ModelParameters 的任意基础参数（可靠性、TUG_* 摆渡火箭参数、发射成本等），
+也可以直接指定 T_S、T_R、C_S、C_R 覆盖由基础参数推导出的值。
+模型输出为给定太空电梯比例下的总成本和完成时间（连续值，不向上取整）。
+Sobol 样本按块生成和计算，只累加部分和，内存占用与样本数无关；各块可以分发到多个进程，
+每块的随机种子按块序号由 seed 派生（不修改传入的 SeedSequence），相同 seed 和 chunk_size 下结果与进程数无关
+"""
+import os
+
+import numpy as np
+from src.constants import *
+from src.batching import iter_batches
+
+# 默认分析的因素：三个可靠性、摆渡火箭参数、太空电梯和火箭的成本与运力参数
+GLOBAL_FACTORS = (
+    "ELEVATOR_RELIABILITY", "TUG_RELIABILITY", "ROCKET_RELIABILITY",
+    "TUG_DELTA_V", "TUG_I_SP", "TUG_COST_FUEL_PER", "TUG_COST_VEHICLE", "TUG_N",
+    "ELEVATOR_COST_PER_TON", "ELEVATOR_ANNUAL_CAPACITY",
+    "ROCKET_COST_PER_LAUNCH", "ROCKET_THETA", "ROCKET_N_G", "ROCKET_LAUNCHES_PER_YEAR_PER_SITE",
+)
+DIRECT_FACTORS = ("T_S", "T_R", "C_S", "C_R")  # 可直接指定、覆盖推导值的因素
+RELIABILITY_FACTORS = ("ELEVATOR_RELIABILITY", "TUG_RELIABILITY", "ROCKET_RELIABILITY")  # 上限截断为1
+GLOBAL_OUTPUTS = ("total_cost", "completion_years")
+GLOBAL_RELATIVE_SPAN = 0.2  # 默认因素区间为默认值的 ±20%
+GLOBAL_ELEVATOR_RATIO = 0.5  # 默认评估的太空电梯比例
+GLOBAL_CHUNK_SIZE = 65_536  # Sobol 每块的基础样本数（每块计算 块大小 × (因素数+2) 次模型）
+
+
+def _model_quantities(values, params, granularity=None):
+    """由基础参数推导单位运输时间和单位成本（与 ModelParameters 的计算方式一致，支持数组）
+
+    Args:
+        values (dict): 因素名 -> 取值数组，未给出的基础参数取 params 中的值
+        params (ModelParameters): 模型参数记录
+        granularity (str, optional): 时间粒度，决定 T_S、T_R 的时间单位
+
+    Returns:
+        dict: T_S、T_R（每吨所需时间段数）、C_S、C_R（每吨成本）、TOTAL_MATERIAL 和 periods_per_year
+    """
+    def value(name):
+        return np.asarray(values[name], dtype=float) if name in values else getattr(params, name)
+
+    periods_per_year = GRANULARITY_PERIODS_PER_YEAR[granularity or DEFAULT_GRANULARITY]
+    mass_ratio = np.exp(value("TUG_DELTA_V") / (value("G_0") * value("TUG_I_SP")))
+    m_prop = (mass_ratio - 1) * (1 + value("M_D"))
+    m_0 = m_prop + value("M_D") + 1
+    payload_avg = (value("ROCKET_PAYLOAD_MIN") + value("ROCKET_PAYLOAD_MAX")) / 2
+    elevator_reliability = value("ELEVATOR_RELIABILITY") * value("TUG_RELIABILITY")
+    rocket_reliability = value("ROCKET_RELIABILITY")
+
+    cost_elevator_per = ((value("ELEVATOR_COST_PER_TON") * m_0 + value("TUG_COST_FUEL_PER") * m_prop
+                          + value("TUG_COST_VEHICLE") / value("TUG_N")) / elevator_reliability)
+    cost_rocket_per = (value("ROCKET_THETA") * value("ROCKET_COST_PER_LAUNCH")
+                       / (payload_avg * value("ROCKET_N_G") * rocket_reliability))
+    elevator_capacity = value("GALACTIC_HARBORS") * value("ELEVATOR_ANNUAL_CAPACITY") * elevator_reliability / periods_per_year
+    rocket_capacity = (value("ROCKET_LAUNCH_SITES") * value("ROCKET_LAUNCHES_PER_YEAR_PER_SITE") * payload_avg
+                       * rocket_reliability / periods_per_year)
+    return {
+        "T_S": value("T_S") if "T_S" in values else 1 / elevator_capacity,
+        "T_R": value("T_R") if "T_R" in values else 1 / rocket_capacity,
+        "C_S": value("C_S") if "C_S" in values else cost_elevator_per,
+        "C_R": value("C_R") if "C_R" in values else cost_rocket_per,
+        "TOTAL_MATERIAL": value("TOTAL_MATERIAL"),
+        "periods_per_year": periods_per_year,
+    }
+
+
+def evaluate_transport_model(values, problem=2, params=None, granularity=None, elevator_ratio=GLOBAL_ELEVATOR_RATIO):
+    """向量化的运输模型：给定比例下的总成本和完成时间
+
+    计算公式与 sensitivity_engine 相同：
+        T = max{ T_S * Amount_S , T_R * Amount_R }
+        C = C_S * Amount_S + C_R * Amount_R
+
+    Args:
+        values (dict): 因素名 -> 取值数组（可广播），可以是 ModelParameters 的基础参数或 T_S、T_R、C_S、C_R
+        problem (int): 问题编号，决定未给出参数的默认值
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，直接给出的 T_S、T_R 按该粒度的时间单位解释
+        elevator_ratio (float or array_like): 太空电梯运输比例
+
+    Returns:
+        dict: total_cost（美元）和 completion_years（年）数组
+
+    Raises:
+        ValueError: 因素名未知
+    """
+    unknown = set(values) - set(MODEL_PARAMETER_FIELDS) - set(DIRECT_FACTORS)
+    if unknown:
+        raise ValueError(f"Unknown factors: {sorted(unknown)}")
+    if params is None:
+        params = get_problem_parameters(problem)
+    quantities = _model_quantities(values, params, granularity)
+    amount_S = quantities["TOTAL_MATERIAL"] * elevator_ratio
+    amount_R = quantities["TOTAL_MATERIAL"] * (1 - elevator_ratio)
+    total_periods = np.maximum(quantities["T_S"] * amount_S, quantities["T_R"] * amount_R)
+    # 输出与所有输入广播后的形状相同（某个输出不依赖任何给出的因素时也不会退化为标量）
+    shape = np.broadcast_shapes(np.shape(elevator_ratio), *(np.shape(v) for v in values.values()))
+    return {
+        "total_cost": np.broadcast_to(quantities["C_S"] * amount_S + quantities["C_R"] * amount_R, shape),
+        "completion_years": np.broadcast_to(total_periods / quantities["periods_per_year"], shape),
+    }
+
+
+def default_factor_bounds(factors=GLOBAL_FACTORS, problem=2, params=None, granularity=None,
+                          relative_span=GLOBAL_RELATIVE_SPAN):
+    """以默认值为中心的因素区间，可靠性的上限截断为1
+
+    Args:
+        factors (sequence): 因素名
+        problem (int): 问题编号
+        params (ModelParameters, optional): 模型参数记录
+        granularity (str, optional): 时间粒度（影响 T_S、T_R 的默认值）
+        relative_span (float): 相对默认值的浮动比例
+
+    Returns:
+        dict: 因素名 -> (下限, 上限)
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    derived = _model_quantities({}, params, granularity)
+    bounds = {}
+    for name in factors:
+        nominal = derived[name] if name in DIRECT_FACTORS else getattr(params, name)
+        low, high = nominal * (1 - relative_span), nominal * (1 + relative_span)
+        if name in RELIABILITY_FACTORS:
+            high = min(high, 1.0)
+        bounds[name] = (low, high)
+    return bounds
+
+
+def _scale(unit, factors, bounds):
+    """把 [0, 1) 上的样本矩阵映射到因素区间，返回因素名 -> 取值数组"""
+    return {name: bounds[name][0] + (bounds[name][1] - bounds[name][0]) * unit[:, i]
+            for i, name in enumerate(factors)}
+
+
+def _sobol_chunk(seed_sequence, n, factors, bounds, model_args, reference):
+    """一块 Saltelli 样本的部分和
+
+    Args:
+        seed_sequence (numpy.random.SeedSequence): 本块的随机种子
+        n (int): 本块基础样本数
+        factors (tuple): 因素名
+        bounds (dict): 因素区间
+        model_args (tuple): evaluate_transport_model 的 (problem, params, granularity, elevator_ratio)
+        reference (dict): 各输出的参考值（因素区间中点处的输出），求和前先减去，减小平方和的舍入误差和估计量的方差
+
+    Returns:
+        dict: 输出名 -> 部分和字典（n、f 之和、f² 之和、一阶和总效应估计量的分子之和）
+    """
+    k = len(factors)
+    unit = np.random.default_rng(seed_sequence).random((n, 2 * k))
+    A, B = unit[:, :k], unit[:, k:]
+    # A、B 和 k 个 AB_i 矩阵拼成一个 (k+2)*n 行的矩阵，一次计算
+    stacked = np.concatenate([A, B, np.repeat(A[None], k, axis=0).reshape(k * n, k)])
+    for i in range(k):
+        stacked[(2 + i) * n:(3 + i) * n, i] = B[:, i]
+    outputs = evaluate_transport_model(_scale(stacked, factors, bounds), *model_args)
+
+    sums = {}
+    for name in GLOBAL_OUTPUTS:
+        f = outputs[name].reshape(k + 2, n) - reference[name]
+        f_A, f_B, f_AB = f[0], f[1], f[2:]
+        sums[name] = {
+            "n": n,
+            "sum": f_A.sum() + f_B.sum(),
+            "sum_sq": (f_A ** 2).sum() + (f_B ** 2).sum(),
+            "first": (f_B * (f_AB - f_A)).sum(axis=1),
+            "total": ((f_A - f_AB) ** 2).sum(axis=1),
+        }
+    return sums
+
+
+def _iter_sobol_chunks(n_samples, chunk_args, chunk_size, seed, workers):
+    """按块顺序产出 Saltelli 部分和，与 p2_sensitivity_analysis 的流式蒙特卡洛共用 batching.iter_batches 的分批和播种方式"""
+    return iter_batches(_sobol_chunk, n_samples, chunk_size, seed, workers, *chunk_args)
+
+
+def sobol_indices(n_samples=2 ** 14, factors=GLOBAL_FACTORS, bounds=None, problem=2, params=None, granularity=None,
+                  elevator_ratio=GLOBAL_ELEVATOR_RATIO, chunk_size=GLOBAL_CHUNK_SIZE, seed=None, workers=1):
+    """Sobol 一阶指数和总效应指数
+
+    模型计算次数为 n_samples × (因素数 + 2)
+
+    Args:
+        n_samples (int): 基础样本数（A、B 矩阵的行数）
+        factors (sequence): 因素名
+        bounds (dict, optional): 因素名 -> (下限, 上限)，因素在区间内均匀分布。默认为默认值的 ±20%
+        problem (int): 问题编号
+        params (ModelParameters, optional): 模型参数记录
+        granularity (str, optional): 时间粒度
+        elevator_ratio (float): 太空电梯运输比例
+        chunk_size (int): 每块基础样本数
+        seed (int, optional): 随机种子
+        workers (int): 进程数，1表示在当前进程中计算
+
+    Returns:
+        dict: 包含以下键：
+            - factors: 因素名列表
+            - evaluations: 模型计算次数
+            - 每个输出名（total_cost、completion_years）-> {"S1": 一阶指数数组, "ST": 总效应指数数组,
+              "mean": 输出均值, "variance": 输出方差}
+    """
+    factors = tuple(factors)
+    if params is None:
+        params = get_problem_parameters(problem)
+    if bounds is None:
+        bounds = default_factor_bounds(factors, problem, params, granularity)
+    model_args = (problem, params, granularity, elevator_ratio)
+    midpoint = {name: np.array([(low + high) / 2]) for name, (low, high) in bounds.items() if name in factors}
+    reference = {name: float(value[0]) for name, value in evaluate_transport_model(midpoint, *model_args).items()}
+
+    totals = None
+    for sums in _iter_sobol_chunks(n_samples, (factors, bounds, model_args, reference), chunk_size, seed, workers):
+        if totals is None:
+            totals = sums
+            continue
+        for name in GLOBAL_OUTPUTS:
+            for key, value in sums[name].items():
+                totals[name][key] = totals[name][key] + value
+
+    result = {"factors": list(factors), "evaluations": n_samples * (len(factors) + 2)}
+    for name in GLOBAL_OUTPUTS:
+        sums = totals[name]
+        mean = sums["sum"] / (2 * sums["n"])
+        variance = sums["sum_sq"] / (2 * sums["n"]) - mean ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[name] = {
+                "S1": sums["first"] / sums["n"] / variance,
+                "ST": sums["total"] / (2 * sums["n"]) / variance,
+                "mean": mean + reference[name],
+                "variance": variance,
+            }
+    return result
+
+
+def morris_screening(trajectories=100, levels=4, factors=GLOBAL_FACTORS, bounds=None, problem=2, params=None,
+                     granularity=None, elevator_ratio=GLOBAL_ELEVATOR_RATIO, seed=None):
+    """Morris 基本效应筛选
+
+    每条轨迹从 levels 级网格上的随机起点出发，按随机顺序每次改变一个因素 Δ = levels / (2 (levels - 1))，
+    所有轨迹的 (因素数 + 1) 个点一次计算。基本效应以因素区间归一化到 [0, 1] 后的变化量为单位
+
+    Args:
+        trajectories (int): 轨迹数
+        levels (int): 网格级数（偶数）
+        factors (sequence): 因素名
+        bounds (dict, optional): 因素名 -> (下限, 上限)。默认为默认值的 ±20%
+        problem (int): 问题编号
+        params (ModelParameters, optional): 模型参数记录
+        granularity (str, optional): 时间粒度
+        elevator_ratio (float): 太空电梯运输比例
+        seed (int, optional): 随机种子
+
+    Returns:
+        dict: 包含以下键：
+            - factors: 因素名列表
+            - evaluations: 模型计算次数
+            - 每个输出名 -> {"mu": 基本效应均值, "mu_star": 基本效应绝对值均值, "sigma": 基本效应标准差}
+    """
+    factors = tuple(factors)
+    k = len(factors)
+    if params is None:
+        params = get_problem_parameters(problem)
+    if bounds is None:
+        bounds = default_factor_bounds(factors, problem, params, granularity)
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+
+    # 起点取网格下半部分，方向为负的因素从 起点+Δ 出发向下走，保证轨迹不越出 [0, 1]
+    base = rng.integers(0, levels // 2, size=(trajectories, k)) / (levels - 1)
+    direction = rng.choice([-1.0, 1.0], size=(trajectories, k))
+    order = np.argsort(rng.random((trajectories, k)), axis=1)
+    step_of_factor = np.argsort(order, axis=1)  # 每个因素在第几步改变（0 起）
+    start = base + delta * (direction < 0)
+    # 第 j 个点中，已经改变过的因素（step_of_factor < j）移动了 Δ
+    moved = step_of_factor[:, None, :] < np.arange(k + 1)[None, :, None]
+    points = start[:, None, :] + delta * direction[:, None, :] * moved
+    outputs = evaluate_transport_model(_scale(points.reshape(-1, k), factors, bounds),
+                                       problem, params, granularity, elevator_ratio)
+
+    result = {"factors": list(factors), "evaluations": trajectories * (k + 1)}
+    rows = np.arange(trajectories)[:, None]
+    for name in GLOBAL_OUTPUTS:
+        f = outputs[name].reshape(trajectories, k + 1)
+        effects = (f[rows, step_of_factor + 1] - f[rows, step_of_factor]) * direction / delta
+        result[name] = {
+            "mu": effects.mean(axis=0),
+            "mu_star": np.abs(effects).mean(axis=0),
+            "sigma": effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(k),
+        }
+    return result
+
+
+def save_global_summary(sobol, morris, filename, problem=2):
+    """保存 Sobol 指数和 Morris 筛选结果
+
+    Args:
+        sobol (dict): sobol_indices 的返回值
+        morris (dict): morris_screening 的返回值
+        filename (str): 输出文件路径
+        problem (int): 问题编号
+    """
+    with open(filename, 'w') as f:
+        f.write(f'Problem: {problem}\n')
+        f.write(f'Sobol evaluations: {sobol["evaluations"]}\n')
+        f.write(f'Morris evaluations: {morris["evaluations"]}\n')
+        for name in GLOBAL_OUTPUTS:
+            f.write('\n')
+            f.write(f'Output: {name}\n')
+            f.write('{:<36} {:<12} {:<12} {:<20} {:<20}\n'.format('Factor', 'S1', 'ST', 'Morris mu*', 'Morris sigma'))
+            f.write('{:<36} {:<12} {:<12} {:<20} {:<20}\n'.format('-' * 36, '-' * 12, '-' * 12, '-' * 20, '-' * 20))
+            for i, factor in enumerate(sobol["factors"]):
+                f.write('{:<36} {:<12.4f} {:<12.4f} {:<20.6g} {:<20.6g}\n'.format(
+                    factor, sobol[name]["S1"][i], sobol[name]["ST"][i],
+                    morris[name]["mu_star"][i], morris[name]["sigma"][i]))
+
+
+def main():
+    """对问题1和问题2计算 Sobol 指数和 Morris 筛选结果，并保存到文件"""
+    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results', 'sensitivity_analysis')
+    os.makedirs(results_dir, exist_ok=True)
+    for problem in (1, 2):
+        print(f"=== Global Sensitivity Analysis for Problem {problem} ===")
+        sobol = sobol_indices(2 ** 14, problem=problem, seed=0)
+        morris = morris_screening(100, problem=problem, seed=0)
+        for name in GLOBAL_OUTPUTS:
+            ranking = np.argsort(sobol[name]["ST"])[::-1][:3]
+            top = ", ".join(f"{sobol['factors'][i]} (ST={sobol[name]['ST'][i]:.3f})" for i in ranking)
+            print(f"{name}: {top}")
+        filename = os.path.join(results_dir, f'problem_{problem}_global_sensitivity.txt')
+        save_global_summary(sobol, morris, filename, problem)
+        print(f"Results saved to: {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+联合敏感性分析
+sensitivity_analysis_v1/v2 每次只改变一个参数、其余取默认值，看不到参数之间的交互作用（例如太空电梯成本和火箭成本同时变化）。
+本模块对 T_S、T_R、C_S、C_R 四个参数同时取值，连同 SE_ratio 和时间限制一起做广播计算：
+- 全因子设计：每个参数取若干水平，组合成规则网格
+- 拉丁超立方设计：在参数区间内分层抽样，样本数不随维数指数增长
+对每个参数组合和时间限制，在所有 SE_ratio 中找出满足时间限制的最低成本及对应的最优比例。
+总运输量与 v1/v2 的单参数分析相同，固定为模块级 TOTAL_MATERIAL（不随 params.TOTAL_MATERIAL 变化），两者的基准一致。
+参数组合按块计算，每块的中间数组大小由 JOINT_CHUNK_ELEMENTS 限制；输出数组为每个组合和时间限制各保存一个值，
+大小随组合数线性增长，超过 JOINT_MAX_OUTPUT_BYTES 时拒绝计算（例如 50^4 个组合 × 5 个时间限制约需 750 MB）
+"""
+import os
+
+import numpy as np
+from src.constants import *
+
+JOINT_PARAMETERS = ("T_S", "T_R", "C_S", "C_R")  # 联合分析的参数，顺序即设计矩阵的列顺序
+JOINT_RELATIVE_SPAN = 0.2  # 默认参数区间为默认值的 ±20%，与 v1/v2 的单参数分析一致
+JOINT_RATIO_STEPS = 1000  # SE_ratio 的分段数（1001 个取值）
+JOINT_CHUNK_ELEMENTS = 1_000_000  # 每块 (参数组合数 × SE_ratio数) 的最大元素个数
+JOINT_MAX_OUTPUT_BYTES = 256 * 2 ** 20  # 输出数组（min_cost、optimal_ratio、optimal_time、feasible）的内存上限
+
+
+def default_parameter_values(problem=2, params=None, granularity=None):
+    """计算四个参数的默认值（与 sensitivity_engine.default_parameter_ranges 的中心值相同）
+
+    Args:
+        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定单位运输时间的时间单位。如果为None，使用 DEFAULT_GRANULARITY
+
+    Returns:
+        dict: 参数名 -> 默认值
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    periods_per_year = GRANULARITY_PERIODS_PER_YEAR[granularity or DEFAULT_GRANULARITY]
+    total_elevator_capacity = params.GALACTIC_HARBORS * params.ELEVATOR_ANNUAL_CAPACITY / periods_per_year
+    total_rocket_capacity = params.ROCKET_LAUNCH_SITES * params.ROCKET_LAUNCHES_PER_YEAR_PER_SITE * params.ROCKET_PAYLOAD_AVG / periods_per_year
+    return {
+        "T_S": 1 / total_elevator_capacity,
+        "T_R": 1 / total_rocket_capacity,
+        "C_S": params.COST_ELEVATOR_PER,
+        "C_R": params.COST_ROCKET_PER,
+    }
+
+
+def default_parameter_bounds(problem=2, params=None, granularity=None, relative_span=JOINT_RELATIVE_SPAN):
+    """以默认值为中心的参数区间
+
+    Args:
+        problem (int): 问题编号
+        params (ModelParameters, optional): 模型参数记录
+        granularity (str, optional): 时间粒度
+        relative_span (float): 相对默认值的浮动比例
+
+    Returns:
+        dict: 参数名 -> (下限, 上限)
+    """
+    defaults = default_parameter_values(problem, params, granularity)
+    return {name: (value * (1 - relative_span), value * (1 + relative_span)) for name, value in defaults.items()}
+
+
+def _optimal_ratios(T_S, T_R, C_S, C_R, se_ratios, time_limits, total_material):
+    """一块参数组合的最优比例
+
+    时间和成本的计算与 sensitivity_engine.calculate_combined_ratio_analysis 相同。
+    运输时间是比例的增函数与减函数取最大，满足时间限制的比例是一段连续区间；成本对比例是线性的，
+    所以最低成本必在可行区间的某个端点，只需在整个比例网格上找出区间两端，不必对每个比例比较成本
+
+    Args:
+        T_S, T_R, C_S, C_R (numpy.ndarray): 参数组合，形状 (块大小,)
+        se_ratios (numpy.ndarray): SE_ratio 取值（递增），形状 (比例数,)
+        time_limits (numpy.ndarray): 时间限制，形状 (时间限制数,)
+        total_material (float): 总材料需求（吨）
+
+    Returns:
+        tuple: (最低成本, 最优比例, 最优比例下的运输时间)，形状均为 (块大小, 时间限制数)；
+            不可行时成本为inf，比例和时间为NaN
+    """
+    amount_S = total_material * se_ratios
+    amount_R = total_material * (1 - se_ratios)
+    total_time = np.maximum(T_S[:, None] * amount_S, T_R[:, None] * amount_R)
+
+    rows = np.arange(len(T_S))
+    last = len(se_ratios) - 1
+    min_cost = np.empty((len(T_S), len(time_limits)))
+    optimal_ratio = np.empty_like(min_cost)
+    optimal_time = np.empty_like(min_cost)
+    for t, time_limit in enumerate(time_limits):
+        feasible = total_time <= time_limit
+        low = np.argmax(feasible, axis=1)
+        high = last - np.argmax(feasible[:, ::-1], axis=1)
+        cost_low = C_S * amount_S[low] + C_R * amount_R[low]
+        cost_high = C_S * amount_S[high] + C_R * amount_R[high]
+        index = np.where(cost_high < cost_low, high, low)
+        ok = feasible[rows, low]
+        min_cost[:, t] = np.where(ok, np.minimum(cost_low, cost_high), np.inf)
+        optimal_ratio[:, t] = np.where(ok, se_ratios[index], np.nan)
+        optimal_time[:, t] = np.where(ok, total_time[rows, index], np.nan)
+    return min_cost, optimal_ratio, optimal_time
+
+
+def _evaluate_design(design_rows, n_points, time_limits, ratio_steps, chunk_elements):
+    """按块计算设计中所有参数组合的最优比例
+
+    Args:
+        design_rows (callable): design_rows(start, stop) 返回第 start 到 stop-1 个组合的 (T_S, T_R, C_S, C_R)
+        n_points (int): 参数组合总数
+        time_limits (array-like, optional): 时间限制（年），默认与 v1 相同的 50-250 年
+        ratio_steps (int): SE_ratio 的分段数
+        chunk_elements (int): 每块 (组合数 × 比例数) 的最大元素个数
+
+    Returns:
+        dict: 见 joint_sensitivity_analysis
+
+    Raises:
+        ValueError: 输出数组超过 JOINT_MAX_OUTPUT_BYTES
+    """
+    if time_limits is None:
+        time_limits = np.arange(50, 260, 50)
+    time_limits = np.asarray(time_limits, dtype=float)
+    # 三个 float64 输出数组和一个布尔数组
+    output_bytes = n_points * len(time_limits) * (3 * 8 + 1)
+    if output_bytes > JOINT_MAX_OUTPUT_BYTES:
+        raise ValueError(f"Joint design with {n_points} parameter combinations x {len(time_limits)} time limits "
+                         f"needs {output_bytes / 2 ** 20:.0f} MB of outputs (limit {JOINT_MAX_OUTPUT_BYTES / 2 ** 20:.0f} MB); "
+                         f"use fewer levels or a Latin hypercube design")
+    se_ratios = np.arange(0, ratio_steps + 1) / ratio_steps
+    chunk_size = max(1, chunk_elements // len(se_ratios))
+
+    min_cost = np.empty((n_points, len(time_limits)))
+    optimal_ratio = np.empty_like(min_cost)
+    optimal_time = np.empty_like(min_cost)
+    for start in range(0, n_points, chunk_size):
+        stop = min(start + chunk_size, n_points)
+        T_S, T_R, C_S, C_R = design_rows(start, stop)
+        (min_cost[start:stop], optimal_ratio[start:stop],
+         optimal_time[start:stop]) = _optimal_ratios(T_S, T_R, C_S, C_R, se_ratios, time_limits, TOTAL_MATERIAL)
+    return {
+        "time_limits": time_limits,
+        "se_ratios": se_ratios,
+        "min_cost": min_cost,
+        "optimal_ratio": optimal_ratio,
+        "optimal_time": optimal_time,
+        "feasible": np.isfinite(min_cost),
+    }
+
+
+def joint_sensitivity_analysis(design, problem=2, params=None, granularity=None, time_limits=None,
+                               ratio_steps=JOINT_RATIO_STEPS, chunk_elements=JOINT_CHUNK_ELEMENTS):
+    """对给定的参数组合做联合敏感性分析
+
+    Args:
+        design (dict): 参数名 -> 取值数组，四个数组长度相同，每个位置是一个参数组合；缺少的参数取默认值
+        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定缺省参数 T_S、T_R 的时间单位
+        time_limits (array-like, optional): 时间限制（年），默认 50-250 年每 50 年一档
+        ratio_steps (int): SE_ratio 的分段数
+        chunk_elements (int): 每块 (组合数 × 比例数) 的最大元素个数
+
+    Returns:
+        dict: 包含以下键：
+            - design: 参数名 -> 取值数组，形状 (组合数,)
+            - time_limits: 时间限制数组
+            - se_ratios: SE_ratio 取值数组
+            - min_cost: 满足时间限制的最低成本，形状 (组合数, 时间限制数)，不可行为inf
+            - optimal_ratio: 最低成本对应的 SE_ratio，不可行为NaN
+            - optimal_time: 最优比例下的运输时间，不可行为NaN
+            - feasible: 是否存在满足时间限制的比例
+    """
+    defaults = default_parameter_values(problem, params, granularity)
+    n_points = len(np.asarray(next(iter(design.values()))))
+    design = {name: np.broadcast_to(np.asarray(design.get(name, defaults[name]), dtype=float), (n_points,))
+              for name in JOINT_PARAMETERS}
+    result = _evaluate_design(lambda start, stop: tuple(design[name][start:stop] for name in JOINT_PARAMETERS),
+                              n_points, time_limits, ratio_steps, chunk_elements)
+    result["design"] = design
+    return result
+
+
+def full_factorial_sensitivity(levels=10, bounds=None, problem=2, params=None, granularity=None, time_limits=None,
+                               ratio_steps=JOINT_RATIO_STEPS, chunk_elements=JOINT_CHUNK_ELEMENTS):
+    """全因子联合敏感性分析
+
+    参数组合按块现场生成，不会展开完整的设计矩阵；输出数组超过 JOINT_MAX_OUTPUT_BYTES 时抛出 ValueError
+
+    Args:
+        levels (int or dict): 每个参数的水平数，或参数名 -> 取值数组
+        bounds (dict, optional): 参数名 -> (下限, 上限)，levels 为整数时在区间内等距取值。默认为默认值的 ±20%
+        problem (int): 问题编号
+        params (ModelParameters, optional): 模型参数记录
+        granularity (str, optional): 时间粒度
+        time_limits (array-like, optional): 时间限制（年）
+        ratio_steps (int): SE_ratio 的分段数
+        chunk_elements (int): 每块 (组合数 × 比例数) 的最大元素个数
+
+    Returns:
+        dict: 包含以下键：
+            - axes: 参数名 -> 该参数的取值数组
+            - time_limits, se_ratios: 同 joint_sensitivity_analysis
+            - min_cost, optimal_ratio, optimal_time, feasible: 形状 (T_S水平数, T_R水平数, C_S水平数, C_R水平数, 时间限制数)
+    """
+    if isinstance(levels, dict):
+        axes = {name: np.asarray(levels[name], dtype=float) for name in JOINT_PARAMETERS}
+    else:
+        if bounds is None:
+            bounds = default_parameter_bounds(problem, params, granularity)
+        axes = {name: np.linspace(*bounds[name], levels) for name in JOINT_PARAMETERS}
+    shape = tuple(len(axes[name]) for name in JOINT_PARAMETERS)
+
+    def design_rows(start, stop):
+        index = np.unravel_index(np.arange(start, stop), shape)
+        return tuple(axes[name][i] for name, i in zip(JOINT_PARAMETERS, index))
+
+    result = _evaluate_design(design_rows, int(np.prod(shape)), time_limits, ratio_steps, chunk_elements)
+    for key in ("min_cost", "optimal_ratio", "optimal_time", "feasible"):
+        result[key] = result[key].reshape(shape + (-1,))
+    result["axes"] = axes
+    return result
+
+
+def latin_hypercube_design(n_samples, bounds=None, problem=2, params=None, granularity=None, seed=None):
+    """在参数区间内生成拉丁超立方样本
+
+    每个参数的区间等分为 n_samples 层，每层恰好一个样本，各参数的层序独立随机排列
+
+    Args:
+        n_samples (int): 样本数
+        bounds (dict, optional): 参数名 -> (下限, 上限)，默认为默认值的 ±20%
+        problem (int): 问题编号
+        params (ModelParameters, optional): 模型参数记录
+        granularity (str, optional): 时间粒度
+        seed (int, optional): 随机数种子
+
+    Returns:
+        dict: 参数名 -> 取值数组，形状 (n_samples,)
+    """
+    if bounds is None:
+        bounds = default_parameter_bounds(problem, params, granularity)
+    rng = np.random.default_rng(seed)
+    design = {}
+    for name in JOINT_PARAMETERS:
+        low, high = bounds[name]
+        strata = (rng.permutation(n_samples) + rng.random(n_samples)) / n_samples
+        design[name] = low + (high - low) * strata
+    return design
+
+
+def latin_hypercube_sensitivity(n_samples=10000, bounds=None, problem=2, params=None, granularity=None, time_limits=None,
+                                ratio_steps=JOINT_RATIO_STEPS, chunk_elements=JOINT_CHUNK_ELEMENTS, seed=None):
+    """拉丁超立方联合敏感性分析
+
+    Args:
+        n_samples (int): 样本数
+        其余参数同 full_factorial_sensitivity 和 latin_hypercube_design
+
+    Returns:
+        dict: 同 joint_sensitivity_analysis
+    """
+    design = latin_hypercube_design(n_samples, bounds, problem, params, granularity, seed)
+    return joint_sensitivity_analysis(design, problem, params, granularity, time_limits, ratio_steps, chunk_elements)
+
+
+def save_joint_summary(result, filename, problem=2):
+    """保存联合分析的汇总结果
+
+    对每个时间限制输出可行组合比例、最低成本和最优比例的分位数，以及最低成本与各参数的相关系数
+
+    Args:
+        result (dict): latin_hypercube_sensitivity 或 joint_sensitivity_analysis 的返回值
+        filename (str): 输出文件路径
+        problem (int): 问题编号
+    """
+    design = result["design"]
+    with open(filename, 'w') as f:
+        f.write(f'Problem: {problem}\n')
+        f.write(f'Samples: {len(result["min_cost"])}\n')
+        f.write('\n')
+        f.write('{:<12} {:<12} {:<20} {:<20} {:<20} {:<20} {:<20}\n'.format(
+            'Time Limit', 'Feasible', 'Min Cost P05', 'Min Cost P50', 'Min Cost P95', 'Ratio P05', 'Ratio P95'))
+        for t, time_limit in enumerate(result["time_limits"]):
+            feasible = result["feasible"][:, t]
+            if not feasible.any():
+                f.write('{:<12.0f} {:<12.4f}\n'.format(time_limit, 0.0))
+                continue
+            cost = np.percentile(result["min_cost"][feasible, t], [5, 50, 95])
+            ratio = np.percentile(result["optimal_ratio"][feasible, t], [5, 95])
+            f.write('{:<12.0f} {:<12.4f} {:<20.2f} {:<20.2f} {:<20.2f} {:<20.4f} {:<20.4f}\n'.format(
+                time_limit, feasible.mean(), *cost, *ratio))
+        f.write('\n')
+        f.write('Correlation between minimum cost and parameters:\n')
+        f.write('{:<12} '.format('Time Limit') + ' '.join('{:<12}'.format(name) for name in JOINT_PARAMETERS) + '\n')
+        for t, time_limit in enumerate(result["time_limits"]):
+            feasible = result["feasible"][:, t]
+            if feasible.sum() < 2:
+                continue
+            cost = result["min_cost"][feasible, t]
+            correlations = [np.corrcoef(design[name][feasible], cost)[0, 1] if np.ptp(design[name]) > 0 else np.nan
+                            for name in JOINT_PARAMETERS]
+            f.write('{:<12.0f} '.format(time_limit) + ' '.join('{:<12.4f}'.format(c) for c in correlations) + '\n')
+
+
+def main():
+    """对问题1和问题2运行拉丁超立方联合敏感性分析，并保存汇总结果"""
+    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results', 'sensitivity_analysis')
+    os.makedirs(results_dir, exist_ok=True)
+    for problem in (1, 2):
+        print(f"=== Joint Sensitivity Analysis for Problem {problem} ===")
+        result = latin_hypercube_sensitivity(20000, problem=problem, seed=0)
+        filename = os.path.join(results_dir, f'problem_{problem}_joint_sensitivity.txt')
+        save_joint_summary(result, filename, problem)
+        for t, time_limit in enumerate(result["time_limits"]):
+            print(f"Time limit {time_limit:.0f} years: feasible fraction {result['feasible'][:, t].mean():.4f}")
+        print(f"Results saved to: {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,8 @@
 结果输出：
     - 三维可视化图表保存到 results/sensitivity_analysis/ 目录
     - 分析数据保存为txt文件
+
+计算部分在 sensitivity_engine 中，网格结果缓存在磁盘上，与 sensitivity_analysis_v2 共用
 """
 
 
@@ -35,169 +37,13 @@ import sys
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from constants import *
-
-
-def calculate_combined_ratio_analysis(SE_ratio, T_S, T_R, C_S, C_R, time_limit):
-    """
-    计算给定参数下的运输时间、成本及可行性。
-    
-    该函数计算在指定SE_ratio下的运输时间、成本，并检查是否满足时间限制。
-    
-    Args:
-        SE_ratio (float): 太空电梯+摆渡火箭系统比例，范围0-1
-        T_S (float): 单位运输量的太空电梯+摆渡火箭系统运输时间
-        T_R (float): 单位运输量的传统火箭系统运输时间
-        C_S (float): 单位运输量的太空电梯+摆渡火箭系统运输成本
-        C_R (float): 单位运输量的传统火箭系统运输成本
-        time_limit (float): 时间限制（年）
-    
-    Returns:
-        dict: 包含分析结果的字典，包含以下键：
-            - SE_ratio: 输入的太空电梯+摆渡火箭系统比例
-            - total_time: 总运输时间（年）
-            - total_cost: 总运输成本
-            - feasible: 是否满足时间限制
-    """
+from src.constants import *
+from src.sensitivity_engine import (SENSITIVITY_RESULTS_DIR, calculate_combined_ratio_analysis, default_parameter_ranges,
+                                    load_sensitivity_grid, save_surface_table, sensitivity_analysis_parameter,
+                                    sensitivity_surfaces)
 
-    # 总材料需求（假设为常量，与问题1和2相同）
-    total_material = TOTAL_MATERIAL
-    
-    # 计算各部分运输量
-    amount_S = total_material * SE_ratio
-    amount_R = total_material * (1 - SE_ratio)
-    
-    # 计算运输时间
-    time_S = T_S * amount_S if SE_ratio > 0 else 0
-    time_R = T_R * amount_R if (1 - SE_ratio) > 0 else 0
-    total_time = max(time_S, time_R)
-    
-    # 计算成本
-    cost_S = C_S * amount_S if SE_ratio > 0 else 0
-    cost_R = C_R * amount_R if (1 - SE_ratio) > 0 else 0
-    total_cost = cost_S + cost_R
-    
-    # 检查是否满足时间限制
-    feasible = total_time <= time_limit
-    
-    return {
-        "SE_ratio": SE_ratio,
-        "total_time": total_time,
-        "total_cost": total_cost,
-        "feasible": feasible
-    }
 
-
-def sensitivity_analysis_parameter(param_name, param_range, problem=2):
-    """
-    对单个参数进行敏感性分析。
-    
-    该函数对指定参数进行敏感性分析，分析不同时间限制下，不同SE_ratio和参数取值对运输时间和成本的影响。
-    
-    可分析的参数：
-    - T_S: 单位运输量的太空电梯+摆渡火箭系统运输时间
-    - T_R: 单位运输量的传统火箭系统运输时间
-    - C_S: 单位运输量的太空电梯+摆渡火箭系统运输成本
-    - C_R: 单位运输量的传统火箭系统运输成本
-    
-    Args:
-        param_name (str): 参数名称，必须是'T_S'、'T_R'、'C_S'或'C_R'之一
-        param_range (list): 参数取值范围，为数值列表
-        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
-    
-    Returns:
-        dict: 包含分析结果的字典，结构如下：
-            - param_name: 参数名称
-            - param_range: 参数取值范围
-            - time_limits: 时间限制范围
-            - se_ratios: SE_ratio取值范围
-            - data: 嵌套字典，包含不同时间限制、参数取值和SE_ratio下的分析结果
-    """
-
-    # 根据问题编号选择参数默认值
-    if problem == 1:
-        # Problem 1: 100%可靠性
-        default_C_S = COST_ELEVATOR_PER_P1
-        default_C_R = COST_ROCKET_PER_P1
-    else:
-        # Problem 2: 当前可靠性
-        default_C_S = COST_ELEVATOR_PER
-        default_C_R = COST_ROCKET_PER
-    
-    # 默认运输时间参数（根据年运输能力计算）
-    # 太空电梯年运输能力：每个银河港179,000吨，共3个银河港
-    total_elevator_capacity = GALACTIC_HARBORS * ELEVATOR_ANNUAL_CAPACITY
-    # 单位运输量的太空电梯运输时间（假设线性关系）
-    default_T_S = 1 / total_elevator_capacity
-    
-    # 火箭年运输能力：每个发射场每年1000次发射，每次平均125吨，共10个发射场
-    total_rocket_capacity = ROCKET_LAUNCH_SITES * ROCKET_LAUNCHES_PER_YEAR_PER_SITE * ROCKET_PAYLOAD_AVG
-    # 单位运输量的火箭运输时间（假设线性关系）
-    default_T_R = 1 / total_rocket_capacity
-    
-    # 时间限制范围（与 main_model.py 中的默认值一致）
-    time_limits = range(50, 260, 50)
-    
-    # SE_ratio 范围（从0%到100%，步长1%）
-    se_ratios = [i/100 for i in range(0, 101, 1)]
-    
-    # 存储分析结果
-    results = {
-        "param_name": param_name,
-        "param_range": param_range,
-        "time_limits": time_limits,
-        "se_ratios": se_ratios,
-        "data": {}
-    }
-    
-    # 遍历每个时间限制
-    for time_limit in time_limits:
-        results["data"][time_limit] = {}
-        
-        # 遍历每个参数取值
-        for param_value in param_range:
-            results["data"][time_limit][param_value] = {}
-            
-            # 遍历每个 SE_ratio
-            for se_ratio in se_ratios:
-                # 根据参数名称设置当前参数值
-                if param_name == "T_S":
-                    T_S = param_value
-                    T_R = default_T_R
-                    C_S = default_C_S
-                    C_R = default_C_R
-                elif param_name == "T_R":
-                    T_S = default_T_S
-                    T_R = param_value
-                    C_S = default_C_S
-                    C_R = default_C_R
-                elif param_name == "C_S":
-                    T_S = default_T_S
-                    T_R = default_T_R
-                    C_S = param_value
-                    C_R = default_C_R
-                elif param_name == "C_R":
-                    T_S = default_T_S
-                    T_R = default_T_R
-                    C_S = default_C_S
-                    C_R = param_value
-                else:
-                    # 未知参数，使用默认值
-                    T_S = default_T_S
-                    T_R = default_T_R
-                    C_S = default_C_S
-                    C_R = default_C_R
-                
-                # 计算分析结果
-                analysis_result = calculate_combined_ratio_analysis(se_ratio, T_S, T_R, C_S, C_R, time_limit)
-                
-                # 存储结果
-                results["data"][time_limit][param_value][se_ratio] = analysis_result
-    
-    return results
-
-
-def run_sensitivity_analysis(problem=1):
+def run_sensitivity_analysis(problem=1, params=None, granularity=None):
     """
     运行完整的敏感性分析。
     
@@ -209,34 +55,34 @@ def run_sensitivity_analysis(problem=1):
     
     Args:
         problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定单位运输时间的时间单位。如果为None，使用 DEFAULT_GRANULARITY
     
     Returns:
         None
     """
+    if params is None:
+        params = get_problem_parameters(problem)
 
     print(f"=== Running Sensitivity Analysis for Problem {problem} ===")
     
     # Create results directory
-    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results', 'sensitivity_analysis')
+    results_dir = SENSITIVITY_RESULTS_DIR
     os.makedirs(results_dir, exist_ok=True)
     
     # Define parameters to analyze and their value ranges
-    params_to_analyze = {
-        "T_S": np.linspace(0.8, 1.2, 5) * (1 / (GALACTIC_HARBORS * ELEVATOR_ANNUAL_CAPACITY)),  # Space elevator transportation time parameter range
-        "T_R": np.linspace(0.8, 1.2, 5) * (1 / (ROCKET_LAUNCH_SITES * ROCKET_LAUNCHES_PER_YEAR_PER_SITE * ROCKET_PAYLOAD_AVG)),  # Rocket transportation time parameter range
-        "C_S": np.linspace(0.8, 1.2, 5) * (COST_ELEVATOR_PER_P1 if problem == 1 else COST_ELEVATOR_PER),  # Space elevator cost parameter range
-        "C_R": np.linspace(0.8, 1.2, 5) * (COST_ROCKET_PER_P1 if problem == 1 else COST_ROCKET_PER),  # Rocket cost parameter range
-    }
+    params_to_analyze = default_parameter_ranges(problem, params, granularity)
     
     # Run sensitivity analysis for each parameter
     for param_name, param_range in params_to_analyze.items():
         print(f"\n=== Analyzing parameter: {param_name} ===")
         
-        # Run sensitivity analysis
-        analysis_results = sensitivity_analysis_parameter(param_name, param_range, problem)
+        # Run sensitivity analysis (shared with sensitivity_analysis_v2 through the grid cache)
+        analysis_results = load_sensitivity_grid(param_name, param_range, problem, params, granularity)
+
         
         # Generate a plot for each time limit
-        for time_limit in analysis_results["time_limits"]:
+        for t, time_limit in enumerate(analysis_results["time_limits"]):
             print(f"Generating plot for time_limit: {time_limit} years")
             
             # Prepare data
@@ -245,17 +91,9 @@ def run_sensitivity_analysis(problem=1):
             
             # Create grid (swap x and y axes)
             Y, X = np.meshgrid(param_values, se_ratios)
-            Z = np.zeros_like(X)
-            
-            # Fill data for cost and time
-            Z_cost = np.zeros_like(X)
-            Z_time = np.zeros_like(X)
             
-            for i, param_value in enumerate(param_values):
-                for j, se_ratio in enumerate(se_ratios):
-                    result = analysis_results["data"][time_limit][param_value][se_ratio]
-                    Z_cost[j, i] = result["total_cost"] if result["feasible"] else float('inf')
-                    Z_time[j, i] = result["total_time"] if result["feasible"] else float('inf')
+            # Fill data for cost and time (infeasible cells are inf)
+            Z_cost, Z_time = sensitivity_surfaces(analysis_results, t)
             
             # Create and save cost plot
             fig = plt.figure(figsize=(12, 8))
@@ -321,41 +159,11 @@ def run_sensitivity_analysis(problem=1):
             
             # Save cost data to txt file
             data_filename = os.path.join(results_dir, f'problem_{problem}_time_limit_{time_limit}_{param_name}_cost.txt')
-            with open(data_filename, 'w') as f:
-                f.write(f'Problem: {problem}\n')
-                f.write(f'Time Limit: {time_limit} years\n')
-                f.write(f'Parameter: {param_name}\n')
-                f.write('\n')
-                f.write('Data Points:\n')
-                f.write('\n')
-                f.write('{:<20} {:<20} {:<20}\n'.format('SE_ratio', f'{param_name} Value', 'Minimum Cost'))
-                f.write('{:<20} {:<20} {:<20}\n'.format('-' * 20, '-' * 20, '-' * 20))
-                
-                # Write data points
-                for i, param_value in enumerate(param_values):
-                    for j, se_ratio in enumerate(se_ratios):
-                        cost = Z_cost[j, i]
-                        if cost != float('inf'):
-                            f.write('{:<20.6f} {:<20.6f} {:<20.2f}\n'.format(se_ratio, param_value, cost))
+            save_surface_table(data_filename, problem, time_limit, param_name, param_values, se_ratios, Z_cost, 'Minimum Cost')
             
             # Save time data to txt file
             data_filename = os.path.join(results_dir, f'problem_{problem}_time_limit_{time_limit}_{param_name}_time.txt')
-            with open(data_filename, 'w') as f:
-                f.write(f'Problem: {problem}\n')
-                f.write(f'Time Limit: {time_limit} years\n')
-                f.write(f'Parameter: {param_name}\n')
-                f.write('\n')
-                f.write('Data Points:\n')
-                f.write('\n')
-                f.write('{:<20} {:<20} {:<20}\n'.format('SE_ratio', f'{param_name} Value', 'Actual Time (years)'))
-                f.write('{:<20} {:<20} {:<20}\n'.format('-' * 20, '-' * 20, '-' * 20))
-                
-                # Write data points
-                for i, param_value in enumerate(param_values):
-                    for j, se_ratio in enumerate(se_ratios):
-                        time = Z_time[j, i]
-                        if time != float('inf'):
-                            f.write('{:<20.6f} {:<20.6f} {:<20.2f}\n'.format(se_ratio, param_value, time))
+            save_surface_table(data_filename, problem, time_limit, param_name, param_values, se_ratios, Z_time, 'Actual Time (years)')
     
     print(f"\n=== Sensitivity Analysis completed for Problem {problem} ===")
     print(f"Results saved to: {results_dir}")
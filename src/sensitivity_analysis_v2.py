@@ -30,6 +30,8 @@
 结果输出：
     - 三维可视化图表保存到 results/sensitivity_analysis/ 目录
     - 分析数据保存为txt文件
+
+计算部分在 sensitivity_engine 中，网格结果缓存在磁盘上，与 sensitivity_analysis_v1 共用
 """
 
 
@@ -39,173 +41,142 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import os
 import sys
-from scipy.interpolate import griddata
+from scipy.interpolate import make_interp_spline
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from constants import *
+from src.constants import *
+from src.sensitivity_engine import (SENSITIVITY_RESULTS_DIR, calculate_combined_ratio_analysis, default_parameter_ranges,
+                                    load_sensitivity_grid, save_surface_table, sensitivity_analysis_parameter,
+                                    sensitivity_surfaces)
 
 
-def calculate_combined_ratio_analysis(SE_ratio, T_S, T_R, C_S, C_R, time_limit):
+def _interpolation_weights(x, x_fine, k=3):
     """
-    计算给定参数下的运输时间、成本及可行性。
+    规则网格上的样条插值权重矩阵。
     
-    该函数计算在指定SE_ratio下的运输时间、成本，并检查是否满足时间限制。
+    样条插值对数据是线性的，对单位矩阵插值得到的矩阵 W 满足：网格 x 上任意数据 y 的插值结果为 W @ y。
+    同一网格上的所有曲面都可以复用该矩阵，不必每次重新构造插值器。
     
     Args:
-        SE_ratio (float): 太空电梯+摆渡火箭系统比例，范围0-1
-        T_S (float): 单位运输量的太空电梯+摆渡火箭系统运输时间
-        T_R (float): 单位运输量的传统火箭系统运输时间
-        C_S (float): 单位运输量的太空电梯+摆渡火箭系统运输成本
-        C_R (float): 单位运输量的传统火箭系统运输成本
-        time_limit (float): 时间限制（年）
+        x (numpy.ndarray): 原始网格坐标（严格递增）
+        x_fine (numpy.ndarray): 插值目标坐标
+        k (int): 样条阶数，3为三次样条，1为线性插值；网格点不足时自动降阶
     
     Returns:
-        dict: 包含分析结果的字典，包含以下键：
-            - SE_ratio: 输入的太空电梯+摆渡火箭系统比例
-            - total_time: 总运输时间（年）
-            - total_cost: 总运输成本
-            - feasible: 是否满足时间限制
+        numpy.ndarray: 权重矩阵，形状为 (len(x_fine), len(x))
     """
+    return make_interp_spline(x, np.eye(len(x)), k=min(k, len(x) - 1))(x_fine)
+
 
-    # 总材料需求（假设为常量，与问题1和2相同）
-    total_material = TOTAL_MATERIAL
+def _extend_feasible(Z, mask, axis):
+    """
+    沿指定轴用最近的可行点的值填充不可行点。
     
-    # 计算各部分运输量
-    amount_S = total_material * SE_ratio
-    amount_R = total_material * (1 - SE_ratio)
+    Args:
+        Z (numpy.ndarray): 二维数据
+        mask (numpy.ndarray): 可行点的布尔数组，形状与 Z 相同
+        axis (int): 填充方向
     
-    # 计算运输时间
-    time_S = T_S * amount_S if SE_ratio > 0 else 0
-    time_R = T_R * amount_R if (1 - SE_ratio) > 0 else 0
-    total_time = max(time_S, time_R)
+    Returns:
+        tuple: (填充后的数据, 填充后的可行标记)；整行（或整列）都不可行时保持原值和原标记
+    """
+    n = Z.shape[axis]
+    index = np.expand_dims(np.arange(n), 1 - axis)
+    # 前方和后方最近的可行点下标（不存在时分别为 -1 和 n）
+    before = np.maximum.accumulate(np.where(mask, index, -1), axis=axis)
+    after = np.flip(np.minimum.accumulate(np.flip(np.where(mask, index, n), axis), axis=axis), axis)
+    use_before = (after >= n) | ((before >= 0) & (index - before <= after - index))
+    nearest = np.clip(np.where(use_before, before, after), 0, n - 1)
+    has_feasible = (before >= 0) | (after < n)
+    return np.where(has_feasible, np.take_along_axis(Z, nearest, axis), Z), has_feasible
+
+
+def _fill_infeasible(Z, mask):
+    """
+    把不可行点替换为可行域边界上的值，作为样条插值的输入。
     
-    # 计算成本
-    cost_S = C_S * amount_S if SE_ratio > 0 else 0
-    cost_R = C_R * amount_R if (1 - SE_ratio) > 0 else 0
-    total_cost = cost_S + cost_R
+    不可行点的原始数值可能远超出[0, 1]，直接参与三次样条拟合会在可行域边界附近产生振荡。
+    先沿 SE_ratio 方向取同一参数取值下最近的可行点，整列不可行时再沿参数方向取最近的列。
     
-    # 检查是否满足时间限制
-    feasible = total_time <= time_limit
+    Args:
+        Z (numpy.ndarray): 数据，形状为 (SE_ratio数, 参数取值数)
+        mask (numpy.ndarray): 可行点的布尔数组
     
-    return {
-        "SE_ratio": SE_ratio,
-        "total_time": total_time,
-        "total_cost": total_cost,
-        "feasible": feasible
-    }
+    Returns:
+        numpy.ndarray: 填充后的数据
+    """
+    Z, filled = _extend_feasible(Z, mask, axis=0)
+    Z, _ = _extend_feasible(Z, filled, axis=1)
+    return Z
 
 
-def sensitivity_analysis_parameter(param_name, param_range, problem=2):
+def _boundary_distance(mask):
     """
-    对单个参数进行敏感性分析。
-    
-    该函数对指定参数进行敏感性分析，分析不同时间限制下，不同SE_ratio和参数取值对运输时间和成本的影响。
+    计算每个点沿 SE_ratio 方向到可行域边界的有符号距离（以格点数计）。
     
-    可分析的参数：
-    - T_S: 单位运输量的太空电梯+摆渡火箭系统运输时间
-    - T_R: 单位运输量的传统火箭系统运输时间
-    - C_S: 单位运输量的太空电梯+摆渡火箭系统运输成本
-    - C_R: 单位运输量的传统火箭系统运输成本
+    可行点为到最近不可行点的距离减 1（最后一个可行点为 0），不可行点为到最近可行点距离的相反数。
+    对该距离做双线性插值并取非负部分，可行域边界在相邻参数取值之间线性移动，
+    与 griddata 对可行点三角剖分得到的边界一致，而不是呈阶梯状。
     
     Args:
-        param_name (str): 参数名称，必须是'T_S'、'T_R'、'C_S'或'C_R'之一
-        param_range (list): 参数取值范围，为数值列表
-        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        mask (numpy.ndarray): 可行点的布尔数组，形状为 (SE_ratio数, 参数取值数)
     
     Returns:
-        dict: 包含分析结果的字典，结构如下：
-            - param_name: 参数名称
-            - param_range: 参数取值范围
-            - time_limits: 时间限制范围
-            - se_ratios: SE_ratio取值范围
-            - data: 嵌套字典，包含不同时间限制、参数取值和SE_ratio下的分析结果
+        numpy.ndarray: 有符号距离，整列可行（不可行）时为 SE_ratio数（的相反数）
     """
-
-    # 根据问题编号选择参数默认值
-    if problem == 1:
-        # Problem 1: 100%可靠性
-        default_C_S = COST_ELEVATOR_PER_P1
-        default_C_R = COST_ROCKET_PER_P1
-    else:
-        # Problem 2: 当前可靠性
-        default_C_S = COST_ELEVATOR_PER
-        default_C_R = COST_ROCKET_PER
+    n = mask.shape[0]
+    index = np.arange(n)[:, np.newaxis]
     
-    # 默认运输时间参数（根据年运输能力计算）
-    # 太空电梯年运输能力：每个银河港179,000吨，共3个银河港
-    total_elevator_capacity = GALACTIC_HARBORS * ELEVATOR_ANNUAL_CAPACITY
-    # 单位运输量的太空电梯运输时间（假设线性关系）
-    default_T_S = 1 / total_elevator_capacity
+    def nearest(m):
+        before = np.maximum.accumulate(np.where(m, index, -2 * n), axis=0)
+        after = np.flip(np.minimum.accumulate(np.flip(np.where(m, index, 3 * n), 0), axis=0), 0)
+        return np.minimum(index - before, after - index)
     
-    # 火箭年运输能力：每个发射场每年1000次发射，每次平均125吨，共10个发射场
-    total_rocket_capacity = ROCKET_LAUNCH_SITES * ROCKET_LAUNCHES_PER_YEAR_PER_SITE * ROCKET_PAYLOAD_AVG
-    # 单位运输量的火箭运输时间（假设线性关系）
-    default_T_R = 1 / total_rocket_capacity
+    return np.clip(np.where(mask, nearest(~mask) - 1, -nearest(mask)), -n, n).astype(float)
+
+
+def _dilate(mask):
+    """
+    把布尔数组向上下左右各扩展一个格点。
     
-    # 时间限制范围（与 main_model.py 中的默认值一致）
-    time_limits = range(50, 260, 50)
+    Args:
+        mask (numpy.ndarray): 二维布尔数组
     
-    # SE_ratio 范围（从0%到100%，步长1%）
-    se_ratios = [i/100 for i in range(0, 101, 1)]
+    Returns:
+        numpy.ndarray: 扩展后的布尔数组
+    """
+    dilated = mask.copy()
+    dilated[1:, :] |= mask[:-1, :]
+    dilated[:-1, :] |= mask[1:, :]
+    dilated[:, 1:] |= mask[:, :-1]
+    dilated[:, :-1] |= mask[:, 1:]
+    return dilated
+
+
+def _normalize(Z, mask):
+    """
+    按可行点的最小值和最大值把数据线性归一化到[0, 1]。
     
-    # 存储分析结果
-    results = {
-        "param_name": param_name,
-        "param_range": param_range,
-        "time_limits": time_limits,
-        "se_ratios": se_ratios,
-        "data": {}
-    }
+    不可行点使用同一线性变换（不做屏蔽），由调用方决定如何处理。
     
-    # 遍历每个时间限制
-    for time_limit in time_limits:
-        results["data"][time_limit] = {}
-        
-        # 遍历每个参数取值
-        for param_value in param_range:
-            results["data"][time_limit][param_value] = {}
-            
-            # 遍历每个 SE_ratio
-            for se_ratio in se_ratios:
-                # 根据参数名称设置当前参数值
-                if param_name == "T_S":
-                    T_S = param_value
-                    T_R = default_T_R
-                    C_S = default_C_S
-                    C_R = default_C_R
-                elif param_name == "T_R":
-                    T_S = default_T_S
-                    T_R = param_value
-                    C_S = default_C_S
-                    C_R = default_C_R
-                elif param_name == "C_S":
-                    T_S = default_T_S
-                    T_R = default_T_R
-                    C_S = param_value
-                    C_R = default_C_R
-                elif param_name == "C_R":
-                    T_S = default_T_S
-                    T_R = default_T_R
-                    C_S = default_C_S
-                    C_R = param_value
-                else:
-                    # 未知参数，使用默认值
-                    T_S = default_T_S
-                    T_R = default_T_R
-                    C_S = default_C_S
-                    C_R = default_C_R
-                
-                # 计算分析结果
-                analysis_result = calculate_combined_ratio_analysis(se_ratio, T_S, T_R, C_S, C_R, time_limit)
-                
-                # 存储结果
-                results["data"][time_limit][param_value][se_ratio] = analysis_result
+    Args:
+        Z (numpy.ndarray): 原始数据
+        mask (numpy.ndarray): 可行点的布尔数组
     
-    return results
+    Returns:
+        numpy.ndarray: 归一化后的数据；没有可行点时全部为inf
+    """
+    if not np.any(mask):
+        return np.full_like(Z, float('inf'))
+    min_value = np.min(Z[mask])
+    max_value = np.max(Z[mask])
+    if max_value > min_value:
+        return (Z - min_value) / (max_value - min_value)
+    return np.zeros_like(Z)
 
 
-def run_sensitivity_analysis(problem=1):
+def run_sensitivity_analysis(problem=1, params=None, granularity=None):
     """
     运行完整的敏感性分析（增强版）。
     
@@ -218,129 +189,85 @@ def run_sensitivity_analysis(problem=1):
     增强特性：
         - 添加了数据归一化处理
         - 计算成本和时间的综合评分
-        - 使用插值技术生成平滑的三维表面图
+        - 在规则网格上用三次样条插值生成平滑的三维表面图（插值权重矩阵按参数计算一次，各时间限制共用）
         - 提供更丰富的数据可视化效果
     
     Args:
         problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定单位运输时间的时间单位。如果为None，使用 DEFAULT_GRANULARITY
     
     Returns:
         None
     """
+    if params is None:
+        params = get_problem_parameters(problem)
 
     print(f"=== Running Sensitivity Analysis for Problem {problem} ===")
     
     # Create results directory
-    results_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results', 'sensitivity_analysis')
+    results_dir = SENSITIVITY_RESULTS_DIR
     os.makedirs(results_dir, exist_ok=True)
     
     # Define parameters to analyze and their value ranges
-    params_to_analyze = {
-        "T_S": np.linspace(0.8, 1.2, 5) * (1 / (GALACTIC_HARBORS * ELEVATOR_ANNUAL_CAPACITY)),  # Space elevator transportation time parameter range
-        "T_R": np.linspace(0.8, 1.2, 5) * (1 / (ROCKET_LAUNCH_SITES * ROCKET_LAUNCHES_PER_YEAR_PER_SITE * ROCKET_PAYLOAD_AVG)),  # Rocket transportation time parameter range
-        "C_S": np.linspace(0.8, 1.2, 5) * (COST_ELEVATOR_PER_P1 if problem == 1 else COST_ELEVATOR_PER),  # Space elevator cost parameter range
-        "C_R": np.linspace(0.8, 1.2, 5) * (COST_ROCKET_PER_P1 if problem == 1 else COST_ROCKET_PER),  # Rocket cost parameter range
-    }
+    params_to_analyze = default_parameter_ranges(problem, params, granularity)
     
     # Run sensitivity analysis for each parameter
     for param_name, param_range in params_to_analyze.items():
         print(f"\n=== Analyzing parameter: {param_name} ===")
         
-        # Run sensitivity analysis
-        analysis_results = sensitivity_analysis_parameter(param_name, param_range, problem)
+        # Run sensitivity analysis (shared with sensitivity_analysis_v1 through the grid cache)
+        analysis_results = load_sensitivity_grid(param_name, param_range, problem, params, granularity)
+        
+        # Precompute interpolation weights onto a finer grid (shared by all time limits)
+        param_values = analysis_results["param_range"]
+        se_ratios = analysis_results["se_ratios"]
+        se_ratio_fine = np.linspace(min(se_ratios), max(se_ratios), 100)
+        param_value_fine = np.linspace(min(param_values), max(param_values), 100)
+        X_fine, Y_fine = np.meshgrid(se_ratio_fine, param_value_fine)
+        se_ratio_cubic = _interpolation_weights(se_ratios, se_ratio_fine)
+        param_value_cubic = _interpolation_weights(param_values, param_value_fine)
+        se_ratio_linear = _interpolation_weights(se_ratios, se_ratio_fine, k=1)
+        param_value_linear = _interpolation_weights(param_values, param_value_fine, k=1)
         
         # Generate a plot for each time limit
-        for time_limit in analysis_results["time_limits"]:
+        for t, time_limit in enumerate(analysis_results["time_limits"]):
             print(f"Generating plot for time_limit: {time_limit} years")
             
-            # Prepare data
-            param_values = analysis_results["param_range"]
-            se_ratios = analysis_results["se_ratios"]
-            
             # Create grid (swap x and y axes)
             Y, X = np.meshgrid(param_values, se_ratios)
-            Z = np.zeros_like(X)
             
-            # Fill data for cost and time
-            Z_cost = np.zeros_like(X)
-            Z_time = np.zeros_like(X)
+            # Fill data for cost and time (infeasible cells are inf)
+            Z_cost, Z_time = sensitivity_surfaces(analysis_results, t)
             
-            for i, param_value in enumerate(param_values):
-                for j, se_ratio in enumerate(se_ratios):
-                    result = analysis_results["data"][time_limit][param_value][se_ratio]
-                    Z_cost[j, i] = result["total_cost"] if result["feasible"] else float('inf')
-                    Z_time[j, i] = result["total_time"] if result["feasible"] else float('inf')
-            
-            # Normalize cost and time data
-            # Create masks for feasible values
-            cost_mask = Z_cost != float('inf')
-            time_mask = Z_time != float('inf')
-            
-            # Normalize cost data
-            if np.any(cost_mask):
-                min_cost = np.min(Z_cost[cost_mask])
-                max_cost = np.max(Z_cost[cost_mask])
-                if max_cost > min_cost:
-                    Z_cost_normalized = (Z_cost - min_cost) / (max_cost - min_cost)
-                    Z_cost_normalized[~cost_mask] = float('inf')
-                else:
-                    Z_cost_normalized = np.zeros_like(Z_cost)
-                    Z_cost_normalized[~cost_mask] = float('inf')
-            else:
-                Z_cost_normalized = np.full_like(Z_cost, float('inf'))
-            
-            # Normalize time data
-            if np.any(time_mask):
-                min_time = np.min(Z_time[time_mask])
-                max_time = np.max(Z_time[time_mask])
-                if max_time > min_time:
-                    Z_time_normalized = (Z_time - min_time) / (max_time - min_time)
-                    Z_time_normalized[~time_mask] = float('inf')
-                else:
-                    Z_time_normalized = np.zeros_like(Z_time)
-                    Z_time_normalized[~time_mask] = float('inf')
-            else:
-                Z_time_normalized = np.full_like(Z_time, float('inf'))
+            # Normalize cost and time data (feasible cells define the range)
+            feasible = analysis_results["feasible"][t].T
+            cost_normalized = _normalize(analysis_results["total_cost"][t].T, feasible)
+            time_normalized = _normalize(analysis_results["total_time"][t].T, feasible)
             
             # Calculate weighted sum (equal weights of 0.5)
-            Z_combined = 0.5 * Z_cost_normalized + 0.5 * Z_time_normalized
-            Z_combined[~(cost_mask & time_mask)] = float('inf')
+            combined = 0.5 * cost_normalized + 0.5 * time_normalized
+            Z_combined = np.where(feasible, combined, float('inf'))
             
             # Create and save combined plot
             fig = plt.figure(figsize=(12, 8))
             ax = fig.add_subplot(111, projection='3d')
             
-            # Prepare data for smooth interpolation
-            # Create a list of data points
-            points = []
-            values = []
-            for i, param_value in enumerate(param_values):
-                for j, se_ratio in enumerate(se_ratios):
-                    if Z_combined[j, i] != float('inf'):
-                        points.append([se_ratio, param_value])
-                        values.append(Z_combined[j, i])
-            
-            # Create a finer grid for interpolation
-            if points:
-                # Increase resolution for smoother surface
-                se_ratio_fine = np.linspace(min(se_ratios), max(se_ratios), 100)
-                param_value_fine = np.linspace(min(param_values), max(param_values), 100)
-                X_fine, Y_fine = np.meshgrid(se_ratio_fine, param_value_fine)
-                
-                # Interpolate data with fallback methods
-                try:
-                    # Try cubic interpolation first
-                    Z_fine = griddata(points, values, (X_fine, Y_fine), method='cubic')
-                except Exception:
-                    try:
-                        # Fallback to linear interpolation if cubic fails
-                        Z_fine = griddata(points, values, (X_fine, Y_fine), method='linear')
-                    except Exception:
-                        # Fallback to nearest neighbor if linear also fails
-                        Z_fine = griddata(points, values, (X_fine, Y_fine), method='nearest')
+            if np.any(feasible):
+                # Smooth surface: cubic spline on the regular grid, fitted to feasible values only
+                # (infeasible cells take the value at the nearest feasible boundary)
+                filled = _fill_infeasible(combined, feasible).T
+                Z_fine = param_value_cubic @ filled @ se_ratio_cubic.T
+                # Fall back to bilinear interpolation in cells next to the infeasible region
+                Z_linear = param_value_linear @ filled @ se_ratio_linear.T
+                near_mask = param_value_linear @ _dilate(~feasible).T.astype(float) @ se_ratio_linear.T
+                Z_fine = np.where(near_mask > 1e-9, Z_linear, Z_fine)
+                # Hide the surface outside the feasible region (bilinear interpolation of the boundary distance)
+                boundary_fine = param_value_linear @ _boundary_distance(feasible).T @ se_ratio_linear.T
+                Z_fine[boundary_fine < -1e-9] = np.nan
                 
                 # Add a filled base plane below the surface for better visual depth
-                min_z = np.min(values) if values else 0
+                min_z = np.min(Z_combined[feasible])
                 base_plane = np.full_like(Z_fine, min_z)
                 ax.plot_surface(X_fine, Y_fine, base_plane, color='lightgray', alpha=0.3, shade=True)
 
@@ -348,8 +275,7 @@ def run_sensitivity_analysis(problem=1):
                 surf = ax.plot_surface(X_fine, Y_fine, Z_fine, cmap='coolwarm', edgecolor='none')
             else:
                 # If no valid points, plot original data
-                min_z = np.min(Z_combined[Z_combined != float('inf')]) if np.any(Z_combined != float('inf')) else 0
-                base_plane = np.full_like(Z_combined, min_z)
+                base_plane = np.zeros_like(Z_combined)
                 ax.plot_surface(X, Y, base_plane, color='lightgray', alpha=0.3, shade=True)
 
                 # Plot surface
@@ -379,60 +305,16 @@ def run_sensitivity_analysis(problem=1):
             
             # Save cost data to txt file
             data_filename = os.path.join(results_dir, f'problem_{problem}_time_limit_{time_limit}_{param_name}_cost.txt')
-            with open(data_filename, 'w') as f:
-                f.write(f'Problem: {problem}\n')
-                f.write(f'Time Limit: {time_limit} years\n')
-                f.write(f'Parameter: {param_name}\n')
-                f.write('\n')
-                f.write('Data Points:\n')
-                f.write('\n')
-                f.write('{:<20} {:<20} {:<20}\n'.format('SE_ratio', f'{param_name} Value', 'Minimum Cost'))
-                f.write('{:<20} {:<20} {:<20}\n'.format('-' * 20, '-' * 20, '-' * 20))
-                
-                # Write data points
-                for i, param_value in enumerate(param_values):
-                    for j, se_ratio in enumerate(se_ratios):
-                        cost = Z_cost[j, i]
-                        if cost != float('inf'):
-                            f.write('{:<20.6f} {:<20.6f} {:<20.2f}\n'.format(se_ratio, param_value, cost))
+            save_surface_table(data_filename, problem, time_limit, param_name, param_values, se_ratios, Z_cost, 'Minimum Cost')
             
             # Save time data to txt file
             data_filename = os.path.join(results_dir, f'problem_{problem}_time_limit_{time_limit}_{param_name}_time.txt')
-            with open(data_filename, 'w') as f:
-                f.write(f'Problem: {problem}\n')
-                f.write(f'Time Limit: {time_limit} years\n')
-                f.write(f'Parameter: {param_name}\n')
-                f.write('\n')
-                f.write('Data Points:\n')
-                f.write('\n')
-                f.write('{:<20} {:<20} {:<20}\n'.format('SE_ratio', f'{param_name} Value', 'Actual Time (years)'))
-                f.write('{:<20} {:<20} {:<20}\n'.format('-' * 20, '-' * 20, '-' * 20))
-                
-                # Write data points
-                for i, param_value in enumerate(param_values):
-                    for j, se_ratio in enumerate(se_ratios):
-                        time = Z_time[j, i]
-                        if time != float('inf'):
-                            f.write('{:<20.6f} {:<20.6f} {:<20.2f}\n'.format(se_ratio, param_value, time))
+            save_surface_table(data_filename, problem, time_limit, param_name, param_values, se_ratios, Z_time, 'Actual Time (years)')
             
             # Save combined data to txt file
             data_filename = os.path.join(results_dir, f'problem_{problem}_time_limit_{time_limit}_{param_name}_combined.txt')
-            with open(data_filename, 'w') as f:
-                f.write(f'Problem: {problem}\n')
-                f.write(f'Time Limit: {time_limit} years\n')
-                f.write(f'Parameter: {param_name}\n')
-                f.write('\n')
-                f.write('Data Points:\n')
-                f.write('\n')
-                f.write('{:<20} {:<20} {:<20}\n'.format('SE_ratio', f'{param_name} Value', 'Combined Score (Normalized)'))
-                f.write('{:<20} {:<20} {:<20}\n'.format('-' * 20, '-' * 20, '-' * 20))
-                
-                # Write data points
-                for i, param_value in enumerate(param_values):
-                    for j, se_ratio in enumerate(se_ratios):
-                        combined = Z_combined[j, i]
-                        if combined != float('inf'):
-                            f.write('{:<20.6f} {:<20.6f} {:<20.4f}\n'.format(se_ratio, param_value, combined))
+            save_surface_table(data_filename, problem, time_limit, param_name, param_values, se_ratios, Z_combined,
+                               'Combined Score (Normalized)', '{:<20.4f}')
     
     print(f"\n=== Sensitivity Analysis completed for Problem {problem} ===")
     print(f"Results saved to: {results_dir}")
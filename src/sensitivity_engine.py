@@ -0,0 +1,290 @@
+"""
+敏感性分析计算引擎
+
+sensitivity_analysis_v1（成本/时间曲面）和 sensitivity_analysis_v2（综合评分曲面）共用的计算部分：
+    - 单个参数组合的时间、成本和可行性计算
+    - 单参数敏感性网格（时间限制 × 参数取值 × SE_ratio）的向量化计算
+    - 网格的磁盘缓存：按 (问题, 参数名, 参数取值, 模型参数, 时间粒度, 计算函数源代码) 的哈希命名，
+      两个版本先后运行时同一网格只计算一次
+    - 曲面数据的txt文件输出
+
+分析公式：
+    T = max{ SE_ratio * T_S * Amount_S , (1-SE_ratio) * T_R * Amount_R }
+    C = SE_ratio * C_S * Amount_S + (1-SE_ratio) * C_R * Amount_R
+"""
+
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+from src.constants import *
+
+# 敏感性分析结果目录
+SENSITIVITY_RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'results', 'sensitivity_analysis')
+
+
+def calculate_combined_ratio_analysis(SE_ratio, T_S, T_R, C_S, C_R, time_limit, total_material=TOTAL_MATERIAL):
+    """
+    计算给定参数下的运输时间、成本及可行性。
+    
+    该函数计算在指定SE_ratio下的运输时间、成本，并检查是否满足时间限制。
+    
+    Args:
+        SE_ratio (float): 太空电梯+摆渡火箭系统比例，范围0-1
+        T_S (float): 单位运输量的太空电梯+摆渡火箭系统运输时间
+        T_R (float): 单位运输量的传统火箭系统运输时间
+        C_S (float): 单位运输量的太空电梯+摆渡火箭系统运输成本
+        C_R (float): 单位运输量的传统火箭系统运输成本
+        time_limit (float): 时间限制（年）
+        total_material (float): 总材料需求（吨），默认与问题1和2相同
+    
+    Returns:
+        dict: 包含分析结果的字典，包含以下键：
+            - SE_ratio: 输入的太空电梯+摆渡火箭系统比例
+            - total_time: 总运输时间（年）
+            - total_cost: 总运输成本
+            - feasible: 是否满足时间限制
+    """
+
+    # 计算各部分运输量
+    amount_S = total_material * SE_ratio
+    amount_R = total_material * (1 - SE_ratio)
+    
+    # 计算运输时间
+    time_S = T_S * amount_S if SE_ratio > 0 else 0
+    time_R = T_R * amount_R if (1 - SE_ratio) > 0 else 0
+    total_time = max(time_S, time_R)
+    
+    # 计算成本
+    cost_S = C_S * amount_S if SE_ratio > 0 else 0
+    cost_R = C_R * amount_R if (1 - SE_ratio) > 0 else 0
+    total_cost = cost_S + cost_R
+    
+    # 检查是否满足时间限制
+    feasible = total_time <= time_limit
+    
+    return {
+        "SE_ratio": SE_ratio,
+        "total_time": total_time,
+        "total_cost": total_cost,
+        "feasible": feasible
+    }
+
+
+
+def sensitivity_analysis_parameter(param_name, param_range, problem=2, params=None, granularity=None):
+    """
+    对单个参数进行敏感性分析。
+    
+    该函数对指定参数进行敏感性分析，分析不同时间限制下，不同SE_ratio和参数取值对运输时间和成本的影响。
+    
+    可分析的参数：
+    - T_S: 单位运输量的太空电梯+摆渡火箭系统运输时间
+    - T_R: 单位运输量的传统火箭系统运输时间
+    - C_S: 单位运输量的太空电梯+摆渡火箭系统运输成本
+    - C_R: 单位运输量的传统火箭系统运输成本
+    
+    Args:
+        param_name (str): 参数名称，必须是'T_S'、'T_R'、'C_S'或'C_R'之一
+        param_range (list): 参数取值范围，为数值列表
+        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定单位运输时间的时间单位。如果为None，使用 DEFAULT_GRANULARITY
+    
+    Returns:
+        dict: 包含分析结果的字典，结构如下：
+            - param_name: 参数名称
+            - param_range: 参数取值范围（数组）
+            - time_limits: 时间限制范围（数组）
+            - se_ratios: SE_ratio取值范围（数组）
+            - total_time: 总运输时间，形状为 (时间限制数, 参数取值数, SE_ratio数)
+            - total_cost: 总运输成本，形状同上
+            - feasible: 是否满足时间限制的布尔数组，形状同上
+    """
+
+    # 根据问题编号选择参数默认值
+    if params is None:
+        params = get_problem_parameters(problem)
+    default_C_S = params.COST_ELEVATOR_PER
+    default_C_R = params.COST_ROCKET_PER
+    
+    # 默认运输时间参数（根据年运输能力计算，并换算到所选时间粒度）
+    periods_per_year = GRANULARITY_PERIODS_PER_YEAR[granularity or DEFAULT_GRANULARITY]
+    # 太空电梯年运输能力：每个银河港179,000吨，共3个银河港
+    total_elevator_capacity = params.GALACTIC_HARBORS * params.ELEVATOR_ANNUAL_CAPACITY / periods_per_year
+    # 单位运输量的太空电梯运输时间（假设线性关系）
+    default_T_S = 1 / total_elevator_capacity
+    
+    # 火箭年运输能力：每个发射场每年1000次发射，每次平均125吨，共10个发射场
+    total_rocket_capacity = params.ROCKET_LAUNCH_SITES * params.ROCKET_LAUNCHES_PER_YEAR_PER_SITE * params.ROCKET_PAYLOAD_AVG / periods_per_year
+    # 单位运输量的火箭运输时间（假设线性关系）
+    default_T_R = 1 / total_rocket_capacity
+    
+    # 时间限制范围（与 main_model.py 中的默认值一致）
+    time_limits = np.arange(50, 260, 50)
+    
+    # SE_ratio 范围（从0%到100%，步长1%）
+    se_ratios = np.arange(0, 101, 1) / 100
+    
+    # 被分析的参数沿第二维取不同值，其余参数使用默认值
+    param_range = np.asarray(param_range, dtype=float)
+    values = {"T_S": default_T_S, "T_R": default_T_R, "C_S": default_C_S, "C_R": default_C_R}
+    if param_name in values:
+        values[param_name] = param_range[:, None]
+    
+    # 广播计算 (参数取值, SE_ratio) 网格，运算顺序与 calculate_combined_ratio_analysis 相同
+    # 总运输量固定为模块级 TOTAL_MATERIAL（与 calculate_combined_ratio_analysis 的默认值一致），
+    # 不随 params.TOTAL_MATERIAL 变化，问题3的参数记录也不会改变 v1/v2 的扫描结果
+    amount_S = TOTAL_MATERIAL * se_ratios
+    amount_R = TOTAL_MATERIAL * (1 - se_ratios)
+    has_S = se_ratios > 0
+    has_R = (1 - se_ratios) > 0
+    time_S = np.where(has_S, values["T_S"] * amount_S, 0)
+    time_R = np.where(has_R, values["T_R"] * amount_R, 0)
+    total_time = np.maximum(time_S, time_R) * np.ones((len(param_range), 1))
+    cost_S = np.where(has_S, values["C_S"] * amount_S, 0)
+    cost_R = np.where(has_R, values["C_R"] * amount_R, 0)
+    total_cost = (cost_S + cost_R) * np.ones((len(param_range), 1))
+    
+    # 时间和成本与时间限制无关，沿第一维重复；可行性按时间限制比较
+    shape = (len(time_limits), len(param_range), len(se_ratios))
+    return {
+        "param_name": param_name,
+        "param_range": param_range,
+        "time_limits": time_limits,
+        "se_ratios": se_ratios,
+        "total_time": np.broadcast_to(total_time, shape).copy(),
+        "total_cost": np.broadcast_to(total_cost, shape).copy(),
+        "feasible": total_time[None, :, :] <= time_limits[:, None, None],
+    }
+
+
+def default_parameter_ranges(problem=2, params=None, granularity=None):
+    """
+    各参数的默认分析范围（默认值的80%到120%，共5个取值）。
+    
+    Args:
+        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定单位运输时间的时间单位。如果为None，使用 DEFAULT_GRANULARITY
+    
+    Returns:
+        dict: 参数名 -> 参数取值数组
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    periods_per_year = GRANULARITY_PERIODS_PER_YEAR[granularity or DEFAULT_GRANULARITY]
+    return {
+        "T_S": np.linspace(0.8, 1.2, 5) * (1 / (params.GALACTIC_HARBORS * params.ELEVATOR_ANNUAL_CAPACITY / periods_per_year)),  # Space elevator transportation time parameter range
+        "T_R": np.linspace(0.8, 1.2, 5) * (1 / (params.ROCKET_LAUNCH_SITES * params.ROCKET_LAUNCHES_PER_YEAR_PER_SITE * params.ROCKET_PAYLOAD_AVG / periods_per_year)),  # Rocket transportation time parameter range
+        "C_S": np.linspace(0.8, 1.2, 5) * params.COST_ELEVATOR_PER,  # Space elevator cost parameter range
+        "C_R": np.linspace(0.8, 1.2, 5) * params.COST_ROCKET_PER,  # Rocket cost parameter range
+    }
+
+
+def _grid_cache_key(param_name, param_range, problem, params, granularity):
+    """敏感性网格缓存键：所有计算输入和计算函数源代码的 SHA-256 哈希"""
+    return hashlib.sha256(json.dumps({
+        "version": SENSITIVITY_CACHE_VERSION,
+        "function": inspect.getsource(sensitivity_analysis_parameter),
+        "param_name": param_name,
+        "param_range": [float(value) for value in param_range],
+        "problem": problem,
+        "params": params.as_dict(),
+        "granularity": granularity or DEFAULT_GRANULARITY,
+    }, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_sensitivity_grid(param_name, param_range, problem=2, params=None, granularity=None, cache_dir=None,
+                          refresh=False):
+    """
+    读取或计算单参数敏感性网格。
+    
+    缓存命中时直接读取 .npz 文件；未命中时调用 sensitivity_analysis_parameter 计算并写入缓存
+    （先写临时文件再替换，避免中断时留下不完整的缓存）。
+    
+    Args:
+        param_name (str): 参数名称，必须是'T_S'、'T_R'、'C_S'或'C_R'之一
+        param_range (list): 参数取值范围，为数值列表
+        problem (int): 问题编号，1表示100%可靠性，2表示当前可靠性
+        params (ModelParameters, optional): 模型参数记录。如果为None，使用问题编号对应的默认参数
+        granularity (str, optional): 时间粒度，决定单位运输时间的时间单位。如果为None，使用 DEFAULT_GRANULARITY
+        cache_dir (str, optional): 缓存目录。如果为None，使用 results/sensitivity_analysis/grid_cache
+        refresh (bool): 为True时忽略已有缓存，重新计算并覆盖
+    
+    Returns:
+        dict: 与 sensitivity_analysis_parameter 的返回值相同
+    """
+    if params is None:
+        params = get_problem_parameters(problem)
+    if cache_dir is None:
+        cache_dir = os.path.join(SENSITIVITY_RESULTS_DIR, SENSITIVITY_CACHE_DIR)
+    key = _grid_cache_key(param_name, param_range, problem, params, granularity)
+    cache_file = os.path.join(cache_dir, f'problem_{problem}_{param_name}_{key[:16]}.npz')
+    
+    if not refresh and os.path.exists(cache_file):
+        with np.load(cache_file) as cached:
+            if str(cached["key"]) == key:
+                results = {name: cached[name] for name in cached.files if name != "key"}
+                results["param_name"] = str(results["param_name"])
+                return results
+    
+    results = sensitivity_analysis_parameter(param_name, param_range, problem, params, granularity)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_file + '.tmp', 'wb') as f:
+        np.savez(f, key=key, **results)
+    os.replace(cache_file + '.tmp', cache_file)
+    return results
+
+
+def sensitivity_surfaces(analysis_results, time_limit_index):
+    """
+    取出某个时间限制下的成本和时间曲面。
+    
+    Args:
+        analysis_results (dict): load_sensitivity_grid 或 sensitivity_analysis_parameter 的返回值
+        time_limit_index (int): 时间限制在 time_limits 中的下标
+    
+    Returns:
+        tuple: (Z_cost, Z_time)，形状为 (SE_ratio数, 参数取值数)，不满足时间限制的位置为inf
+    """
+    feasible = analysis_results["feasible"][time_limit_index].T
+    Z_cost = np.where(feasible, analysis_results["total_cost"][time_limit_index].T, float('inf'))
+    Z_time = np.where(feasible, analysis_results["total_time"][time_limit_index].T, float('inf'))
+    return Z_cost, Z_time
+
+
+def save_surface_table(filename, problem, time_limit, param_name, param_values, se_ratios, Z, value_label,
+                       value_format='{:<20.2f}'):
+    """
+    将曲面数据保存为txt文件，跳过值为inf的点。
+    
+    Args:
+        filename (str): 输出文件路径
+        problem (int): 问题编号
+        time_limit (float): 时间限制（年）
+        param_name (str): 参数名称
+        param_values (array_like): 参数取值
+        se_ratios (array_like): SE_ratio取值
+        Z (numpy.ndarray): 曲面数据，形状为 (SE_ratio数, 参数取值数)
+        value_label (str): 数值列的表头
+        value_format (str): 数值列的格式
+    """
+    with open(filename, 'w') as f:
+        f.write(f'Problem: {problem}\n')
+        f.write(f'Time Limit: {time_limit} years\n')
+        f.write(f'Parameter: {param_name}\n')
+        f.write('\n')
+        f.write('Data Points:\n')
+        f.write('\n')
+        f.write('{:<20} {:<20} {:<20}\n'.format('SE_ratio', f'{param_name} Value', value_label))
+        f.write('{:<20} {:<20} {:<20}\n'.format('-' * 20, '-' * 20, '-' * 20))
+        
+        # Write data points
+        for i, param_value in enumerate(param_values):
+            for j, se_ratio in enumerate(se_ratios):
+                value = Z[j, i]
+                if value != float('inf'):
+                    f.write(('{:<20.6f} {:<20.6f} ' + value_format + '\n').format(se_ratio, param_value, value))